@@ -0,0 +1,83 @@
+"""Benchmark SQLite reads and job claims: per-call connections vs the connection pool."""
+
+from __future__ import annotations
+
+import argparse
+import sqlite3
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from models import database  # noqa: E402
+
+
+@contextmanager
+def _fresh_connection(db_path: Path):
+    """The pre-pool behaviour: connect, run, commit and close on every call."""
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    try:
+        yield conn
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Measure database reads/claims per second.")
+    parser.add_argument("--reads", type=int, default=5000, help="get_job calls per mode.")
+    parser.add_argument(
+        "--claims", type=int, default=1000, help="Jobs to queue and claim per mode."
+    )
+    return parser.parse_args()
+
+
+def _run(mode: str, reads: int, claims: int, root: Path) -> tuple[float, float]:
+    db_path = root / mode / "db.sqlite"
+    database.init_db(db_path)
+    source_dir = root / "source"
+    source_dir.mkdir(exist_ok=True)
+    book = database.create_book(db_path, source_path=source_dir, book_dir=root / "books")
+    jobs = [database.create_job(db_path, book_id=book.id) for _ in range(claims)]
+
+    started = time.perf_counter()
+    for index in range(reads):
+        database.get_job(db_path, jobs[index % len(jobs)].id)
+    reads_per_sec = reads / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    claimed = 0
+    while database.claim_next_pending_job(db_path) is not None:
+        claimed += 1
+    claims_per_sec = claimed / (time.perf_counter() - started)
+
+    database.close_connections(db_path)
+    return reads_per_sec, claims_per_sec
+
+
+def main() -> int:
+    args = parse_args()
+    pooled_connection = database.connection
+    with tempfile.TemporaryDirectory(prefix="ebookgen-bench-") as temp_dir:
+        root = Path(temp_dir)
+        database.connection = _fresh_connection
+        try:
+            before = _run("fresh", args.reads, args.claims, root)
+        finally:
+            database.connection = pooled_connection
+        after = _run("pooled", args.reads, args.claims, root)
+
+    print(f"{'mode':<8} {'reads/s':>10} {'claims/s':>10}")
+    print(f"{'fresh':<8} {before[0]:>10.0f} {before[1]:>10.0f}")
+    print(f"{'pooled':<8} {after[0]:>10.0f} {after[1]:>10.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
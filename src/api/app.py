@@ -4,33 +4,76 @@ from __future__ import annotations
 
 from pathlib import Path
 import threading
-from typing import Any
 
 from fastapi import FastAPI
 
 from api.routes.books import router as books_router
 from api.routes.jobs import router as jobs_router
 from api.routes.ws import router as ws_router
-from models.database import init_db
+from models.database import get_active_job_states, get_job_states, init_db
+from services.event_bus import EventBus, JobStatePoller
+from worker.executor import DEFAULT_JOB_BACKLOG, DEFAULT_JOB_CONCURRENCY, JobExecutor
 from worker.loop import WorkerLoop
+from worker.pool import slot_ocr_jobs
+from worker.runner import SubprocessJobRunner
 
+# Dry-run plans run trial OCR inside the request; more concurrent plans get 429.
+DEFAULT_PLAN_CONCURRENCY = 1
 
-def create_app(*, books_root: Path = Path("workspace/books"), db_path: Path | None = None) -> FastAPI:
+
+def create_app(
+    *,
+    books_root: Path = Path("workspace/books"),
+    db_path: Path | None = None,
+    job_memory_limit_mb: int | None = None,
+    job_timeout_sec: float | None = None,
+    scratch_root: Path | None = None,
+    job_concurrency: int = DEFAULT_JOB_CONCURRENCY,
+    job_backlog: int = DEFAULT_JOB_BACKLOG,
+) -> FastAPI:
     resolved_books_root = books_root.resolve()
     resolved_books_root.mkdir(parents=True, exist_ok=True)
     resolved_db_path = db_path.resolve() if db_path is not None else resolved_books_root.parent / "db.sqlite"
     init_db(resolved_db_path)
 
-    worker = WorkerLoop(db_path=resolved_db_path, workspace_books_dir=resolved_books_root)
+    # WebSocket handlers are pushed progress of jobs run here; jobs run elsewhere are
+    # picked up by one shared poller instead of one DB poll loop per connection.
+    event_bus = EventBus()
+    job_poller = JobStatePoller(
+        event_bus,
+        lambda job_ids: get_job_states(resolved_db_path, job_ids),
+        fetch_active=lambda: get_active_job_states(resolved_db_path),
+    )
+
+    # Jobs run in child processes so a heavy or runaway book cannot stall or kill the API.
+    worker = WorkerLoop(
+        db_path=resolved_db_path,
+        workspace_books_dir=resolved_books_root,
+        pipeline_runner=SubprocessJobRunner(
+            memory_limit_mb=job_memory_limit_mb,
+            timeout_sec=job_timeout_sec,
+        ),
+        scratch_root=scratch_root,
+        ocr_jobs=slot_ocr_jobs(job_concurrency),
+        event_bus=event_bus,
+    )
     worker.initialize()
 
     app = FastAPI(title="ebookgen API", version="0.3.0")
     app.state.books_root = resolved_books_root
     app.state.db_path = resolved_db_path
     app.state.worker = worker
-    app.state.background_jobs: dict[str, Any] = {}
+    app.state.event_bus = event_bus
+    app.state.job_poller = job_poller
+    # run_now jobs share a fixed number of slots; beyond job_backlog waiting jobs the
+    # API answers 429 instead of starting yet another pipeline.
+    app.state.executor = JobExecutor(
+        worker=worker, concurrency=job_concurrency, max_backlog=job_backlog
+    )
+    app.state.plan_slots = threading.BoundedSemaphore(DEFAULT_PLAN_CONCURRENCY)
     app.state.ws_connection_limit = 100
     app.state.ws_max_connection_sec = 600.0
+    app.state.ws_stream_max_rate = 4.0
     app.state.ws_active_connections = 0
     app.state.ws_connection_lock = threading.Lock()
 
@@ -3,12 +3,18 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any
+import threading
 
 from starlette.requests import HTTPConnection
 
+from services.event_bus import EventBus, JobStatePoller
+from worker.executor import JobExecutor
 from worker.loop import WorkerLoop
 
+MAX_PAGE_SIZE = 500
+# List routes return a plain JSON array; the cursor of the next page travels here.
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
 
 def get_db_path(conn: HTTPConnection) -> Path:
     return conn.app.state.db_path
@@ -22,5 +28,17 @@ def get_worker(conn: HTTPConnection) -> WorkerLoop:
     return conn.app.state.worker
 
 
-def get_background_jobs(conn: HTTPConnection) -> dict[str, Any]:
-    return conn.app.state.background_jobs
+def get_executor(conn: HTTPConnection) -> JobExecutor:
+    return conn.app.state.executor
+
+
+def get_event_bus(conn: HTTPConnection) -> EventBus:
+    return conn.app.state.event_bus
+
+
+def get_job_poller(conn: HTTPConnection) -> JobStatePoller:
+    return conn.app.state.job_poller
+
+
+def get_plan_slots(conn: HTTPConnection) -> threading.Semaphore:
+    return conn.app.state.plan_slots
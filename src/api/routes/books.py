@@ -4,35 +4,103 @@ from __future__ import annotations
 
 from pathlib import Path
 import shutil
+import threading
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import PlainTextResponse
 
-from api.deps import get_books_root, get_db_path
+from api.deps import (
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    get_books_root,
+    get_db_path,
+    get_plan_slots,
+)
 from api.schemas import (
+    BookBatchCreateRequest,
+    BookBatchCreateResponse,
     BookCreateRequest,
     BookDetailResponse,
+    BookListItemResponse,
     BookPatchRequest,
     BookPreviewResponse,
     BookResponse,
+    JobResponse,
+    PlanRequest,
+    PlanResponse,
 )
-from core.manifest import read_manifest
+from core.errors import ValidationError
+from core.manifest import active_stage_dir, read_manifest, read_manifest_state
+from core.pipeline_types import PipelineSettings
+from core.planner import plan_conversion
+from core.streaming import PARTIAL_TEXT_NAME
+from core.validator import count_pages
 from models.database import (
+    DEFAULT_PAGE_SIZE,
     create_book,
+    create_books_and_jobs,
     delete_book,
     get_book,
-    list_books,
+    list_books_page,
+    list_books_with_latest_job_page,
     update_book_settings,
 )
+from models.schemas import Book, BookSpec
 
 router = APIRouter(prefix="/api/books", tags=["books"])
 
 SUPPORTED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".tif", ".tiff"}
 
 
-@router.get("", response_model=list[BookResponse])
-def list_books_route(db_path: Path = Depends(get_db_path)) -> list[BookResponse]:
-    books = list_books(db_path)
-    return [BookResponse.model_validate(book) for book in books]
+BOOK_INCLUDES = ("latest_job",)
+
+
+# latest_job is only serialized when requested, so the default listing keeps its shape.
+@router.get("", response_model=list[BookListItemResponse], response_model_exclude_unset=True)
+def list_books_route(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    status: str | None = None,
+    stage: str | None = None,
+    title_prefix: str | None = None,
+    created_after: str | None = None,
+    created_before: str | None = None,
+    include: str | None = None,
+    db_path: Path = Depends(get_db_path),
+) -> list[BookListItemResponse]:
+    if include is not None and include not in BOOK_INCLUDES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include '{include}'. Allowed: {', '.join(BOOK_INCLUDES)}",
+        )
+    filters = {
+        "limit": limit,
+        "cursor": cursor,
+        "status": status,
+        "stage": stage,
+        "title_prefix": title_prefix,
+        "created_after": created_after,
+        "created_before": created_before,
+    }
+    try:
+        if include == "latest_job":
+            rows, next_cursor = list_books_with_latest_job_page(db_path, **filters)
+            items = [
+                BookListItemResponse(
+                    **BookResponse.model_validate(book).model_dump(),
+                    latest_job=JobResponse.model_validate(job) if job is not None else None,
+                )
+                for book, job in rows
+            ]
+        else:
+            books, next_cursor = list_books_page(db_path, **filters)
+            items = [BookListItemResponse.model_validate(book) for book in books]
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
 
 
 @router.get("/{book_id}", response_model=BookDetailResponse)
@@ -42,7 +110,7 @@ def get_book_route(book_id: str, db_path: Path = Depends(get_db_path)) -> BookDe
         raise HTTPException(status_code=404, detail="Book not found")
 
     manifest_path = Path(book.book_dir) / "manifest.json"
-    manifest = read_manifest(manifest_path) if manifest_path.exists() else None
+    manifest = read_manifest_state(manifest_path) if manifest_path.exists() else None
     payload = BookDetailResponse.model_validate(book).model_dump()
     payload["manifest"] = manifest
     return BookDetailResponse.model_validate(payload)
@@ -72,6 +140,61 @@ def create_book_route(
     return BookResponse.model_validate(book)
 
 
+@router.post(
+    ":batch",
+    response_model=BookBatchCreateResponse,
+    response_model_exclude_unset=True,
+    status_code=201,
+)
+def create_books_batch_route(
+    request: BookBatchCreateRequest,
+    db_path: Path = Depends(get_db_path),
+    books_root: Path = Depends(get_books_root),
+) -> BookBatchCreateResponse:
+    specs = []
+    invalid = []
+    for item in request.books:
+        source_path = Path(item.path).resolve()
+        if not source_path.is_dir():
+            invalid.append(item.path)
+            continue
+        specs.append(
+            BookSpec(
+                source_path=source_path,
+                title=item.title,
+                ocr_language=item.ocr_language,
+                optimize_mode=item.optimize_mode,
+                error_policy=item.error_policy,
+                front_cover=item.front_cover,
+                back_cover=item.back_cover,
+                page_count=count_pages(source_path),
+            )
+        )
+    if invalid:
+        # All-or-nothing: nothing is inserted when any path is bad.
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid source directory path(s): {', '.join(invalid)}",
+        )
+
+    created = create_books_and_jobs(
+        db_path,
+        specs,
+        book_dir=books_root,
+        with_jobs=request.create_jobs,
+        scheduled_at=request.scheduled_at,
+        priority=request.priority,
+        submitter=request.submitter,
+    )
+    items = []
+    for book, job in created:
+        item = BookListItemResponse.model_validate(book)
+        if job is not None:
+            item.latest_job = JobResponse.model_validate(job)
+        items.append(item)
+    return BookBatchCreateResponse(books=items)
+
+
 @router.patch("/{book_id}", response_model=BookResponse)
 def patch_book_route(
     book_id: str,
@@ -131,3 +254,68 @@ def preview_book_route(book_id: str, db_path: Path = Depends(get_db_path)) -> Bo
 
     return BookPreviewResponse(front=files[:5], back=files[-5:])
 
+
+@router.get("/{book_id}/text", response_class=PlainTextResponse)
+def book_text_route(book_id: str, db_path: Path = Depends(get_db_path)) -> PlainTextResponse:
+    book = get_book(db_path, book_id)
+    if book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+
+    book_dir = Path(book.book_dir)
+    manifest_path = book_dir / "manifest.json"
+    stage_dirs = [book_dir / "stage"]
+    if manifest_path.exists():
+        # With --scratch, text.partial.txt only exists in the running worker's scratch.
+        active_dir = active_stage_dir(manifest_path, read_manifest(manifest_path))
+        if active_dir != stage_dirs[0]:
+            stage_dirs.insert(0, active_dir)
+    # Streaming runs expose recognized pages before the book is finished.
+    candidates = [
+        (book_dir / "out" / "book.txt", "true"),
+        *((stage_dir / "text.txt", "true") for stage_dir in stage_dirs),
+        *((stage_dir / PARTIAL_TEXT_NAME, "false") for stage_dir in stage_dirs),
+    ]
+    for path, complete in candidates:
+        try:
+            text = path.read_text(encoding="utf-8")
+        except FileNotFoundError:
+            continue
+        return PlainTextResponse(text, headers={"X-Text-Complete": complete})
+    raise HTTPException(status_code=404, detail="No text available yet")
+
+
+@router.post("/{book_id}/plan", response_model=PlanResponse)
+def plan_book_route(
+    book_id: str,
+    request: PlanRequest | None = None,
+    db_path: Path = Depends(get_db_path),
+    plan_slots: threading.Semaphore = Depends(get_plan_slots),
+) -> PlanResponse:
+    book = get_book(db_path, book_id)
+    if book is None:
+        raise HTTPException(status_code=404, detail="Book not found")
+    # Trial OCR is CPU-heavy and runs outside the job executor, so plans are capped too.
+    if not plan_slots.acquire(blocking=False):
+        raise HTTPException(status_code=429, detail="Too many plans running; retry later.")
+    try:
+        return _plan_book(book, request or PlanRequest())
+    finally:
+        plan_slots.release()
+
+
+def _plan_book(book: Book, request: PlanRequest) -> PlanResponse:
+    input_dir = Path(book.book_dir) / "input"
+    if not input_dir.exists():
+        input_dir = Path(book.source_path)
+    settings = PipelineSettings(
+        language=book.ocr_language,
+        optimize_mode=book.optimize_mode,
+        error_policy=book.error_policy,
+        front_cover=book.front_cover,
+        back_cover=book.back_cover,
+    )
+    try:
+        estimate = plan_conversion(input_dir, settings=settings, sample_pages=request.sample_pages)
+    except (FileNotFoundError, ValidationError, ValueError) as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    return PlanResponse(**estimate.to_dict())
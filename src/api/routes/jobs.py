@@ -2,82 +2,201 @@
 
 from __future__ import annotations
 
-import threading
 from pathlib import Path
-
-from fastapi import APIRouter, Depends, HTTPException
-
-from api.deps import get_background_jobs, get_db_path, get_worker
-from api.schemas import JobCreateRequest, JobCreateResponse, JobResponse, JobRetryRequest
-from models.database import cancel_job, create_job, get_book, get_job
+import time
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+
+from api.deps import (
+    MAX_PAGE_SIZE,
+    NEXT_CURSOR_HEADER,
+    get_db_path,
+    get_event_bus,
+    get_executor,
+    get_worker,
+)
+from api.schemas import (
+    JobCreateRequest,
+    JobCreateResponse,
+    JobProgressResponse,
+    JobResponse,
+    JobRetryRequest,
+)
+from core.manifest import read_manifest_state
+from core.pipeline_types import STAGE_NAMES
+from core.validator import count_pages
+from models.database import (
+    DEFAULT_PAGE_SIZE,
+    cancel_job,
+    create_job,
+    get_book,
+    get_job,
+    list_jobs_page,
+    stage_seconds_per_page,
+)
+from models.schemas import Job
+from services.event_bus import EventBus, JobState
+from services.progress import estimate_from_state
+from worker.executor import ExecutorFullError, JobExecutor
 from worker.loop import WorkerLoop
 
 router = APIRouter(prefix="/api/jobs", tags=["jobs"])
 
 
-def _start_job_in_background(
-    *,
-    worker: WorkerLoop,
-    job_id: str,
-    background_jobs: dict[str, threading.Thread],
-) -> None:
-    if job_id in background_jobs and background_jobs[job_id].is_alive():
-        return
+def _job_response(job: Job, executor: JobExecutor) -> JobResponse:
+    response = JobResponse.model_validate(job)
+    response.queue_position = executor.position(job.id)
+    return response
 
-    def _run() -> None:
-        try:
-            worker.process_job(job_id)
-        finally:
-            background_jobs.pop(job_id, None)
 
-    thread = threading.Thread(target=_run, daemon=True)
-    background_jobs[job_id] = thread
-    thread.start()
+def _progress_state(job: Job, db_path: Path, bus: EventBus) -> JobState:
+    """The job's state as the event bus would hold it, rebuilt from disk if needed."""
+    local_state = bus.state(job.id) if bus.is_local(job.id) else None
+    if local_state is not None:
+        return local_state
+    state: JobState = {"status": job.status, "stage": None, "page_count": job.page_count}
+    book = get_book(db_path, job.book_id)
+    if book is None:
+        return state
+    state["stage"] = book.current_stage
+    if job.status not in {"pending", "running"}:
+        return state
+    state["sec_per_page"] = stage_seconds_per_page(
+        db_path,
+        ocr_language=book.ocr_language,
+        optimize_mode=book.optimize_mode,
+        stages=STAGE_NAMES,
+    )
+    manifest_path = Path(book.book_dir) / "manifest.json"
+    if job.status == "running" and manifest_path.exists():
+        # Another process runs the job; its manifest is more current than the database.
+        payload = read_manifest_state(manifest_path)
+        state["stage"] = payload.get("current_stage", state["stage"])
+        state["stage_started_at"] = payload.get("stage_started_at")
+        progress = payload.get("progress") or {}
+        if progress.get("stage") == state["stage"]:
+            state["done"] = progress["done"]
+            state["total"] = progress["total"]
+    return state
+
+
+def _backlog_full(executor: JobExecutor) -> HTTPException:
+    return HTTPException(
+        status_code=429,
+        detail=f"Job backlog is full ({executor.max_backlog} jobs waiting); retry later.",
+    )
 
 
-@router.post("", response_model=JobCreateResponse, status_code=201)
+def _run_now(
+    job: Job, executor: JobExecutor, db_path: Path, response: Response
+) -> JobCreateResponse:
+    try:
+        executor.submit(job.id)
+    except ExecutorFullError:
+        # Lost a race for the last backlog slot; do not leave a job nobody asked to queue.
+        cancel_job(db_path, job.id)
+        raise _backlog_full(executor)
+    response.status_code = 202
+    return JobCreateResponse(job=_job_response(job, executor), started=True)
+
+
+@router.post(
+    "",
+    response_model=JobCreateResponse,
+    status_code=201,
+    responses={202: {"model": JobCreateResponse}, 429: {"description": "Job backlog is full"}},
+)
 def create_job_route(
     request: JobCreateRequest,
+    response: Response,
     db_path: Path = Depends(get_db_path),
-    worker: WorkerLoop = Depends(get_worker),
-    background_jobs: dict[str, threading.Thread] = Depends(get_background_jobs),
+    executor: JobExecutor = Depends(get_executor),
 ) -> JobCreateResponse:
     book = get_book(db_path, request.book_id)
     if book is None:
         raise HTTPException(status_code=404, detail="Book not found")
+    run_now = request.run_now and request.scheduled_at is None
+    if run_now and executor.full:
+        raise _backlog_full(executor)
 
     job = create_job(
         db_path,
         book_id=request.book_id,
         scheduled_at=request.scheduled_at,
         resume=request.resume,
+        priority=request.priority,
+        submitter=request.submitter,
+        page_count=count_pages(Path(book.source_path)),
     )
-
-    started = False
-    if request.run_now and request.scheduled_at is None:
-        _start_job_in_background(worker=worker, job_id=job.id, background_jobs=background_jobs)
-        started = True
-
-    return JobCreateResponse(job=JobResponse.model_validate(job), started=started)
+    if run_now:
+        return _run_now(job, executor, db_path, response)
+    return JobCreateResponse(job=JobResponse.model_validate(job), started=False)
+
+
+@router.get("", response_model=list[JobResponse])
+def list_jobs_route(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    status: str | None = None,
+    book_id: str | None = None,
+    stage: str | None = None,
+    title_prefix: str | None = None,
+    created_after: str | None = None,
+    created_before: str | None = None,
+    db_path: Path = Depends(get_db_path),
+    executor: JobExecutor = Depends(get_executor),
+) -> list[JobResponse]:
+    try:
+        jobs, next_cursor = list_jobs_page(
+            db_path,
+            limit=limit,
+            cursor=cursor,
+            status=status,
+            book_id=book_id,
+            stage=stage,
+            title_prefix=title_prefix,
+            created_after=created_after,
+            created_before=created_before,
+        )
+    except ValueError as error:
+        raise HTTPException(status_code=400, detail=str(error))
+    if next_cursor is not None:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return [_job_response(job, executor) for job in jobs]
 
 
 @router.get("/{job_id}", response_model=JobResponse)
-def get_job_route(job_id: str, db_path: Path = Depends(get_db_path)) -> JobResponse:
+def get_job_route(
+    job_id: str,
+    db_path: Path = Depends(get_db_path),
+    executor: JobExecutor = Depends(get_executor),
+    bus: EventBus = Depends(get_event_bus),
+) -> JobResponse:
     job = get_job(db_path, job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
-    return JobResponse.model_validate(job)
+    response = _job_response(job, executor)
+    estimate = estimate_from_state(_progress_state(job, db_path, bus), time.time())
+    response.progress = JobProgressResponse.model_validate(estimate.to_dict())
+    return response
 
 
 @router.post("/{job_id}/cancel", response_model=JobResponse)
-def cancel_job_route(job_id: str, db_path: Path = Depends(get_db_path)) -> JobResponse:
+def cancel_job_route(
+    job_id: str,
+    db_path: Path = Depends(get_db_path),
+    worker: WorkerLoop = Depends(get_worker),
+    executor: JobExecutor = Depends(get_executor),
+) -> JobResponse:
     existing = get_job(db_path, job_id)
     if existing is None:
         raise HTTPException(status_code=404, detail="Job not found")
 
-    cancelled = cancel_job(db_path, job_id)
+    cancelled = worker.request_cancel(job_id)
     if not cancelled:
         raise HTTPException(status_code=409, detail="Job cannot be cancelled")
+    executor.discard(job_id)
 
     updated = get_job(db_path, job_id)
     if updated is None:
@@ -85,26 +204,35 @@ def cancel_job_route(job_id: str, db_path: Path = Depends(get_db_path)) -> JobRe
     return JobResponse.model_validate(updated)
 
 
-@router.post("/{job_id}/retry", response_model=JobCreateResponse, status_code=201)
+@router.post(
+    "/{job_id}/retry",
+    response_model=JobCreateResponse,
+    status_code=201,
+    responses={202: {"model": JobCreateResponse}, 429: {"description": "Job backlog is full"}},
+)
 def retry_job_route(
     job_id: str,
     request: JobRetryRequest,
+    response: Response,
     db_path: Path = Depends(get_db_path),
-    worker: WorkerLoop = Depends(get_worker),
-    background_jobs: dict[str, threading.Thread] = Depends(get_background_jobs),
+    executor: JobExecutor = Depends(get_executor),
 ) -> JobCreateResponse:
     job = get_job(db_path, job_id)
     if job is None:
         raise HTTPException(status_code=404, detail="Job not found")
     if job.status not in {"failed", "cancelled"}:
         raise HTTPException(status_code=409, detail="Only failed/cancelled jobs can be retried")
+    if request.run_now and executor.full:
+        raise _backlog_full(executor)
 
-    retry_job = create_job(db_path, book_id=job.book_id, resume=True)
-
-    started = False
+    retry_job = create_job(
+        db_path,
+        book_id=job.book_id,
+        resume=True,
+        priority=job.priority,
+        submitter=job.fair_key or None,
+        page_count=job.page_count,
+    )
     if request.run_now:
-        _start_job_in_background(worker=worker, job_id=retry_job.id, background_jobs=background_jobs)
-        started = True
-
-    return JobCreateResponse(job=JobResponse.model_validate(retry_job), started=started)
-
+        return _run_now(retry_job, executor, db_path, response)
+    return JobCreateResponse(job=JobResponse.model_validate(retry_job), started=False)
@@ -1,4 +1,4 @@
-"""WebSocket route for job progress updates."""
+"""WebSocket route for job progress updates, pushed from the in-process event bus."""
 
 from __future__ import annotations
 
@@ -6,35 +6,66 @@ import asyncio
 import time
 from pathlib import Path
 
-from fastapi import APIRouter, Depends, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, Query, WebSocket, WebSocketDisconnect
 
-from api.deps import get_db_path
-from models.database import get_book, get_job
+from api.deps import get_db_path, get_event_bus, get_job_poller
+from models.database import get_job_states
+from services.event_bus import TERMINAL_STATUSES, EventBus, JobState, JobStatePoller
+from services.progress import estimate_from_state
 
 router = APIRouter(tags=["ws"])
 
-STAGE_PERCENT = {
-    "validate": 20,
-    "assemble": 40,
-    "ocr": 60,
-    "optimize": 80,
-    "finalize": 100,
-}
 
-
-def _progress_payload(*, job_id: str, job_status: str, stage: str) -> dict[str, object]:
-    percent = STAGE_PERCENT.get(stage, 0)
-    if job_status == "done":
-        percent = 100
+def _progress_payload(*, job_id: str, state: JobState) -> dict[str, object]:
+    stage = state.get("stage") or "validate"
+    estimate = estimate_from_state({**state, "stage": stage}, time.time())
     return {
         "type": "progress",
         "job_id": job_id,
-        "status": job_status,
+        "status": state["status"],
         "step_name": stage,
-        "percent": percent,
+        "pages_done": estimate.pages_done,
+        "pages_total": estimate.pages_total,
+        "percent": estimate.percent,
+        "eta_sec": estimate.eta_sec,
     }
 
 
+# Fields of a job's state a dashboard stream sends; job_id keys the map, seq is the id.
+_STREAM_FIELDS = ("status", "stage", "done", "total", "percent", "eta_sec")
+DEFAULT_STREAM_MAX_RATE = 4.0
+MAX_STREAM_RATE = 20.0
+
+
+def _stream_delta(
+    sent: dict[str, JobState], states: list[JobState]
+) -> dict[str, dict[str, object]]:
+    """Changed fields per job since the last message; updates sent in place.
+
+    Jobs new to this connection get all fields. A finished job is sent once more with
+    its final status and then forgotten.
+    """
+    changes: dict[str, dict[str, object]] = {}
+    now = time.time()
+    for state in states:
+        estimate = estimate_from_state(state, now)
+        state = {**state, "percent": estimate.percent, "eta_sec": estimate.eta_sec}
+        job_id = state["job_id"]
+        previous = sent.get(job_id)
+        fields = {
+            name: state.get(name)
+            for name in _STREAM_FIELDS
+            if previous is None or previous.get(name) != state.get(name)
+        }
+        if fields:
+            changes[job_id] = fields
+        if state["status"] in TERMINAL_STATUSES:
+            sent.pop(job_id, None)
+        else:
+            sent[job_id] = state
+    return changes
+
+
 def _completion_payload(*, job_id: str, job_status: str) -> dict[str, object]:
     return {"type": "completion", "job_id": job_id, "status": job_status}
 
@@ -57,50 +88,159 @@ def _release_ws_slot(websocket: WebSocket) -> None:
         websocket.app.state.ws_active_connections = max(0, active - 1)
 
 
+async def _initial_state(bus: EventBus, db_path: Path, job_id: str) -> JobState | None:
+    state = bus.state(job_id)
+    if state is not None:
+        return state
+    states = await asyncio.to_thread(get_job_states, db_path, [job_id])
+    if job_id not in states:
+        return None
+    status, stage = states[job_id]
+    bus.publish(job_id, {"type": "job", "status": status, "stage": stage}, local=False)
+    return bus.state(job_id)
+
+
 @router.websocket("/ws/jobs/{job_id}")
 async def job_progress_ws(
     websocket: WebSocket,
     job_id: str,
     db_path: Path = Depends(get_db_path),
+    bus: EventBus = Depends(get_event_bus),
+    poller: JobStatePoller = Depends(get_job_poller),
 ) -> None:
     if not _try_acquire_ws_slot(websocket):
         await websocket.close(code=1013)
         return
 
     await websocket.accept()
-    last_state: tuple[str, str] | None = None
-    started_at = time.monotonic()
     max_connection_sec = float(getattr(websocket.app.state, "ws_max_connection_sec", 600.0))
-
+    deadline = time.monotonic() + max_connection_sec
+    # Subscribe before reading the initial state so no change falls in between.
+    subscription = bus.subscribe(job_id)
+    poller.watch(job_id)
     try:
+        state = await _initial_state(bus, db_path, job_id)
+        if state is None:
+            await websocket.send_json({"type": "error", "message": "Job not found"})
+            await websocket.close(code=1008)
+            return
+
+        last_state: tuple[object, ...] | None = None
         while True:
-            if time.monotonic() - started_at > max_connection_sec:
-                await websocket.send_json({"type": "error", "message": "WebSocket session timed out"})
-                await websocket.close(code=1000)
+            current = (state["status"], state.get("stage"), state.get("done"), state.get("total"))
+            if current != last_state:
+                await websocket.send_json(_progress_payload(job_id=job_id, state=state))
+                last_state = current
+
+            if state["status"] in TERMINAL_STATUSES:
+                await websocket.send_json(
+                    _completion_payload(job_id=job_id, job_status=state["status"])
+                )
                 return
 
-            job = get_job(db_path, job_id)
-            if job is None:
-                await websocket.send_json({"type": "error", "message": "Job not found"})
-                await websocket.close(code=1008)
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                await websocket.send_json(
+                    {"type": "error", "message": "WebSocket session timed out"}
+                )
+                await websocket.close(code=1000)
                 return
+            try:
+                state = await asyncio.wait_for(subscription.get(), remaining)
+            except asyncio.TimeoutError:
+                continue
+    except WebSocketDisconnect:
+        return
+    finally:
+        poller.unwatch(job_id)
+        subscription.close()
+        _release_ws_slot(websocket)
+
+
+@router.websocket("/ws/jobs")
+async def jobs_stream_ws(
+    websocket: WebSocket,
+    job_id: list[str] | None = Query(None),
+    last_event_id: int | None = Query(None, ge=0),
+    max_rate: float | None = Query(None, gt=0, le=MAX_STREAM_RATE),
+    bus: EventBus = Depends(get_event_bus),
+    poller: JobStatePoller = Depends(get_job_poller),
+) -> None:
+    """Stream every active job (or the given job_id values) over one connection.
+
+    The first message is a "snapshot" of all matching jobs; later "delta" messages only
+    carry fields that changed, at most max_rate messages per second. Every message has
+    an id; reconnecting with last_event_id=<id> continues with a delta of everything
+    that changed since, or a fresh snapshot if that history is no longer retained.
+    """
+    if not _try_acquire_ws_slot(websocket):
+        await websocket.close(code=1013)
+        return
 
-            book = get_book(db_path, job.book_id)
-            stage = book.current_stage if book is not None else "validate"
-            state = (job.status, stage)
+    await websocket.accept()
+    max_connection_sec = float(getattr(websocket.app.state, "ws_max_connection_sec", 600.0))
+    deadline = time.monotonic() + max_connection_sec
+    default_rate = getattr(websocket.app.state, "ws_stream_max_rate", DEFAULT_STREAM_MAX_RATE)
+    min_interval = 1.0 / (max_rate or float(default_rate))
+    selected = set(job_id) if job_id else None
+
+    def matching(states: list[JobState]) -> list[JobState]:
+        return [state for state in states if selected is None or state["job_id"] in selected]
+
+    subscription = bus.subscribe()
+    if selected is None:
+        poller.watch_active()
+    else:
+        for selected_id in selected:
+            poller.watch(selected_id)
+    try:
+        await poller.poll_once()
+        sent: dict[str, JobState] = {}
+        # Changes after this id are either in the states read below or already pushed
+        # to the subscription, so a client resuming from it misses nothing.
+        event_id = bus.seq
+        if last_event_id is not None and bus.can_resume(last_event_id):
+            message_type = "delta"
+            initial = matching(bus.states(since_seq=last_event_id))
+        else:
+            message_type = "snapshot"
+            initial = matching(bus.states(active_only=selected is None))
+        await websocket.send_json(
+            {"type": message_type, "id": event_id, "jobs": _stream_delta(sent, initial)}
+        )
+        last_sent_at = time.monotonic()
 
-            if state != last_state:
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
                 await websocket.send_json(
-                    _progress_payload(job_id=job_id, job_status=job.status, stage=stage)
+                    {"type": "error", "message": "WebSocket session timed out"}
                 )
-                last_state = state
-
-            if job.status in {"done", "failed", "cancelled"}:
-                await websocket.send_json(_completion_payload(job_id=job_id, job_status=job.status))
+                await websocket.close(code=1000)
                 return
-
-            await asyncio.sleep(0.2)
+            try:
+                first = await asyncio.wait_for(subscription.get(), remaining)
+            except asyncio.TimeoutError:
+                continue
+            # Coalesce: whatever else changes before the rate limit allows the next
+            # message is folded into it.
+            wait_sec = last_sent_at + min_interval - time.monotonic()
+            if wait_sec > 0:
+                await asyncio.sleep(wait_sec)
+            states = [first, *subscription.drain()]
+            event_id = max(event_id, *(state["seq"] for state in states))
+            changes = _stream_delta(sent, matching(states))
+            if not changes:
+                continue
+            await websocket.send_json({"type": "delta", "id": event_id, "jobs": changes})
+            last_sent_at = time.monotonic()
     except WebSocketDisconnect:
         return
     finally:
+        if selected is None:
+            poller.unwatch_active()
+        else:
+            for selected_id in selected:
+                poller.unwatch(selected_id)
+        subscription.close()
         _release_ws_slot(websocket)
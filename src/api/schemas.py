@@ -15,6 +15,17 @@ class BookCreateRequest(BaseModel):
     back_cover: int | None = None
 
 
+MAX_BATCH_BOOKS = 5000
+
+
+class BookBatchCreateRequest(BaseModel):
+    books: list[BookCreateRequest] = Field(..., min_length=1, max_length=MAX_BATCH_BOOKS)
+    create_jobs: bool = True
+    scheduled_at: str | None = None
+    priority: int = 0
+    submitter: str | None = None
+
+
 class BookPatchRequest(BaseModel):
     ocr_language: str | None = None
     optimize_mode: str | None = None
@@ -50,17 +61,45 @@ class BookPreviewResponse(BaseModel):
     back: list[str]
 
 
+class PlanRequest(BaseModel):
+    sample_pages: int = Field(3, ge=1, le=20)
+
+
+class PlanResponse(BaseModel):
+    total_pages: int
+    input_size_mb: float
+    sampled_pages: list[int]
+    ocr_backend: str
+    ocr_sec_per_page: float
+    compression_ratio: float
+    estimated_wall_time_sec: float
+    estimated_peak_memory_mb: float
+    estimated_disk_mb: float
+    estimated_output_mb: float
+
+
 class JobCreateRequest(BaseModel):
     book_id: str
     run_now: bool = True
     scheduled_at: str | None = None
     resume: bool = False
+    priority: int = 0
+    submitter: str | None = None
 
 
 class JobRetryRequest(BaseModel):
     run_now: bool = True
 
 
+class JobProgressResponse(BaseModel):
+    stage: str | None
+    pages_done: int | None
+    pages_total: int | None
+    percent: float
+    # Unknown until the book's page count is.
+    eta_sec: float | None
+
+
 class JobResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
@@ -74,6 +113,23 @@ class JobResponse(BaseModel):
     resume: bool
     created_at: str
     updated_at: str
+    lease_owner: str | None = None
+    lease_expires_at: str | None = None
+    priority: int = 0
+    fair_key: str = ""
+    page_count: int | None = None
+    # Set while the API's executor holds the job: 0 running, n = n-th in line.
+    queue_position: int | None = None
+    # Only filled in by GET /api/jobs/{job_id}.
+    progress: JobProgressResponse | None = None
+
+
+class BookListItemResponse(BookResponse):
+    latest_job: JobResponse | None = None
+
+
+class BookBatchCreateResponse(BaseModel):
+    books: list[BookListItemResponse]
 
 
 class JobCreateResponse(BaseModel):
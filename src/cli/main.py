@@ -7,18 +7,29 @@ from pathlib import Path
 
 import typer
 
+from core.ingest import INGEST_MODES
+from core.errors import ValidationError
+from core.pipeline_types import EXECUTION_MODES, PipelineSettings
+from core.planner import DEFAULT_SAMPLE_PAGES, plan_conversion
+from core.profiling import DEFAULT_TOP_N, PROFILE_DIR_NAME, load_hotspots
+from core.validator import count_pages
 from models.database import (
+    DEFAULT_PAGE_SIZE,
+    SCHEDULING_POLICIES,
     create_book,
+    create_books_and_jobs,
     create_job,
     find_latest_failed_book_by_source,
     get_book,
     get_job,
-    get_latest_job_for_book,
     init_db,
-    list_books,
+    iter_books_with_latest_job,
     utc_now_iso,
 )
+from models.schemas import BookSpec
+from worker.executor import DEFAULT_JOB_BACKLOG, DEFAULT_JOB_CONCURRENCY
 from worker.loop import WorkerLoop
+from worker.pool import WorkerPool
 
 app = typer.Typer(
     help="Convert image folders into searchable PDF and text files.",
@@ -40,13 +51,39 @@ def _resolve_job_schedule(delay_minutes: int) -> str | None:
     return (datetime.now(timezone.utc) + timedelta(minutes=delay_minutes)).isoformat()
 
 
+def _validate_ingest_mode(ingest: str) -> None:
+    if ingest not in INGEST_MODES:
+        raise typer.BadParameter(f"--ingest must be one of: {', '.join(INGEST_MODES)}.")
+
+
+def _validate_execution_mode(execution: str) -> None:
+    if execution not in EXECUTION_MODES:
+        raise typer.BadParameter(f"--execution must be one of: {', '.join(EXECUTION_MODES)}.")
+
+
+def _validate_scheduling_policy(policy: str) -> None:
+    if policy not in SCHEDULING_POLICIES:
+        raise typer.BadParameter(f"--schedule must be one of: {', '.join(SCHEDULING_POLICIES)}.")
+
+
 def _run_single_job(
     *,
     db_path: Path,
     books_root: Path,
     job_id: str,
+    ingest_mode: str = "copy",
+    profile: bool = False,
+    execution_mode: str = "batch",
+    scratch_root: Path | None = None,
 ) -> None:
-    worker = WorkerLoop(db_path=db_path, workspace_books_dir=books_root)
+    worker = WorkerLoop(
+        db_path=db_path,
+        workspace_books_dir=books_root,
+        ingest_mode=ingest_mode,
+        profile=profile,
+        execution_mode=execution_mode,
+        scratch_root=scratch_root,
+    )
     worker.initialize()
     processed = worker.process_job(job_id)
     if not processed:
@@ -107,9 +144,33 @@ def convert(
     front_cover: int | None = typer.Option(None, "--front-cover"),
     back_cover: int | None = typer.Option(None, "--back-cover"),
     resume: bool = typer.Option(False, "--resume", help="Resume the latest failed job for this input."),
+    ingest: str = typer.Option(
+        "copy",
+        "--ingest",
+        help="copy|hardlink|reflink|move; falls back to copy across filesystems.",
+    ),
+    profile: bool = typer.Option(
+        False,
+        "--profile",
+        help="Write cProfile/tracemalloc output per stage under stage/profile/.",
+    ),
+    execution: str = typer.Option(
+        "batch",
+        "--execution",
+        help="batch|streaming; streaming OCRs pages as they are validated.",
+    ),
+    scratch: Path | None = typer.Option(
+        None,
+        "--scratch",
+        file_okay=False,
+        dir_okay=True,
+        help="Fast local directory for stage/ during runs; checkpoints sync to --output.",
+    ),
     db: Path | None = typer.Option(None, "--db", file_okay=True, dir_okay=False),
 ) -> None:
     """Run conversion immediately and persist state/job history in SQLite."""
+    _validate_ingest_mode(ingest)
+    _validate_execution_mode(execution)
     books_root = output.resolve()
     books_root.mkdir(parents=True, exist_ok=True)
     db_path = _resolve_db_path(books_root, db)
@@ -118,7 +179,7 @@ def convert(
     if resume:
         book = find_latest_failed_book_by_source(db_path, input_dir.resolve())
         if book is None:
-            raise typer.BadParameter("No failed book found for --resume input.")
+            raise typer.BadParameter("No failed or cancelled book found for --resume input.")
         _warn_if_resume_overrides(
             book=book,
             language=language,
@@ -141,7 +202,15 @@ def convert(
         )
         job = create_job(db_path, book_id=book.id, resume=False)
 
-    _run_single_job(db_path=db_path, books_root=books_root, job_id=job.id)
+    _run_single_job(
+        db_path=db_path,
+        books_root=books_root,
+        job_id=job.id,
+        ingest_mode=ingest,
+        profile=profile,
+        execution_mode=execution,
+        scratch_root=scratch,
+    )
 
     job_state = get_job(db_path, job.id)
     book_state = get_book(db_path, job.book_id)
@@ -173,11 +242,36 @@ def batch(
     skip_errors: bool = typer.Option(True, "--skip-errors/--abort-on-error"),
     delay_minutes: int = typer.Option(0, "--delay-minutes", min=0),
     run_now: bool = typer.Option(False, "--run-now/--queue-only"),
+    ingest: str = typer.Option(
+        "copy", "--ingest", help="copy|hardlink|reflink|move (with --run-now)."
+    ),
+    execution: str = typer.Option("batch", "--execution", help="batch|streaming (with --run-now)."),
+    scratch: Path | None = typer.Option(
+        None,
+        "--scratch",
+        file_okay=False,
+        dir_okay=True,
+        help="Fast local directory for stage/ during --run-now runs; checkpoints sync to --output.",
+    ),
+    priority: int = typer.Option(0, "--priority", help="Higher runs sooner; may be negative."),
+    submitter: str | None = typer.Option(
+        None, "--submitter", help="Fair-share key (default: input_root)."
+    ),
+    schedule: str = typer.Option("fair", "--schedule", help="fair|sjf|fifo (with --run-now)."),
     db: Path | None = typer.Option(None, "--db", file_okay=True, dir_okay=False),
 ) -> None:
     """Create jobs for each subdirectory under input_root; optionally execute immediately."""
+    _validate_ingest_mode(ingest)
+    _validate_execution_mode(execution)
+    _validate_scheduling_policy(schedule)
     if run_now and delay_minutes > 0:
         raise typer.BadParameter("--run-now and --delay-minutes are mutually exclusive.")
+    if not run_now and (ingest != "copy" or execution != "batch" or scratch is not None):
+        # Queued jobs run with the settings of whichever worker claims them.
+        raise typer.BadParameter(
+            "--ingest, --execution and --scratch need --run-now; "
+            "pass them to `worker` for queued jobs."
+        )
 
     books_root = output.resolve()
     books_root.mkdir(parents=True, exist_ok=True)
@@ -190,22 +284,35 @@ def batch(
         return
 
     scheduled_at = _resolve_job_schedule(delay_minutes)
-    created_jobs = []
-    for directory in subdirs:
-        book = create_book(
-            db_path,
-            source_path=directory.resolve(),
-            book_dir=books_root,
+    specs = [
+        BookSpec(
+            source_path=directory,
             ocr_language=language,
             optimize_mode=optimize,
             error_policy="skip" if skip_errors else "abort",
+            page_count=count_pages(directory),
         )
-        job = create_job(db_path, book_id=book.id, scheduled_at=scheduled_at, resume=False)
-        created_jobs.append(job)
-
-    typer.echo(f"queued_jobs: {len(created_jobs)}")
+        for directory in subdirs
+    ]
+    created = create_books_and_jobs(
+        db_path,
+        specs,
+        book_dir=books_root,
+        scheduled_at=scheduled_at,
+        priority=priority,
+        submitter=submitter,
+    )
+
+    typer.echo(f"queued_jobs: {len(created)}")
     if run_now and delay_minutes == 0:
-        worker = WorkerLoop(db_path=db_path, workspace_books_dir=books_root)
+        worker = WorkerLoop(
+            db_path=db_path,
+            workspace_books_dir=books_root,
+            ingest_mode=ingest,
+            execution_mode=execution,
+            scratch_root=scratch,
+            scheduling_policy=schedule,
+        )
         worker.initialize()
         processed = 0
         now_iso = utc_now_iso()
@@ -224,36 +331,218 @@ def status(
         help="Workspace root for generated book directories.",
     ),
     db: Path | None = typer.Option(None, "--db", file_okay=True, dir_okay=False),
+    status_filter: str | None = typer.Option(None, "--status", help="Only books in this status."),
+    title_prefix: str | None = typer.Option(
+        None, "--title", help="Only titles starting with this."
+    ),
+    page_size: int = typer.Option(DEFAULT_PAGE_SIZE, "--page-size", min=1),
 ) -> None:
     """Print books and latest job status."""
     books_root = output.resolve()
     db_path = _resolve_db_path(books_root, db)
     init_db(db_path)
 
-    books = list_books(db_path)
-    if not books:
+    found = False
+    for page in iter_books_with_latest_job(
+        db_path, page_size=page_size, status=status_filter, title_prefix=title_prefix
+    ):
+        found = True
+        lines = [
+            f"{book.title} ({book.id}) | book={book.status} | stage={book.current_stage} | "
+            f"latest_job={latest_job.status if latest_job else '-'}"
+            for book, latest_job in page
+        ]
+        # One write per page, so output appears as soon as each page is fetched.
+        typer.echo("\n".join(lines))
+    if not found:
         typer.echo("No books found.")
-        return
 
-    for book in books:
-        latest_job = get_latest_job_for_book(db_path, book.id)
-        latest_job_status = latest_job.status if latest_job else "-"
+
+@app.command("profile")
+def profile_command(
+    book_id: str = typer.Argument(...),
+    output: Path = typer.Option(
+        Path("workspace/books"),
+        "--output",
+        file_okay=False,
+        dir_okay=True,
+        help="Workspace root for generated book directories.",
+    ),
+    top: int = typer.Option(DEFAULT_TOP_N, "--top", min=1),
+    sort: str = typer.Option("tottime", "--sort", help="tottime|cumtime"),
+    db: Path | None = typer.Option(None, "--db", file_okay=True, dir_okay=False),
+) -> None:
+    """Print a merged hot-spot table from a book's per-stage profiles."""
+    books_root = output.resolve()
+    db_path = _resolve_db_path(books_root, db)
+    init_db(db_path)
+
+    book = get_book(db_path, book_id)
+    book_dir = Path(book.book_dir) if book is not None else books_root / book_id
+    profile_dir = book_dir / "stage" / PROFILE_DIR_NAME
+    try:
+        hotspots = load_hotspots(profile_dir, top_n=top, sort_by=sort)
+    except FileNotFoundError:
+        typer.echo(f"No profiles found for {book_id}; run with --profile first.", err=True)
+        raise typer.Exit(code=1)
+    except ValueError as error:
+        raise typer.BadParameter(str(error))
+
+    typer.echo(f"{'calls':>10}  {'tottime':>10}  {'cumtime':>10}  function")
+    for hotspot in hotspots:
         typer.echo(
-            f"{book.title} ({book.id}) | book={book.status} | stage={book.current_stage} | "
-            f"latest_job={latest_job_status}"
+            f"{hotspot.calls:>10}  {hotspot.total_time_sec:>10.4f}  "
+            f"{hotspot.cumulative_time_sec:>10.4f}  {hotspot.function}"
         )
 
 
+@app.command()
+def plan(
+    input_dir: Path = typer.Argument(..., exists=True, file_okay=False, dir_okay=True),
+    language: str = typer.Option("kor+eng", "--language", help="OCR language hint."),
+    optimize: str = typer.Option("basic", "--optimize", help="basic|balanced|max"),
+    front_cover: int | None = typer.Option(None, "--front-cover"),
+    back_cover: int | None = typer.Option(None, "--back-cover"),
+    ingest: str = typer.Option("copy", "--ingest", help="copy|hardlink|reflink|move"),
+    sample: int = typer.Option(DEFAULT_SAMPLE_PAGES, "--sample", min=1, help="Pages to trial-run."),
+) -> None:
+    """Estimate time, memory, disk and output size without queuing a job."""
+    _validate_ingest_mode(ingest)
+    settings = PipelineSettings(
+        language=language,
+        optimize_mode=optimize,
+        front_cover=front_cover,
+        back_cover=back_cover,
+        ingest_mode=ingest,
+    )
+    try:
+        estimate = plan_conversion(input_dir.resolve(), settings=settings, sample_pages=sample)
+    except (ValidationError, ValueError) as error:
+        typer.echo(f"Cannot plan {input_dir}: {error}", err=True)
+        raise typer.Exit(code=1)
+
+    typer.echo(f"pages: {estimate.total_pages}")
+    typer.echo(f"input_size_mb: {estimate.input_size_mb}")
+    typer.echo(f"sampled_pages: {', '.join(str(page) for page in estimate.sampled_pages)}")
+    typer.echo(f"ocr_backend: {estimate.ocr_backend}")
+    typer.echo(f"ocr_sec_per_page: {estimate.ocr_sec_per_page}")
+    typer.echo(f"estimated_wall_time_sec: {estimate.estimated_wall_time_sec}")
+    typer.echo(f"estimated_peak_memory_mb: {estimate.estimated_peak_memory_mb}")
+    typer.echo(f"estimated_disk_mb: {estimate.estimated_disk_mb}")
+    typer.echo(f"estimated_output_mb: {estimate.estimated_output_mb}")
+
+
+@app.command()
+def worker(
+    output: Path = typer.Option(
+        Path("workspace/books"),
+        "--output",
+        file_okay=False,
+        dir_okay=True,
+        help="Workspace root for generated book directories.",
+    ),
+    concurrency: int = typer.Option(1, "--concurrency", min=1, help="Jobs to run at once."),
+    ocr_jobs: int | None = typer.Option(
+        None, "--ocr-jobs", min=1, help="OCR parallelism per job (default: CPUs / concurrency)."
+    ),
+    poll_interval: float = typer.Option(
+        30.0, "--poll-interval", min=0.1, help="Fallback poll; new jobs wake the worker."
+    ),
+    schedule: str = typer.Option("fair", "--schedule", help="fair|sjf|fifo"),
+    ingest: str = typer.Option("copy", "--ingest", help="copy|hardlink|reflink|move"),
+    execution: str = typer.Option("batch", "--execution", help="batch|streaming"),
+    scratch: Path | None = typer.Option(
+        None,
+        "--scratch",
+        file_okay=False,
+        dir_okay=True,
+        help="Fast local directory for stage/ during runs; checkpoints sync to --output.",
+    ),
+    db: Path | None = typer.Option(None, "--db", file_okay=True, dir_okay=False),
+) -> None:
+    """Run queued jobs until SIGTERM/Ctrl-C (first signal drains, second stops)."""
+    _validate_ingest_mode(ingest)
+    _validate_execution_mode(execution)
+    _validate_scheduling_policy(schedule)
+
+    books_root = output.resolve()
+    books_root.mkdir(parents=True, exist_ok=True)
+    pool = WorkerPool(
+        db_path=_resolve_db_path(books_root, db),
+        workspace_books_dir=books_root,
+        concurrency=concurrency,
+        ocr_jobs=ocr_jobs,
+        poll_interval_sec=poll_interval,
+        ingest_mode=ingest,
+        execution_mode=execution,
+        scratch_root=scratch,
+        scheduling_policy=schedule,
+    )
+    typer.echo(f"worker_slots: {concurrency}")
+    typer.echo(f"ocr_jobs_per_slot: {pool.slot_ocr_jobs}")
+    pool.run()
+    typer.echo("worker drained")
+
+
 @app.command()
 def serve(
     host: str = typer.Option("127.0.0.1", "--host"),
     port: int = typer.Option(8000, "--port"),
     reload: bool = typer.Option(False, "--reload/--no-reload"),
+    job_memory_mb: int | None = typer.Option(
+        None, "--job-memory-mb", min=1, help="Address-space limit for each job process."
+    ),
+    job_timeout: float | None = typer.Option(
+        None, "--job-timeout", min=1, help="Wall-clock limit in seconds for each job."
+    ),
+    scratch: Path | None = typer.Option(
+        None,
+        "--scratch",
+        file_okay=False,
+        dir_okay=True,
+        help="Fast local directory for stage/ during runs; checkpoints sync to --output.",
+    ),
+    job_concurrency: int = typer.Option(
+        DEFAULT_JOB_CONCURRENCY, "--job-concurrency", min=1, help="run_now jobs run at once."
+    ),
+    job_backlog: int = typer.Option(
+        DEFAULT_JOB_BACKLOG,
+        "--job-backlog",
+        min=0,
+        help="run_now jobs allowed to wait before the API answers 429.",
+    ),
 ) -> None:
     """Start FastAPI server."""
     import uvicorn
 
-    uvicorn.run("api.app:app", host=host, port=port, reload=reload)
+    customized = (
+        job_memory_mb is not None
+        or job_timeout is not None
+        or scratch is not None
+        or job_concurrency != DEFAULT_JOB_CONCURRENCY
+        or job_backlog != DEFAULT_JOB_BACKLOG
+    )
+    if not customized:
+        uvicorn.run("api.app:app", host=host, port=port, reload=reload)
+        return
+    if reload:
+        raise typer.BadParameter(
+            "--reload cannot be combined with job limits, executor sizing or --scratch."
+        )
+
+    from api.app import create_app
+
+    uvicorn.run(
+        create_app(
+            job_memory_limit_mb=job_memory_mb,
+            job_timeout_sec=job_timeout,
+            scratch_root=scratch,
+            job_concurrency=job_concurrency,
+            job_backlog=job_backlog,
+        ),
+        host=host,
+        port=port,
+    )
 
 
 def main() -> None:
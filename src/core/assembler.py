@@ -33,6 +33,13 @@ def _write_pdf_with_pillow(page_paths: list[Path], output_pdf: Path) -> None:
         image.close()
 
 
+def write_pdf(page_paths: list[Path], output_pdf: Path) -> Path:
+    """Write page images to output_pdf, preferring lossless img2pdf over Pillow."""
+    if not _write_pdf_with_img2pdf(page_paths, output_pdf):
+        _write_pdf_with_pillow(page_paths, output_pdf)
+    return output_pdf
+
+
 def assemble(
     input_dir: Path,
     stage_dir: Path,
@@ -46,10 +53,5 @@ def assemble(
 
     ordered_pages = apply_cover_order(page_paths, front_cover=front_cover, back_cover=back_cover)
     stage_dir.mkdir(parents=True, exist_ok=True)
-    output_pdf = stage_dir / "raw.pdf"
-
-    if not _write_pdf_with_img2pdf(ordered_pages, output_pdf):
-        _write_pdf_with_pillow(ordered_pages, output_pdf)
-
-    return output_pdf
+    return write_pdf(ordered_pages, stage_dir / "raw.pdf")
 
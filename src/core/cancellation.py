@@ -0,0 +1,64 @@
+"""Cooperative cancellation shared by the worker, pipeline stages and OCR."""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+from core.errors import PipelineCancelledError
+
+DEFAULT_POLL_INTERVAL_SEC = 1.0
+
+
+class CancellationToken:
+    """Set by cancel() or discovered through `check` (e.g. a DB lookup).
+
+    `check` runs at most once per poll_interval_sec no matter how often stages and page
+    loops ask, so it is cheap to consult between pages.
+    """
+
+    def __init__(
+        self,
+        check: Callable[[], bool] | None = None,
+        poll_interval_sec: float = DEFAULT_POLL_INTERVAL_SEC,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._event = threading.Event()
+        self._check = check
+        self._poll_interval_sec = poll_interval_sec
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._next_poll = 0.0
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        if self._event.is_set():
+            return True
+        if self._check is None:
+            return False
+        with self._lock:
+            now = self._clock()
+            if now < self._next_poll:
+                return False
+            self._next_poll = now + self._poll_interval_sec
+            if self._check():
+                self._event.set()
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise PipelineCancelledError("Pipeline cancelled")
+
+    def wait(self, timeout: float) -> bool:
+        """Sleep up to timeout seconds, returning early (True) once cancelled."""
+        deadline = self._clock() + timeout
+        while not self.cancelled:
+            remaining = deadline - self._clock()
+            if remaining <= 0:
+                return False
+            self._event.wait(min(remaining, self._poll_interval_sec))
+        return True
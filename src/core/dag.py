@@ -0,0 +1,144 @@
+"""Minimal dependency-graph executor for pipeline stages."""
+
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable
+
+
+class StageGraphError(ValueError):
+    """Raised when stage declarations do not form a valid DAG."""
+
+
+@dataclass(frozen=True)
+class StageNode:
+    """A unit of pipeline work.
+
+    Dependencies are the explicit `requires` names plus whichever nodes produce the
+    artifacts listed in `inputs`. Artifacts are book_dir-relative paths such as
+    "stage/raw.pdf". Failures of `optional` nodes are recorded but do not abort the run.
+    """
+
+    name: str
+    run: Callable[[Any], object]
+    requires: tuple[str, ...] = ()
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    optional: bool = False
+
+
+class StageGraph:
+    """Ordered collection of StageNodes with resolved dependencies."""
+
+    def __init__(self, nodes: Iterable[StageNode] = ()) -> None:
+        self._nodes: dict[str, StageNode] = {}
+        for node in nodes:
+            self.add(node)
+
+    def add(self, node: StageNode) -> None:
+        if node.name in self._nodes:
+            raise StageGraphError(f"Stage '{node.name}' is already registered.")
+        self._nodes[node.name] = node
+
+    def replace(self, node: StageNode) -> None:
+        self._nodes[node.name] = node
+
+    def remove(self, name: str) -> None:
+        self._nodes.pop(name, None)
+
+    def copy(self) -> StageGraph:
+        return StageGraph(self._nodes.values())
+
+    @property
+    def names(self) -> list[str]:
+        return [node.name for node in self.topological_order()]
+
+    def node(self, name: str) -> StageNode:
+        return self._nodes[name]
+
+    def dependencies(self) -> dict[str, set[str]]:
+        producers: dict[str, str] = {}
+        for node in self._nodes.values():
+            for artifact in node.outputs:
+                if artifact in producers:
+                    raise StageGraphError(
+                        f"Artifact '{artifact}' is produced by both "
+                        f"'{producers[artifact]}' and '{node.name}'."
+                    )
+                producers[artifact] = node.name
+
+        deps: dict[str, set[str]] = {}
+        for node in self._nodes.values():
+            node_deps = set(node.requires)
+            for artifact in node.inputs:
+                producer = producers.get(artifact)
+                if producer is not None and producer != node.name:
+                    node_deps.add(producer)
+            unknown = node_deps.difference(self._nodes)
+            if unknown:
+                raise StageGraphError(
+                    f"Stage '{node.name}' requires unknown stages: {sorted(unknown)}"
+                )
+            deps[node.name] = node_deps
+        return deps
+
+    def topological_order(self) -> list[StageNode]:
+        """Kahn's algorithm; ties keep registration order so output is deterministic."""
+        deps = {name: set(values) for name, values in self.dependencies().items()}
+        ordered: list[StageNode] = []
+        while deps:
+            ready = [name for name in self._nodes if name in deps and not deps[name]]
+            if not ready:
+                raise StageGraphError(f"Stage dependency cycle among: {sorted(deps)}")
+            for name in ready:
+                ordered.append(self._nodes[name])
+                del deps[name]
+                for remaining in deps.values():
+                    remaining.discard(name)
+        return ordered
+
+
+def execute_graph(
+    graph: StageGraph,
+    run_node: Callable[[StageNode], None],
+    *,
+    is_done: Callable[[str], bool],
+    max_workers: int = 4,
+) -> list[str]:
+    """Run every node not already done once its dependencies finish; return names run.
+
+    Nodes run on a thread pool. On the first failure no new nodes are started, running
+    ones are allowed to finish, and the error is re-raised.
+    """
+    deps = graph.dependencies()
+    order = [node.name for node in graph.topological_order()]
+    completed = {name for name in order if is_done(name)}
+    pending = [name for name in order if name not in completed]
+    executed: list[str] = []
+    running: dict[Future[None], str] = {}
+    failure: BaseException | None = None
+
+    with ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="stage") as pool:
+        while pending or running:
+            if failure is None:
+                for name in [name for name in pending if deps[name] <= completed]:
+                    pending.remove(name)
+                    running[pool.submit(run_node, graph.node(name))] = name
+
+            if not running:
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                name = running.pop(future)
+                error = future.exception()
+                if error is not None:
+                    failure = failure or error
+                    continue
+                completed.add(name)
+                executed.append(name)
+
+    if failure is not None:
+        raise failure
+    return executed
@@ -38,3 +38,6 @@ class CorruptedImageError(ValidationError):
 class CoverSelectionError(ValueError):
     """Raised when cover selection is invalid."""
 
+
+class PipelineCancelledError(Exception):
+    """Raised when a running pipeline observes a cancellation request."""
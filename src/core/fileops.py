@@ -0,0 +1,163 @@
+"""Low-level file placement helpers shared by ingest and publish stages."""
+
+from __future__ import annotations
+
+import errno
+import hashlib
+import os
+from pathlib import Path
+import shutil
+from uuid import uuid4
+
+# Linux FICLONE ioctl request number (_IOW(0x94, 9, int)).
+_FICLONE = 0x40049409
+
+_CHUNK_SIZE = 1024 * 1024
+
+# errno values meaning "this placement method is not possible here", which should
+# trigger a fallback to a plain copy rather than fail the run.
+_FALLBACK_ERRNOS = {
+    errno.EXDEV,
+    errno.EPERM,
+    errno.EACCES,
+    errno.EMLINK,
+    errno.ENOTSUP,
+    errno.EOPNOTSUPP,
+    errno.EINVAL,
+    errno.ENOTTY,
+    errno.EBADF,
+}
+
+
+def _is_fallback_error(error: OSError) -> bool:
+    return error.errno in _FALLBACK_ERRNOS
+
+
+def copy_file(source: Path, target: Path) -> None:
+    shutil.copy2(source, target)
+
+
+def reflink_file(source: Path, target: Path) -> bool:
+    """Clone source into target with a copy-on-write reflink; return False if unsupported."""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+
+    try:
+        with source.open("rb") as src, target.open("wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except OSError as error:
+        target.unlink(missing_ok=True)
+        if _is_fallback_error(error):
+            return False
+        raise
+    shutil.copystat(source, target)
+    return True
+
+
+def hardlink_file(source: Path, target: Path) -> bool:
+    """Hardlink source to target; return False when the filesystem cannot link them."""
+    try:
+        os.link(source, target)
+    except OSError as error:
+        if _is_fallback_error(error):
+            return False
+        raise
+    return True
+
+
+def move_file(source: Path, target: Path) -> bool:
+    """Rename source to target; return False when they live on different filesystems."""
+    try:
+        os.replace(source, target)
+    except OSError as error:
+        if error.errno == errno.EXDEV:
+            return False
+        raise
+    return True
+
+
+def remove_existing(path: Path) -> None:
+    if path.exists() or path.is_symlink():
+        path.unlink()
+
+
+def fsync_directory(path: Path) -> None:
+    """Persist directory entries (renames/links) where the platform supports it."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def _temp_sibling(target: Path) -> Path:
+    return target.with_name(f".{target.name}.{uuid4().hex[:8]}.tmp")
+
+
+def atomic_write_bytes(target: Path, data: bytes) -> None:
+    """Write data to target via temp file + fsync + rename so readers never see partial files."""
+    temp_path = _temp_sibling(target)
+    try:
+        with temp_path.open("wb") as handle:
+            handle.write(data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temp_path, target)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    fsync_directory(target.parent)
+
+
+def atomic_write_text(target: Path, text: str, encoding: str = "utf-8") -> None:
+    atomic_write_bytes(target, text.encode(encoding))
+
+
+def _sha256_of(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _copy_with_sha256(source: Path, target: Path) -> str:
+    digest = hashlib.sha256()
+    with source.open("rb") as src, target.open("wb") as dst:
+        for chunk in iter(lambda: src.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            dst.write(chunk)
+        dst.flush()
+        os.fsync(dst.fileno())
+    shutil.copystat(source, target)
+    return digest.hexdigest()
+
+
+def publish_file(source: Path, target: Path) -> str:
+    """Atomically publish source at target and return its SHA-256.
+
+    Same-filesystem publishes hardlink the artifact (no data copy); otherwise the file is
+    streamed once into a temp file while hashing. Either way target only ever appears
+    complete, via rename.
+    """
+    temp_path = _temp_sibling(target)
+    try:
+        if hardlink_file(source, temp_path):
+            with temp_path.open("rb") as handle:
+                os.fsync(handle.fileno())
+            checksum = _sha256_of(temp_path)
+        else:
+            checksum = _copy_with_sha256(source, temp_path)
+        os.replace(temp_path, target)
+    except BaseException:
+        temp_path.unlink(missing_ok=True)
+        raise
+    fsync_directory(target.parent)
+    return checksum
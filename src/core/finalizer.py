@@ -6,7 +6,10 @@ from dataclasses import dataclass
 from datetime import datetime, timezone
 import json
 from pathlib import Path
-import shutil
+from typing import Any
+
+from core.fileops import atomic_write_text, publish_file
+from core.metrics import summarize_metrics
 
 
 @dataclass(frozen=True)
@@ -30,6 +33,16 @@ def _file_size_mb(path: Path) -> float:
     return round(path.stat().st_size / (1024 * 1024), 3)
 
 
+def publish_text(book_dir: Path, stage_dir: Path | None = None) -> str:
+    """Publish stage/text.txt as out/book.txt and return its SHA-256."""
+    source_txt = (stage_dir or book_dir / "stage") / "text.txt"
+    if not source_txt.exists():
+        source_txt.write_text("", encoding="utf-8")
+    out_dir = book_dir / "out"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    return publish_file(source_txt, out_dir / "book.txt")
+
+
 def finalize(
     book_dir: Path,
     title: str,
@@ -39,23 +52,30 @@ def finalize(
     settings: dict[str, object],
     covers: dict[str, int | None],
     ocr_failed_pages: list[int] | None = None,
+    stage_metrics: dict[str, dict[str, Any]] | None = None,
+    text_sha256: str | None = None,
+    stage_dir: Path | None = None,
 ) -> FinalizeResult:
-    """Copy output files and generate report.json."""
-    stage_dir = book_dir / "stage"
+    """Atomically publish output files and generate report.json.
+
+    Pass text_sha256 when out/book.txt was already published by publish_text, and
+    stage_dir when stage artifacts live outside book_dir (scratch staging).
+    """
+    stage_dir = stage_dir or book_dir / "stage"
     out_dir = book_dir / "out"
     out_dir.mkdir(parents=True, exist_ok=True)
 
     source_pdf = _select_best_pdf(stage_dir)
-    source_txt = stage_dir / "text.txt"
-    if not source_txt.exists():
-        source_txt.write_text("", encoding="utf-8")
-
     output_pdf = out_dir / "book.pdf"
     output_txt = out_dir / "book.txt"
     report_path = out_dir / "report.json"
 
-    shutil.copy2(source_pdf, output_pdf)
-    shutil.copy2(source_txt, output_txt)
+    if text_sha256 is None or not output_txt.exists():
+        text_sha256 = publish_text(book_dir, stage_dir)
+    output_checksums = {
+        output_pdf.name: publish_file(source_pdf, output_pdf),
+        output_txt.name: text_sha256,
+    }
 
     failed_pages = sorted(ocr_failed_pages or [])
     success_pages = max(0, total_pages - len(failed_pages))
@@ -73,11 +93,30 @@ def finalize(
         "output_pdf_size_mb": output_pdf_size_mb,
         "output_txt_size_mb": output_txt_size_mb,
         "compression_ratio": compression_ratio,
+        "output_sha256": output_checksums,
         "settings": settings,
         "covers": covers,
+        "stage_metrics": stage_metrics or {},
+        "metrics_total": summarize_metrics(stage_metrics or {}, processing_time_sec),
         "created_at": datetime.now(timezone.utc).isoformat(),
     }
-    report_path.write_text(json.dumps(report_payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    atomic_write_text(report_path, json.dumps(report_payload, ensure_ascii=False, indent=2))
 
     return FinalizeResult(output_pdf=output_pdf, output_txt=output_txt, report_json=report_path)
 
+
+def write_report_metrics(
+    report_path: Path,
+    *,
+    stage_metrics: dict[str, dict[str, Any]],
+    processing_time_sec: float,
+    processing_cpu_sec: float | None = None,
+) -> None:
+    """Refresh timing/resource fields of an existing report.json."""
+    payload = json.loads(report_path.read_text(encoding="utf-8"))
+    payload["processing_time_sec"] = round(processing_time_sec, 2)
+    payload["stage_metrics"] = stage_metrics
+    payload["metrics_total"] = summarize_metrics(
+        stage_metrics, processing_time_sec, processing_cpu_sec
+    )
+    atomic_write_text(report_path, json.dumps(payload, ensure_ascii=False, indent=2))
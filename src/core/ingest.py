@@ -0,0 +1,96 @@
+"""Input ingestion strategies for placing source images under book_dir/input."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import os
+from pathlib import Path
+
+from core.fileops import copy_file, hardlink_file, move_file, reflink_file, remove_existing
+
+INGEST_MODES = ("copy", "hardlink", "reflink", "move")
+
+_DEFAULT_COPY_WORKERS = min(8, os.cpu_count() or 1)
+
+
+@dataclass(frozen=True)
+class IngestResult:
+    """Counts of how each input file was placed."""
+
+    mode: str
+    zero_copy: int
+    copied: int
+    skipped: int
+
+
+def _is_current(source: Path, target: Path) -> bool:
+    # Same rule as rsync's default quick check: size plus whole-second mtime.
+    try:
+        target_stat = target.stat()
+    except FileNotFoundError:
+        return False
+    source_stat = source.stat()
+    return (
+        target_stat.st_size == source_stat.st_size
+        and int(target_stat.st_mtime) == int(source_stat.st_mtime)
+    )
+
+
+def _place_zero_copy(mode: str, source: Path, target: Path) -> bool:
+    if mode == "hardlink":
+        return hardlink_file(source, target)
+    if mode == "reflink":
+        return reflink_file(source, target)
+    if mode == "move":
+        return move_file(source, target)
+    return False
+
+
+def _copy_one(mode: str, source: Path, target: Path) -> None:
+    copy_file(source, target)
+    if mode == "move":
+        source.unlink()
+
+
+def ingest_files(
+    files: list[Path],
+    target_dir: Path,
+    mode: str = "copy",
+    max_workers: int | None = None,
+) -> IngestResult:
+    """Place files into target_dir, preferring zero-copy placement and falling back to copies."""
+    if mode not in INGEST_MODES:
+        allowed = ", ".join(INGEST_MODES)
+        raise ValueError(f"Unknown ingest mode '{mode}'. Allowed: {allowed}.")
+
+    target_dir.mkdir(parents=True, exist_ok=True)
+    pending_copies: list[tuple[Path, Path]] = []
+    zero_copy = 0
+    skipped = 0
+    # Once a zero-copy attempt fails (e.g. cross-device), the rest of the batch will too.
+    zero_copy_available = mode != "copy"
+
+    for source in files:
+        target = target_dir / source.name
+        if _is_current(source, target):
+            skipped += 1
+            continue
+
+        # Never write through a stale target: it may be a hardlink into someone else's file.
+        remove_existing(target)
+        if zero_copy_available:
+            if _place_zero_copy(mode, source, target):
+                zero_copy += 1
+                continue
+            zero_copy_available = False
+
+        pending_copies.append((source, target))
+
+    if pending_copies:
+        workers = max(1, min(max_workers or _DEFAULT_COPY_WORKERS, len(pending_copies)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            # Consume results so copy errors propagate to the caller.
+            list(executor.map(lambda pair: _copy_one(mode, *pair), pending_copies))
+
+    return IngestResult(mode=mode, zero_copy=zero_copy, copied=len(pending_copies), skipped=skipped)
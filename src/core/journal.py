@@ -0,0 +1,117 @@
+"""Append-only JSONL event journal kept alongside the manifest snapshot."""
+
+from __future__ import annotations
+
+import json
+import time
+from pathlib import Path
+from typing import Any, Iterator, TextIO
+
+from core.fileops import atomic_write_text
+
+EVENTS_FILE_NAME = "events.jsonl"
+DEFAULT_COMPACT_THRESHOLD_BYTES = 4 * 1024 * 1024
+
+
+def _parse_lines(handle: TextIO) -> Iterator[dict[str, Any]]:
+    for line in handle:
+        if not line.endswith("\n"):
+            # A crash mid-append leaves a partial last line; it was never acknowledged.
+            return
+        try:
+            yield json.loads(line)
+        except json.JSONDecodeError:
+            continue
+
+
+def read_events(path: Path, *, after_seq: int = 0, offset: int = 0) -> list[dict[str, Any]]:
+    """Return events with seq > after_seq, seeking to offset when it is a valid line start."""
+    if not path.exists():
+        return []
+
+    with path.open("r", encoding="utf-8") as handle:
+        if 0 < offset <= path.stat().st_size:
+            handle.seek(offset)
+            first = handle.readline()
+            try:
+                head = [json.loads(first)] if first else []
+            except json.JSONDecodeError:
+                head = None
+            # A stale offset (journal compacted after the snapshot) falls back to a full scan.
+            if head is not None and all(isinstance(event, dict) for event in head):
+                events = head + list(_parse_lines(handle))
+                return [event for event in events if event.get("seq", 0) > after_seq]
+            handle.seek(0)
+        return [event for event in _parse_lines(handle) if event.get("seq", 0) > after_seq]
+
+
+class EventJournal:
+    """O(1) appends of timestamped stage/page events to stage/events.jsonl."""
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        last_seq: int | None = None,
+        compact_threshold_bytes: int = DEFAULT_COMPACT_THRESHOLD_BYTES,
+    ) -> None:
+        self.path = path
+        self._compact_threshold_bytes = compact_threshold_bytes
+        if last_seq is None:
+            # Callers that replayed from a snapshot pass last_seq to avoid this full scan.
+            last_seq = max((event.get("seq", 0) for event in read_events(path)), default=0)
+        self.last_seq = last_seq
+        self._handle: TextIO | None = None
+
+    def _writer(self) -> TextIO:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.path.open("a", encoding="utf-8")
+        return self._handle
+
+    @property
+    def size(self) -> int:
+        if self._handle is not None:
+            self._handle.flush()
+        return self.path.stat().st_size if self.path.exists() else 0
+
+    def append(self, event_type: str, **fields: Any) -> dict[str, Any]:
+        self.last_seq += 1
+        event = {"seq": self.last_seq, "ts": round(time.time(), 6), "type": event_type, **fields}
+        handle = self._writer()
+        handle.write(json.dumps(event, ensure_ascii=False) + "\n")
+        handle.flush()
+        return event
+
+    def needs_compaction(self) -> bool:
+        return self.size > self._compact_threshold_bytes
+
+    def compact(self, upto_seq: int) -> None:
+        """Thin events already folded into a snapshot.
+
+        Stage transitions are kept as the post-mortem timeline; for page progress only the
+        latest event per stage survives.
+        """
+        self.close()
+        events = read_events(self.path)
+        last_progress: dict[str, int] = {}
+        for event in events:
+            if event.get("type") == "progress" and event["seq"] <= upto_seq:
+                last_progress[event.get("stage", "")] = event["seq"]
+
+        kept = [
+            event
+            for event in events
+            if event["seq"] > upto_seq
+            or event.get("type") != "progress"
+            or last_progress.get(event.get("stage", "")) == event["seq"]
+        ]
+        atomic_write_text(
+            self.path,
+            "".join(json.dumps(event, ensure_ascii=False) + "\n" for event in kept),
+        )
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
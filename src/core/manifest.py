@@ -5,13 +5,276 @@ from __future__ import annotations
 from dataclasses import asdict
 import json
 from pathlib import Path
-from typing import Any
+import threading
+import time
+from typing import Any, Callable, Iterable
 
+from core.fileops import atomic_write_text
+from core.journal import EVENTS_FILE_NAME, EventJournal, read_events
+from core.metrics import StageMetrics
 from core.pipeline_types import PipelineSettings, STAGE_NAMES
 
+DEFAULT_FLUSH_INTERVAL_SEC = 1.0
 
-def _default_stages() -> dict[str, str]:
-    return {stage: "pending" for stage in STAGE_NAMES}
+
+def _default_stages(stage_names: Iterable[str] = STAGE_NAMES) -> dict[str, str]:
+    return {stage: "pending" for stage in stage_names}
+
+
+def _settings_from_payload(payload: dict[str, Any]) -> PipelineSettings:
+    settings_payload = payload.get("settings", {})
+    return PipelineSettings(
+        language=settings_payload.get("language", "kor+eng"),
+        optimize_mode=settings_payload.get("optimize_mode", "basic"),
+        error_policy=settings_payload.get("error_policy", "skip"),
+        front_cover=settings_payload.get("front_cover"),
+        back_cover=settings_payload.get("back_cover"),
+        ingest_mode=settings_payload.get("ingest_mode", "copy"),
+        profile=settings_payload.get("profile", False),
+        execution_mode=settings_payload.get("execution_mode", "batch"),
+        ocr_jobs=settings_payload.get("ocr_jobs"),
+    )
+
+
+def _journal_path(manifest_path: Path) -> Path:
+    return manifest_path.parent / "stage" / EVENTS_FILE_NAME
+
+
+def active_stage_dir(manifest_path: Path, payload: dict[str, Any]) -> Path:
+    """Where the run's stage/ files are: scratch while a --scratch run has them there.
+
+    Readers in other processes use it for the live journal and partial outputs, which
+    only reach the workspace's stage/ at checkpoints.
+    """
+    stage_dir = payload.get("stage_dir")
+    if stage_dir and Path(stage_dir).is_dir():
+        return Path(stage_dir)
+    return manifest_path.parent / "stage"
+
+
+def _apply_event(payload: dict[str, Any], event: dict[str, Any]) -> None:
+    event_type = event.get("type")
+    if event_type == "stage":
+        # Auxiliary stages (e.g. thumbnail) run alongside the main chain; current_stage
+        # keeps tracking the chain so status and resume reporting stay meaningful.
+        if event["stage"] in STAGE_NAMES:
+            payload["current_stage"] = event["stage"]
+            if event["status"] == "running" and "ts" in event:
+                payload["stage_started_at"] = event["ts"]
+        payload["stages"][event["stage"]] = event["status"]
+    elif event_type == "progress":
+        payload["progress"] = {
+            "stage": event["stage"],
+            "done": event["done"],
+            "total": event["total"],
+        }
+    elif event_type == "metrics":
+        payload.setdefault("metrics", {})[event["name"]] = event["metrics"]
+
+
+def _replay_journal(journal_path: Path, payload: dict[str, Any]) -> int:
+    """Apply journal events newer than the snapshot to payload; return the last seq seen."""
+    last_seq = int(payload.get("journal_seq", 0))
+    events = read_events(
+        journal_path,
+        after_seq=last_seq,
+        offset=int(payload.get("journal_offset", 0)),
+    )
+    for event in events:
+        _apply_event(payload, event)
+        last_seq = max(last_seq, int(event["seq"]))
+    return last_seq
+
+
+def _resume_stage_from_payload(payload: dict[str, Any]) -> str:
+    stages: dict[str, str] = payload.get("stages", {})
+
+    for stage in STAGE_NAMES:
+        if stage not in stages:
+            # Streaming runs fold assemble into ocr and never record it.
+            continue
+        status = stages[stage]
+        if status != "done":
+            return stage
+    return STAGE_NAMES[-1]
+
+
+class Manifest:
+    """In-memory manifest for one run, flushed to manifest.json with atomic writes.
+
+    Every change is first appended to the event journal (stage/events.jsonl), which is
+    cheap and durable enough to replay after a crash. The manifest.json snapshot records
+    how far into the journal it is (journal_seq/journal_offset), so loading only replays
+    the tail. Stage transitions flush the snapshot immediately; high-frequency progress
+    updates are coalesced to at most one write per flush_interval_sec.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        payload: dict[str, Any],
+        *,
+        flush_interval_sec: float = DEFAULT_FLUSH_INTERVAL_SEC,
+        clock: Callable[[], float] = time.monotonic,
+        journal: EventJournal | None = None,
+        listener: Callable[[dict[str, Any]], None] | None = None,
+    ) -> None:
+        self.path = path
+        self._payload = payload
+        self._flush_interval_sec = flush_interval_sec
+        self._clock = clock
+        self._journal = journal
+        self._listener = listener
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._last_flush: float | None = None
+        self.flush_count = 0
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        book_dir: Path,
+        book_id: str,
+        title: str,
+        settings: PipelineSettings,
+        stage_names: Iterable[str] = STAGE_NAMES,
+        journal: bool = True,
+        journal_path: Path | None = None,
+        **options: Any,
+    ) -> Manifest:
+        path = book_dir / "manifest.json"
+        payload: dict[str, Any] = {
+            "book_id": book_id,
+            "title": title,
+            "current_stage": "validate",
+            "stages": _default_stages(stage_names),
+            "settings": asdict(settings),
+        }
+        event_journal = None
+        if journal:
+            # A fresh manifest starts a fresh timeline.
+            resolved_journal_path = journal_path or _journal_path(path)
+            resolved_journal_path.unlink(missing_ok=True)
+            event_journal = EventJournal(resolved_journal_path, last_seq=0)
+        manifest = cls(path, payload, journal=event_journal, **options)
+        manifest._dirty = True
+        manifest.flush(force=True)
+        return manifest
+
+    @classmethod
+    def load(
+        cls,
+        path: Path,
+        journal: bool = True,
+        journal_path: Path | None = None,
+        **options: Any,
+    ) -> Manifest:
+        """Load a snapshot and replay the journal (default stage/events.jsonl) on top."""
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        event_journal = None
+        if journal:
+            resolved_journal_path = journal_path or _journal_path(path)
+            last_seq = _replay_journal(resolved_journal_path, payload)
+            event_journal = EventJournal(resolved_journal_path, last_seq=last_seq)
+        return cls(path, payload, journal=event_journal, **options)
+
+    @property
+    def current_stage(self) -> str:
+        with self._lock:
+            return str(self._payload["current_stage"])
+
+    @property
+    def settings(self) -> PipelineSettings:
+        with self._lock:
+            return _settings_from_payload(self._payload)
+
+    @property
+    def metrics(self) -> dict[str, dict[str, Any]]:
+        with self._lock:
+            return dict(self._payload.get("metrics", {}))
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return a deep copy of the current payload."""
+        with self._lock:
+            return json.loads(json.dumps(self._payload))
+
+    def stage_status(self, stage: str) -> str:
+        with self._lock:
+            return str(self._payload["stages"].get(stage, "pending"))
+
+    def resume_stage(self) -> str:
+        with self._lock:
+            return _resume_stage_from_payload(self._payload)
+
+    def set_stage_status(
+        self,
+        stage: str,
+        status: str,
+        metrics: StageMetrics | None = None,
+    ) -> None:
+        with self._lock:
+            if metrics is not None:
+                self._record("metrics", name=stage, metrics=metrics.to_dict())
+            self._record("stage", stage=stage, status=status)
+            self.flush(force=True)
+
+    def record_metrics(self, name: str, metrics: StageMetrics | None) -> None:
+        """Store metrics for work that is not a tracked stage (e.g. input ingestion)."""
+        if metrics is None:
+            return
+        with self._lock:
+            self._record("metrics", name=name, metrics=metrics.to_dict())
+            self.flush()
+
+    def update_progress(self, stage: str, done: int, total: int) -> None:
+        """Record pages done within a stage; journaled per call, snapshot writes coalesced."""
+        with self._lock:
+            self._record("progress", stage=stage, done=done, total=total)
+            self.flush()
+
+    def _record(self, event_type: str, **fields: Any) -> None:
+        event = {"type": event_type, **fields}
+        if self._journal is not None:
+            event = self._journal.append(event_type, **fields)
+        _apply_event(self._payload, event)
+        self._dirty = True
+        if self._listener is not None:
+            self._listener(event)
+
+    def flush(self, force: bool = False) -> bool:
+        """Write the manifest if dirty; unless forced, respect the coalescing interval."""
+        with self._lock:
+            if not self._dirty:
+                return False
+            now = self._clock()
+            if (
+                not force
+                and self._last_flush is not None
+                and now - self._last_flush < self._flush_interval_sec
+            ):
+                return False
+            self._write_snapshot()
+            if force and self._journal is not None and self._journal.needs_compaction():
+                self._journal.compact(upto_seq=self._journal.last_seq)
+                self._write_snapshot()
+            self._dirty = False
+            self._last_flush = now
+            return True
+
+    def _write_snapshot(self) -> None:
+        if self._journal is not None:
+            self._payload["stage_dir"] = str(self._journal.path.parent)
+            self._payload["journal_seq"] = self._journal.last_seq
+            self._payload["journal_offset"] = self._journal.size
+        atomic_write_text(self.path, json.dumps(self._payload, ensure_ascii=False, indent=2))
+        self.flush_count += 1
+
+    def close(self) -> None:
+        with self._lock:
+            self.flush(force=True)
+            if self._journal is not None:
+                self._journal.close()
 
 
 def create_manifest(
@@ -21,57 +284,44 @@ def create_manifest(
     title: str,
     settings: PipelineSettings,
 ) -> Path:
-    manifest_path = book_dir / "manifest.json"
-    payload: dict[str, Any] = {
-        "book_id": book_id,
-        "title": title,
-        "current_stage": "validate",
-        "stages": _default_stages(),
-        "settings": asdict(settings),
-    }
-    manifest_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
-    return manifest_path
+    manifest = Manifest.create(book_dir=book_dir, book_id=book_id, title=title, settings=settings)
+    return manifest.path
 
 
 def read_manifest(manifest_path: Path) -> dict[str, Any]:
     return json.loads(manifest_path.read_text(encoding="utf-8"))
 
 
+def read_manifest_state(manifest_path: Path) -> dict[str, Any]:
+    """Read the snapshot and apply journal events recorded after it."""
+    payload = read_manifest(manifest_path)
+    _replay_journal(active_stage_dir(manifest_path, payload) / EVENTS_FILE_NAME, payload)
+    return payload
+
+
 def write_manifest(manifest_path: Path, payload: dict[str, Any]) -> None:
-    manifest_path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    atomic_write_text(manifest_path, json.dumps(payload, ensure_ascii=False, indent=2))
 
 
-def update_stage_status(manifest_path: Path, stage: str, status: str) -> None:
-    payload = read_manifest(manifest_path)
-    payload["current_stage"] = stage
-    payload["stages"][stage] = status
-    write_manifest(manifest_path, payload)
+def update_stage_status(
+    manifest_path: Path,
+    stage: str,
+    status: str,
+    metrics: StageMetrics | None = None,
+) -> None:
+    manifest = Manifest.load(manifest_path)
+    manifest.set_stage_status(stage, status, metrics=metrics)
+    manifest.close()
 
 
 def read_current_stage(manifest_path: Path) -> str:
-    payload = read_manifest(manifest_path)
-    return str(payload["current_stage"])
+    return str(read_manifest_state(manifest_path)["current_stage"])
 
 
 def read_settings(manifest_path: Path) -> PipelineSettings:
-    payload = read_manifest(manifest_path)
-    settings_payload = payload.get("settings", {})
-    return PipelineSettings(
-        language=settings_payload.get("language", "kor+eng"),
-        optimize_mode=settings_payload.get("optimize_mode", "basic"),
-        error_policy=settings_payload.get("error_policy", "skip"),
-        front_cover=settings_payload.get("front_cover"),
-        back_cover=settings_payload.get("back_cover"),
-    )
+    return _settings_from_payload(read_manifest(manifest_path))
 
 
 def resolve_resume_stage(manifest_path: Path) -> str:
-    payload = read_manifest(manifest_path)
-    stages: dict[str, str] = payload.get("stages", {})
-
-    for stage in STAGE_NAMES:
-        status = stages.get(stage, "pending")
-        if status != "done":
-            return stage
-    return STAGE_NAMES[-1]
-
+    """Derive the resume stage from the snapshot plus any journal events written after it."""
+    return _resume_stage_from_payload(read_manifest_state(manifest_path))
@@ -0,0 +1,188 @@
+"""Per-stage wall/CPU/memory/IO measurement for pipeline runs."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import os
+from pathlib import Path
+import sys
+import threading
+import time
+from typing import Any
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None  # type: ignore[assignment]
+
+_PROC_SELF = Path("/proc/self")
+
+# Meters currently open in this process, across threads and pipelines.
+_active_lock = threading.Lock()
+_active_meters: set[StageMeter] = set()
+
+
+@dataclass(frozen=True)
+class StageMetrics:
+    """Resources consumed by one stage.
+
+    cpu_time_sec includes every thread and reaped child process (e.g. OCR workers) of
+    a stage that ran alone. For a stage that overlapped another one (overlapped=True)
+    it is None: child CPU cannot be told apart between stages, and most OCR time is
+    spent in children. thread_cpu_time_sec is the stage thread's own CPU either way.
+    Memory and I/O counters of an overlapped stage are process-wide, so they include
+    the other stages. Fields are None where the platform does not expose the counter.
+    """
+
+    wall_time_sec: float
+    cpu_time_sec: float | None
+    peak_rss_mb: float | None
+    children_peak_rss_mb: float | None
+    read_bytes: int | None
+    write_bytes: int | None
+    overlapped: bool = False
+    thread_cpu_time_sec: float | None = None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def process_cpu_seconds() -> float:
+    """CPU used so far by this process, its threads and its reaped children."""
+    times = os.times()
+    return times.user + times.system + times.children_user + times.children_system
+
+
+def _read_io_counters() -> tuple[int, int] | None:
+    try:
+        text = (_PROC_SELF / "io").read_text(encoding="ascii")
+    except OSError:
+        return None
+    counters = dict(line.split(":", 1) for line in text.splitlines() if ":" in line)
+    try:
+        return int(counters["rchar"]), int(counters["wchar"])
+    except (KeyError, ValueError):
+        return None
+
+
+def _reset_peak_rss() -> bool:
+    # Linux >= 4.0: writing "5" resets VmHWM so the next reading is this stage's peak.
+    try:
+        (_PROC_SELF / "clear_refs").write_text("5", encoding="ascii")
+    except OSError:
+        return False
+    return True
+
+
+def _read_vm_hwm_mb() -> float | None:
+    try:
+        text = (_PROC_SELF / "status").read_text(encoding="ascii")
+    except OSError:
+        return None
+    for line in text.splitlines():
+        if line.startswith("VmHWM:"):
+            return round(int(line.split()[1]) / 1024, 2)
+    return None
+
+
+def _maxrss_mb(who: int) -> float | None:
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(who).ru_maxrss
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(maxrss / divisor, 2)
+
+
+class StageMeter:
+    """Context manager that captures StageMetrics for the enclosed block."""
+
+    def __init__(self) -> None:
+        self.metrics: StageMetrics | None = None
+
+    def __enter__(self) -> StageMeter:
+        with _active_lock:
+            self._overlapped = bool(_active_meters)
+            for meter in _active_meters:
+                meter._overlapped = True
+            _active_meters.add(self)
+        # Resetting the high-water mark would erase a running stage's peak.
+        self._peak_reset = not self._overlapped and _reset_peak_rss()
+        self._children_maxrss = _maxrss_mb(resource.RUSAGE_CHILDREN) if resource else None
+        self._io = _read_io_counters()
+        self._cpu = process_cpu_seconds()
+        self._thread_cpu = time.thread_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        wall = time.perf_counter() - self._wall
+        with _active_lock:
+            _active_meters.discard(self)
+            overlapped = self._overlapped
+        thread_cpu = time.thread_time() - self._thread_cpu
+        cpu = None if overlapped else process_cpu_seconds() - self._cpu
+        io_after = _read_io_counters()
+
+        peak_rss = _read_vm_hwm_mb() if self._peak_reset else None
+        if peak_rss is None and resource is not None:
+            peak_rss = _maxrss_mb(resource.RUSAGE_SELF)
+
+        children_peak = _maxrss_mb(resource.RUSAGE_CHILDREN) if resource else None
+        if children_peak is not None and children_peak == self._children_maxrss:
+            # No child finished during the stage with a new high-water mark.
+            children_peak = None
+
+        read_bytes = write_bytes = None
+        if self._io is not None and io_after is not None:
+            read_bytes = io_after[0] - self._io[0]
+            write_bytes = io_after[1] - self._io[1]
+
+        self.metrics = StageMetrics(
+            wall_time_sec=round(wall, 3),
+            cpu_time_sec=round(cpu, 3) if cpu is not None else None,
+            peak_rss_mb=peak_rss,
+            children_peak_rss_mb=children_peak,
+            read_bytes=read_bytes,
+            write_bytes=write_bytes,
+            overlapped=overlapped,
+            thread_cpu_time_sec=round(thread_cpu, 3),
+        )
+
+
+def summarize_metrics(
+    stage_metrics: dict[str, dict[str, Any]],
+    wall_time_sec: float | None = None,
+    cpu_time_sec: float | None = None,
+) -> dict[str, Any]:
+    """Aggregate per-stage metrics into run totals for report.json.
+
+    Pass the run's wall_time_sec (start to end): stages that overlap make the sum of
+    their wall times larger than the run took. Likewise pass the run's cpu_time_sec
+    (process_cpu_seconds() deltas); without it the total is unknown (None) as soon as
+    one stage overlapped another.
+    """
+
+    def _total(key: str) -> int | float | None:
+        values = [entry[key] for entry in stage_metrics.values() if entry.get(key) is not None]
+        return sum(values) if values else None
+
+    def _peak(key: str) -> float | None:
+        values = [entry[key] for entry in stage_metrics.values() if entry.get(key) is not None]
+        return max(values) if values else None
+
+    wall = wall_time_sec if wall_time_sec is not None else _total("wall_time_sec")
+    if cpu_time_sec is not None:
+        cpu = cpu_time_sec
+    elif any(entry.get("overlapped") for entry in stage_metrics.values()):
+        cpu = None
+    else:
+        cpu = _total("cpu_time_sec")
+    return {
+        "wall_time_sec": round(wall, 3) if wall is not None else None,
+        "cpu_time_sec": round(cpu, 3) if cpu is not None else None,
+        "peak_rss_mb": _peak("peak_rss_mb"),
+        "children_peak_rss_mb": _peak("children_peak_rss_mb"),
+        "read_bytes": _total("read_bytes"),
+        "write_bytes": _total("write_bytes"),
+    }
@@ -3,10 +3,17 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+import multiprocessing
 from pathlib import Path
 import os
 import shutil
-from typing import Protocol
+from typing import Any, Callable, Protocol
+
+from core.cancellation import CancellationToken
+from core.errors import PipelineCancelledError
+from core.processes import call_in_own_group, terminate_group, track_group, untrack_group
+
+_CANCEL_POLL_SEC = 0.2
 
 
 class OCREngine(Protocol):
@@ -32,6 +39,39 @@ def _load_ocr_engine() -> OCREngine | None:
     return ocrmypdf.ocr
 
 
+def _ocrmypdf_entry(input_pdf: str, output_pdf: str, **kwargs: object) -> None:
+    import ocrmypdf
+
+    ocrmypdf.ocr(input_pdf, output_pdf, **kwargs)
+
+
+def run_killable(
+    target: Callable[..., object],
+    *args: Any,
+    cancel_token: CancellationToken,
+    **kwargs: Any,
+) -> None:
+    """Run target in a spawned child process, killing its process group on cancellation."""
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(target=call_in_own_group, args=(target, args, kwargs))
+    process.start()
+    track_group(process)
+    try:
+        while process.is_alive():
+            if cancel_token.wait(_CANCEL_POLL_SEC):
+                terminate_group(process)
+                raise PipelineCancelledError("Pipeline cancelled")
+        process.join()
+    except BaseException:
+        if process.is_alive():
+            terminate_group(process)
+        raise
+    finally:
+        untrack_group(process)
+    if process.exitcode != 0:
+        raise RuntimeError(f"OCR process exited with code {process.exitcode}")
+
+
 def run_ocr(
     raw_pdf: Path,
     ocr_pdf: Path,
@@ -41,8 +81,14 @@ def run_ocr(
     skip_big_mb: int = 50,
     timeout_sec: int = 120,
     engine: OCREngine | None = None,
+    jobs: int | None = None,
+    cancel_token: CancellationToken | None = None,
 ) -> OCRResult:
-    """Generate OCR PDF and sidecar text; fallback to passthrough when engine is unavailable."""
+    """Generate OCR PDF and sidecar text; fallback to passthrough when engine is unavailable.
+
+    With a cancel_token the default engine runs in a child process that is killed on
+    cancellation; injected engines run in-process and are only checked before starting.
+    """
     ocr_pdf.parent.mkdir(parents=True, exist_ok=True)
     sidecar_text.parent.mkdir(parents=True, exist_ok=True)
 
@@ -52,19 +98,32 @@ def run_ocr(
         sidecar_text.write_text("", encoding="utf-8")
         return OCRResult(backend="passthrough", failed_pages=[])
 
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+
+    options: dict[str, Any] = {
+        "language": language,
+        "sidecar": str(sidecar_text),
+        "skip_big": skip_big_mb,
+        "tesseract_timeout": timeout_sec,
+        "jobs": jobs or max(1, os.cpu_count() or 1),
+        "deskew": True,
+        "rotate_pages": True,
+    }
     try:
-        ocr_engine(
-            str(raw_pdf),
-            str(ocr_pdf),
-            language=language,
-            sidecar=str(sidecar_text),
-            skip_big=skip_big_mb,
-            tesseract_timeout=timeout_sec,
-            jobs=max(1, os.cpu_count() or 1),
-            deskew=True,
-            rotate_pages=True,
-        )
+        if engine is None and cancel_token is not None:
+            run_killable(
+                _ocrmypdf_entry,
+                str(raw_pdf),
+                str(ocr_pdf),
+                cancel_token=cancel_token,
+                **options,
+            )
+        else:
+            ocr_engine(str(raw_pdf), str(ocr_pdf), **options)
         return OCRResult(backend="ocrmypdf", failed_pages=[])
+    except PipelineCancelledError:
+        raise
     except Exception:
         if error_policy != "skip":
             raise
@@ -6,20 +6,25 @@ from dataclasses import dataclass
 from pathlib import Path
 import shutil
 import time
+from typing import Any, Callable
 from uuid import uuid4
 
-from core.assembler import assemble
-from core.finalizer import FinalizeResult, finalize
-from core.manifest import (
-    create_manifest,
-    read_manifest,
-    resolve_resume_stage,
-    update_stage_status,
-)
-from core.ocr import OCRResult, run_ocr
-from core.optimizer import optimize_pdf
-from core.pipeline_types import PipelineSettings, STAGE_NAMES
-from core.validator import ValidationResult, validate
+from core.cancellation import CancellationToken
+from core.dag import StageGraph, StageNode, execute_graph
+from core.errors import PipelineCancelledError
+from core.finalizer import FinalizeResult, write_report_metrics
+from core.ingest import ingest_files
+from core.journal import EVENTS_FILE_NAME
+from core.manifest import Manifest
+from core.metrics import StageMeter, process_cpu_seconds
+from core.pipeline_types import PipelineSettings
+from core.profiling import PROFILE_DIR_NAME, profile_stage
+from core.scratch import StageLocation, checkpoint, hydrate, release, resolve_stage_location
+from core.stages import StageContext, default_stage_graph
+from core.streaming import PAGES_DIR_NAME
+from core.validator import validate
+
+DEFAULT_STAGE_WORKERS = 4
 
 
 @dataclass(frozen=True)
@@ -40,29 +45,61 @@ def _prepare_book_directory(book_dir: Path) -> None:
     (book_dir / "out").mkdir(parents=True, exist_ok=True)
 
 
-def _copy_input_files(validation: ValidationResult, input_dir: Path) -> None:
-    for file_path in validation.files:
-        shutil.copy2(file_path, input_dir / file_path.name)
-
-
-def _synchronize_input(input_dir: Path, book_dir: Path, resume: bool) -> None:
+def _synchronize_input(input_dir: Path, book_dir: Path, resume: bool, ingest_mode: str) -> None:
     canonical_input_dir = book_dir / "input"
     existing_input = sorted(canonical_input_dir.glob("*")) if canonical_input_dir.exists() else []
     if resume and existing_input:
         return
 
-    validation = validate(input_dir.resolve())
-    _copy_input_files(validation, canonical_input_dir)
+    # Moving takes the pages out of the source folder, so a corrupt image must be
+    # caught while the folder is still intact; other modes leave the source in place.
+    validation = validate(input_dir.resolve(), verify_images=ingest_mode == "move")
+    ingest_files(validation.files, canonical_input_dir, mode=ingest_mode)
+
+
+def _detach_stage_outputs(context: StageContext, node: StageNode) -> None:
+    # finalize hardlinks stage artifacts into out/, so a re-running stage must unlink its
+    # previous outputs first rather than truncate a published file in place.
+    for artifact in node.outputs:
+        if artifact.startswith("stage/"):
+            context.artifact(artifact).unlink(missing_ok=True)
+
 
+def _checkpoint_stage(location: StageLocation, node: StageNode) -> None:
+    stage_outputs = [
+        artifact.removeprefix("stage/")
+        for artifact in node.outputs
+        if artifact.startswith("stage/")
+    ]
+    checkpoint(location, [*stage_outputs, EVENTS_FILE_NAME])
 
-def _stage_index(stage: str) -> int:
-    return list(STAGE_NAMES).index(stage)
 
+def _run_stage(context: StageContext, node: StageNode, location: StageLocation) -> None:
+    manifest = context.manifest
+    if context.cancel_token is not None and context.cancel_token.cancelled:
+        manifest.set_stage_status(node.name, "cancelled")
+        raise PipelineCancelledError("Pipeline cancelled")
 
-def _should_run_stage(*, stage: str, start_stage: str, stage_status: str) -> bool:
-    if stage_status == "done":
-        return False
-    return _stage_index(stage) >= _stage_index(start_stage)
+    manifest.set_stage_status(node.name, "running")
+    _detach_stage_outputs(context, node)
+    try:
+        with StageMeter() as meter, profile_stage(
+            context.stage_dir, node.name, context.settings.profile
+        ):
+            result = node.run(context)
+    except PipelineCancelledError:
+        # "cancelled" is not "done", so resume re-runs this stage from its inputs.
+        manifest.set_stage_status(node.name, "cancelled")
+        raise
+    except Exception:
+        manifest.set_stage_status(node.name, "failed")
+        if node.optional:
+            return
+        raise
+    context.results[node.name] = result
+    # Outputs reach the durable workspace before "done" does, so resume can trust it.
+    _checkpoint_stage(location, node)
+    manifest.set_stage_status(node.name, "done", metrics=meter.metrics)
 
 
 def run_pipeline(
@@ -71,129 +108,138 @@ def run_pipeline(
     settings: PipelineSettings | None = None,
     book_id: str | None = None,
     resume: bool = False,
+    stages: StageGraph | None = None,
+    stage_workers: int = DEFAULT_STAGE_WORKERS,
+    cancel_token: CancellationToken | None = None,
+    on_event: Callable[[dict[str, Any]], None] | None = None,
+    scratch_root: Path | None = None,
 ) -> PipelineResult:
-    """Run all conversion stages and return output paths."""
-    resolved_input_dir = input_dir.resolve()
+    """Run all conversion stages and return output paths.
+
+    Stages come from the core.stages registry (or `stages`) and run as their
+    dependencies complete; stages already marked done in the manifest are skipped.
+    A triggered cancel_token stops the run with PipelineCancelledError. on_event receives
+    every manifest event (stage transitions, page progress, metrics) as it is recorded.
+    With scratch_root, stage/ is worked on under scratch_root/<book_id>/stage and only
+    checkpointed into the workspace at stage boundaries; scratch is removed afterwards.
+    """
     resolved_book_id = book_id or uuid4().hex[:12]
     book_dir = workspace_dir.resolve() / resolved_book_id
-    manifest_path = book_dir / "manifest.json"
-    title = resolved_input_dir.name
-
     _prepare_book_directory(book_dir)
-    _synchronize_input(resolved_input_dir, book_dir, resume=resume)
+    location = resolve_stage_location(book_dir, resolved_book_id, scratch_root)
+    location.work_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        return _run_stages(
+            input_dir.resolve(),
+            book_dir,
+            location,
+            settings=settings,
+            book_id=resolved_book_id,
+            resume=resume,
+            stages=stages,
+            stage_workers=stage_workers,
+            cancel_token=cancel_token,
+            on_event=on_event,
+        )
+    finally:
+        checkpoint(location, [EVENTS_FILE_NAME, PROFILE_DIR_NAME])
+        release(location)
+
+
+def _run_stages(
+    input_dir: Path,
+    book_dir: Path,
+    location: StageLocation,
+    *,
+    settings: PipelineSettings | None,
+    book_id: str,
+    resume: bool,
+    stages: StageGraph | None,
+    stage_workers: int,
+    cancel_token: CancellationToken | None,
+    on_event: Callable[[dict[str, Any]], None] | None,
+) -> PipelineResult:
+    manifest_path = book_dir / "manifest.json"
+    journal_path = location.work_dir / EVENTS_FILE_NAME
+    run_started = time.perf_counter()
+    run_cpu_started = process_cpu_seconds()
 
+    manifest = None
     if resume and manifest_path.exists():
-        manifest_payload = read_manifest(manifest_path)
-        config = settings or PipelineSettings(
-            language=manifest_payload["settings"].get("language", "kor+eng"),
-            optimize_mode=manifest_payload["settings"].get("optimize_mode", "basic"),
-            error_policy=manifest_payload["settings"].get("error_policy", "skip"),
-            front_cover=manifest_payload["settings"].get("front_cover"),
-            back_cover=manifest_payload["settings"].get("back_cover"),
-        )
-        start_stage = resolve_resume_stage(manifest_path)
+        hydrate(location)
+        manifest = Manifest.load(manifest_path, journal_path=journal_path, listener=on_event)
+    if manifest is not None:
+        config = settings or manifest.settings
     else:
         config = settings or PipelineSettings()
-        create_manifest(book_dir=book_dir, book_id=resolved_book_id, title=title, settings=config)
-        start_stage = "validate"
-
-    validation = validate(book_dir / "input")
-    start_time = time.perf_counter()
-    ocr_result = OCRResult(backend="passthrough", failed_pages=[])
 
-    try:
-        manifest_payload = read_manifest(manifest_path)
+    if cancel_token is not None:
+        cancel_token.raise_if_cancelled()
+    with StageMeter() as ingest_meter:
+        _synchronize_input(
+            input_dir,
+            book_dir,
+            resume=resume,
+            ingest_mode=config.ingest_mode,
+        )
 
-        if _should_run_stage(
-            stage="validate",
-            start_stage=start_stage,
-            stage_status=manifest_payload["stages"]["validate"],
-        ):
-            update_stage_status(manifest_path, "validate", "running")
-            validate(book_dir / "input")
-            update_stage_status(manifest_path, "validate", "done")
-
-        manifest_payload = read_manifest(manifest_path)
-        if _should_run_stage(
-            stage="assemble",
-            start_stage=start_stage,
-            stage_status=manifest_payload["stages"]["assemble"],
-        ):
-            update_stage_status(manifest_path, "assemble", "running")
-            assemble(
-                book_dir / "input",
-                book_dir / "stage",
-                front_cover=config.front_cover,
-                back_cover=config.back_cover,
-            )
-            update_stage_status(manifest_path, "assemble", "done")
-
-        manifest_payload = read_manifest(manifest_path)
-        if _should_run_stage(stage="ocr", start_stage=start_stage, stage_status=manifest_payload["stages"]["ocr"]):
-            update_stage_status(manifest_path, "ocr", "running")
-            ocr_result = run_ocr(
-                raw_pdf=book_dir / "stage" / "raw.pdf",
-                ocr_pdf=book_dir / "stage" / "ocr.pdf",
-                sidecar_text=book_dir / "stage" / "text.txt",
-                language=config.language,
-                error_policy=config.error_policy,
-            )
-            update_stage_status(manifest_path, "ocr", "done")
+    graph = stages or default_stage_graph(config.execution_mode)
+    if manifest is None:
+        # Page checkpoints from an earlier run of this book must not leak into a fresh one.
+        shutil.rmtree(location.work_dir / PAGES_DIR_NAME, ignore_errors=True)
+        manifest = Manifest.create(
+            book_dir=book_dir,
+            book_id=book_id,
+            title=input_dir.name,
+            settings=config,
+            stage_names=graph.names,
+            journal_path=journal_path,
+            listener=on_event,
+        )
+    manifest.record_metrics("ingest", ingest_meter.metrics)
+
+    context = StageContext(
+        book_dir=book_dir,
+        stage_dir=location.work_dir,
+        title=input_dir.name,
+        settings=config,
+        manifest=manifest,
+        validation=validate(book_dir / "input", verify_images=False),
+        run_started=run_started,
+        cancel_token=cancel_token,
+    )
 
-        manifest_payload = read_manifest(manifest_path)
-        if _should_run_stage(
-            stage="optimize",
-            start_stage=start_stage,
-            stage_status=manifest_payload["stages"]["optimize"],
-        ):
-            update_stage_status(manifest_path, "optimize", "running")
-            optimize_pdf(
-                ocr_pdf=book_dir / "stage" / "ocr.pdf",
-                optimized_pdf=book_dir / "stage" / "optimized.pdf",
-                mode=config.optimize_mode,
-            )
-            update_stage_status(manifest_path, "optimize", "done")
+    try:
+        execute_graph(
+            graph,
+            lambda node: _run_stage(context, node, location),
+            is_done=lambda name: manifest.stage_status(name) == "done",
+            max_workers=stage_workers,
+        )
 
-        manifest_payload = read_manifest(manifest_path)
-        if _should_run_stage(
-            stage="finalize",
-            start_stage=start_stage,
-            stage_status=manifest_payload["stages"]["finalize"],
-        ):
-            update_stage_status(manifest_path, "finalize", "running")
-            finalize_result: FinalizeResult = finalize(
-                book_dir=book_dir,
-                title=title,
-                total_pages=validation.total_pages,
-                processing_time_sec=time.perf_counter() - start_time,
-                input_size_mb=validation.total_size_mb,
-                settings={
-                    "ocr_language": config.language,
-                    "optimize_mode": config.optimize_mode,
-                    "error_policy": config.error_policy,
-                },
-                covers={"front": config.front_cover, "back": config.back_cover},
-                ocr_failed_pages=ocr_result.failed_pages,
-            )
-            update_stage_status(manifest_path, "finalize", "done")
-        else:
+        finalize_result = context.results.get("finalize")
+        if not isinstance(finalize_result, FinalizeResult):
             finalize_result = FinalizeResult(
                 output_pdf=book_dir / "out" / "book.pdf",
                 output_txt=book_dir / "out" / "book.txt",
                 report_json=book_dir / "out" / "report.json",
             )
+        elif finalize_result.report_json.exists():
+            # The report was written mid-run; refresh it with every stage's final numbers.
+            write_report_metrics(
+                finalize_result.report_json,
+                stage_metrics=manifest.metrics,
+                processing_time_sec=time.perf_counter() - run_started,
+                processing_cpu_sec=process_cpu_seconds() - run_cpu_started,
+            )
 
         return PipelineResult(
-            book_id=resolved_book_id,
+            book_id=book_id,
             book_dir=book_dir,
             manifest_path=manifest_path,
             output_pdf=finalize_result.output_pdf,
             output_txt=finalize_result.output_txt,
             report_json=finalize_result.report_json,
         )
-    except Exception:
-        stage = resolve_resume_stage(manifest_path) if manifest_path.exists() else "validate"
-        if manifest_path.exists():
-            update_stage_status(manifest_path, stage, "failed")
-        raise
-
+    finally:
+        manifest.close()
@@ -5,6 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 
 STAGE_NAMES = ("validate", "assemble", "ocr", "optimize", "finalize")
+EXECUTION_MODES = ("batch", "streaming")
 
 
 @dataclass(frozen=True)
@@ -16,4 +17,9 @@ class PipelineSettings:
     error_policy: str = "skip"
     front_cover: int | None = None
     back_cover: int | None = None
+    ingest_mode: str = "copy"
+    profile: bool = False
+    execution_mode: str = "batch"
+    # OCR processes (batch) or page threads (streaming) for this book; None = all CPUs.
+    ocr_jobs: int | None = None
 
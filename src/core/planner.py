@@ -0,0 +1,195 @@
+"""Dry-run planner: estimate a conversion's cost from a few sampled pages."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+import os
+from pathlib import Path
+import tempfile
+import time
+
+from core.assembler import write_pdf
+from core.cover_handler import apply_cover_order
+from core.ocr import OCREngine, run_ocr
+from core.optimizer import OptimizeEngine, optimize_pdf
+from core.pipeline_types import PipelineSettings
+from core.validator import PageStats, extract_page_number, validate
+
+DEFAULT_SAMPLE_PAGES = 3
+
+_MB = 1024 * 1024
+# Rough constants for the parts of a run the samples cannot observe directly.
+_BASE_MEMORY_MB = 150.0
+# Tesseract keeps several grey/binarized copies of each page in flight.
+_OCR_BYTES_PER_PIXEL = 6
+# img2pdf builds the whole raw.pdf in memory next to the page bytes it embeds.
+_ASSEMBLE_MEMORY_FACTOR = 2.0
+
+
+@dataclass(frozen=True)
+class PlanEstimate:
+    """Predicted cost of converting one book with the given settings."""
+
+    total_pages: int
+    input_size_mb: float
+    sampled_pages: list[int]
+    ocr_backend: str
+    ocr_sec_per_page: float
+    compression_ratio: float
+    estimated_wall_time_sec: float
+    estimated_peak_memory_mb: float
+    estimated_disk_mb: float
+    estimated_output_mb: float
+
+    def to_dict(self) -> dict[str, object]:
+        return asdict(self)
+
+
+@dataclass(frozen=True)
+class _Sample:
+    assemble_sec: float
+    ocr_sec: float
+    optimize_sec: float
+    image_bytes: int
+    raw_bytes: int
+    ocr_bytes: int
+    optimized_bytes: int
+    text_bytes: int
+    backend: str
+
+
+def _sample_indices(total: int, count: int) -> list[int]:
+    """Evenly spaced indices including the first and last page."""
+    count = max(1, min(count, total))
+    if count == 1:
+        return [0]
+    return sorted({round(step * (total - 1) / (count - 1)) for step in range(count)})
+
+
+def _measure_page(
+    page: PageStats,
+    work_dir: Path,
+    settings: PipelineSettings,
+    ocr_engine: OCREngine | None,
+    optimize_engine: OptimizeEngine | None,
+) -> _Sample:
+    raw_pdf = work_dir / "raw.pdf"
+    ocr_pdf = work_dir / "ocr.pdf"
+    optimized_pdf = work_dir / "optimized.pdf"
+    sidecar = work_dir / "text.txt"
+
+    started = time.perf_counter()
+    write_pdf([page.path], raw_pdf)
+    assembled = time.perf_counter()
+    result = run_ocr(
+        raw_pdf=raw_pdf,
+        ocr_pdf=ocr_pdf,
+        sidecar_text=sidecar,
+        language=settings.language,
+        error_policy="skip",
+        engine=ocr_engine,
+        jobs=1,
+    )
+    recognized = time.perf_counter()
+    optimize_pdf(ocr_pdf, optimized_pdf, mode=settings.optimize_mode, engine=optimize_engine)
+    optimized = time.perf_counter()
+
+    return _Sample(
+        assemble_sec=assembled - started,
+        ocr_sec=recognized - assembled,
+        optimize_sec=optimized - recognized,
+        image_bytes=page.size_bytes,
+        raw_bytes=raw_pdf.stat().st_size,
+        ocr_bytes=ocr_pdf.stat().st_size,
+        optimized_bytes=optimized_pdf.stat().st_size,
+        text_bytes=sidecar.stat().st_size,
+        backend=result.backend,
+    )
+
+
+def plan_conversion(
+    input_dir: Path,
+    settings: PipelineSettings | None = None,
+    sample_pages: int = DEFAULT_SAMPLE_PAGES,
+    ocr_engine: OCREngine | None = None,
+    optimize_engine: OptimizeEngine | None = None,
+    workers: int | None = None,
+) -> PlanEstimate:
+    """Estimate wall time, peak memory, disk and output size without running the pipeline.
+
+    Every page is validated (which also yields per-page sizes and dimensions); a few
+    evenly spaced pages are then assembled, OCRed with the configured engine and
+    optimized in a temp directory, and their costs are extrapolated to the whole book.
+    """
+    config = settings or PipelineSettings()
+    validate_started = time.perf_counter()
+    validation = validate(input_dir)
+    validate_sec = time.perf_counter() - validate_started
+
+    pages = validation.pages
+    ordered_paths = apply_cover_order(
+        [page.path for page in pages],
+        front_cover=config.front_cover,
+        back_cover=config.back_cover,
+    )
+    stats_by_path = {page.path: page for page in pages}
+    ordered_pages = [stats_by_path[path] for path in ordered_paths]
+    indices = _sample_indices(len(ordered_pages), sample_pages)
+
+    samples: list[_Sample] = []
+    with tempfile.TemporaryDirectory(prefix="ebookgen-plan-") as temp_dir:
+        for index in indices:
+            work_dir = Path(temp_dir) / str(index)
+            work_dir.mkdir()
+            samples.append(
+                _measure_page(ordered_pages[index], work_dir, config, ocr_engine, optimize_engine)
+            )
+
+    total_pages = validation.total_pages
+    input_bytes = sum(page.size_bytes for page in pages)
+    sampled_image_bytes = sum(sample.image_bytes for sample in samples) or 1
+    worker_count = max(1, workers or os.cpu_count() or 1)
+
+    def per_page(attribute: str) -> float:
+        return sum(getattr(sample, attribute) for sample in samples) / len(samples)
+
+    def scaled_bytes(attribute: str) -> float:
+        # Scale by input bytes rather than page count so large pages weigh more.
+        ratio = sum(getattr(sample, attribute) for sample in samples) / sampled_image_bytes
+        return ratio * input_bytes
+
+    ocr_sec_per_page = per_page("ocr_sec")
+    wall_time_sec = (
+        validate_sec
+        + per_page("assemble_sec") * total_pages
+        + ocr_sec_per_page * total_pages / worker_count
+        + per_page("optimize_sec") * total_pages / worker_count
+    )
+
+    raw_bytes = scaled_bytes("raw_bytes")
+    ocr_bytes = scaled_bytes("ocr_bytes")
+    optimized_bytes = scaled_bytes("optimized_bytes")
+    text_bytes = per_page("text_bytes") * total_pages
+    output_bytes = optimized_bytes + text_bytes
+    ingest_bytes = 0 if config.ingest_mode in {"hardlink", "reflink", "move"} else input_bytes
+    # input copy + stage/{raw,ocr,optimized}.pdf + stage/text.txt + out/.
+    disk_bytes = ingest_bytes + raw_bytes + ocr_bytes + optimized_bytes + text_bytes + output_bytes
+
+    largest_page_pixels = max(page.pixels for page in pages)
+    ocr_memory_mb = worker_count * largest_page_pixels * _OCR_BYTES_PER_PIXEL / _MB
+    assemble_memory_mb = input_bytes * _ASSEMBLE_MEMORY_FACTOR / _MB
+    peak_memory_mb = _BASE_MEMORY_MB + max(ocr_memory_mb, assemble_memory_mb)
+
+    backends = {sample.backend for sample in samples}
+    return PlanEstimate(
+        total_pages=total_pages,
+        input_size_mb=round(input_bytes / _MB, 3),
+        sampled_pages=[extract_page_number(ordered_paths[index]) for index in indices],
+        ocr_backend="ocrmypdf" if "ocrmypdf" in backends else sorted(backends)[0],
+        ocr_sec_per_page=round(ocr_sec_per_page, 3),
+        compression_ratio=round(optimized_bytes / input_bytes, 3) if input_bytes else 0.0,
+        estimated_wall_time_sec=round(wall_time_sec, 1),
+        estimated_peak_memory_mb=round(peak_memory_mb, 1),
+        estimated_disk_mb=round(disk_bytes / _MB, 3),
+        estimated_output_mb=round(output_bytes / _MB, 3),
+    )
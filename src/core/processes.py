@@ -0,0 +1,79 @@
+"""Helpers for child processes that must be stoppable together with their children."""
+
+from __future__ import annotations
+
+import multiprocessing.process
+import os
+import signal
+import threading
+from typing import Any, Callable
+
+DEFAULT_KILL_GRACE_SEC = 5.0
+
+# Process groups started by this process that are still running, by leader pid.
+_groups_lock = threading.Lock()
+_groups: set[int] = set()
+
+
+def call_in_own_group(
+    target: Callable[..., object], args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> None:
+    """Process entry point: become a process-group leader, then run target."""
+    # A fresh process group lets terminate_group reach tesseract/ghostscript grandchildren.
+    if hasattr(os, "setsid"):
+        os.setsid()
+    target(*args, **kwargs)
+
+
+def terminate_group(
+    process: multiprocessing.process.BaseProcess,
+    grace_sec: float = DEFAULT_KILL_GRACE_SEC,
+) -> None:
+    """SIGTERM the process group, then SIGKILL it if it outlives grace_sec."""
+    if process.pid is None:
+        return
+    for sig in (signal.SIGTERM, signal.SIGKILL):
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, sig)
+            else:
+                process.terminate()
+        except ProcessLookupError:
+            break
+        process.join(grace_sec)
+        if not process.is_alive():
+            break
+    process.join()
+
+
+def track_group(process: multiprocessing.process.BaseProcess) -> None:
+    """Remember a started call_in_own_group child for kill_tracked_groups()."""
+    if process.pid is not None:
+        with _groups_lock:
+            _groups.add(process.pid)
+
+
+def untrack_group(process: multiprocessing.process.BaseProcess) -> None:
+    with _groups_lock:
+        _groups.discard(process.pid)
+
+
+def kill_tracked_groups() -> None:
+    """SIGKILL every tracked process group; for a process about to exit abruptly.
+
+    The groups are not this process's own, so they would otherwise outlive it.
+    """
+    with _groups_lock:
+        groups = list(_groups)
+        _groups.clear()
+    for pgid in groups:
+        try:
+            os.killpg(pgid, signal.SIGKILL)
+        except ProcessLookupError:
+            # The child may not have reached setsid() yet.
+            try:
+                os.kill(pgid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        except PermissionError:
+            pass
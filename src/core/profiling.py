@@ -0,0 +1,127 @@
+"""Opt-in cProfile/tracemalloc capture for pipeline stages."""
+
+from __future__ import annotations
+
+import cProfile
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass
+from pathlib import Path
+import pstats
+import threading
+import tracemalloc
+
+PROFILE_DIR_NAME = "profile"
+DEFAULT_TOP_N = 25
+
+# Stages may be profiled concurrently; tracemalloc is process-wide, so it stays on
+# until the last profiled stage finishes.
+_tracemalloc_lock = threading.Lock()
+_tracemalloc_users = 0
+# Since Python 3.12 only one cProfile profiler can be active per process.
+_cprofile_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class HotSpot:
+    """One function row of a merged profile table."""
+
+    function: str
+    calls: int
+    total_time_sec: float
+    cumulative_time_sec: float
+
+
+class _StageProfiler:
+    def __init__(self, profile_dir: Path, stage: str, top_n: int) -> None:
+        self._profile_dir = profile_dir
+        self._stage = stage
+        self._top_n = top_n
+        self._profiler: cProfile.Profile | None = cProfile.Profile()
+
+    def __enter__(self) -> _StageProfiler:
+        global _tracemalloc_users
+        with _tracemalloc_lock:
+            if _tracemalloc_users == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            _tracemalloc_users += 1
+        with _cprofile_lock:
+            try:
+                self._profiler.enable()
+            except ValueError:
+                # Another stage (or a debugger) holds the profiler: profiling must not
+                # fail the stage, which still gets its allocation report.
+                self._profiler = None
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        global _tracemalloc_users
+        if self._profiler is not None:
+            with _cprofile_lock:
+                self._profiler.disable()
+        with _tracemalloc_lock:
+            snapshot = tracemalloc.take_snapshot()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            _tracemalloc_users -= 1
+            if _tracemalloc_users == 0:
+                tracemalloc.stop()
+
+        self._profile_dir.mkdir(parents=True, exist_ok=True)
+        lines = [
+            f"# {self._stage}: top {self._top_n} allocation sites",
+            f"# traced peak: {peak_bytes} bytes",
+        ]
+        if self._profiler is not None:
+            self._profiler.dump_stats(str(self._profile_dir / f"{self._stage}.prof"))
+        else:
+            lines.append("# cProfile skipped: another profiler was active")
+        for statistic in snapshot.statistics("lineno")[: self._top_n]:
+            lines.append(str(statistic))
+        (self._profile_dir / f"{self._stage}.alloc.txt").write_text(
+            "\n".join(lines) + "\n", encoding="utf-8"
+        )
+
+
+def profile_stage(
+    stage_dir: Path,
+    stage: str,
+    enabled: bool,
+    top_n: int = DEFAULT_TOP_N,
+) -> AbstractContextManager[object]:
+    """Profile the enclosed block into stage/profile/<stage>.prof when enabled; no-op otherwise."""
+    if not enabled:
+        return nullcontext()
+    return _StageProfiler(stage_dir / PROFILE_DIR_NAME, stage, top_n)
+
+
+def _format_function(key: tuple[str, int, str]) -> str:
+    filename, line, name = key
+    if filename == "~":
+        return name
+    return f"{Path(filename).name}:{line}({name})"
+
+
+def load_hotspots(
+    profile_dir: Path,
+    top_n: int = DEFAULT_TOP_N,
+    sort_by: str = "tottime",
+) -> list[HotSpot]:
+    """Merge every <stage>.prof under profile_dir and return the top functions."""
+    profile_paths = sorted(profile_dir.glob("*.prof"))
+    if not profile_paths:
+        raise FileNotFoundError(f"No profiles found under {profile_dir}")
+    if sort_by not in {"tottime", "cumtime"}:
+        raise ValueError(f"Unknown sort key '{sort_by}'. Allowed: cumtime, tottime.")
+
+    stats = pstats.Stats(*(str(path) for path in profile_paths))
+    rows = [
+        HotSpot(
+            function=_format_function(key),
+            calls=calls,
+            total_time_sec=total_time,
+            cumulative_time_sec=cumulative_time,
+        )
+        for key, (_, calls, total_time, cumulative_time, _) in stats.stats.items()  # type: ignore[attr-defined]
+    ]
+    sort_attr = "total_time_sec" if sort_by == "tottime" else "cumulative_time_sec"
+    rows.sort(key=lambda row: getattr(row, sort_attr), reverse=True)
+    return rows[:top_n]
@@ -0,0 +1,75 @@
+"""Scratch staging: run stage/ on fast local storage, checkpoint it to the workspace."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+import shutil
+from typing import Iterable
+
+from core.fileops import copy_file, publish_file
+
+
+@dataclass(frozen=True)
+class StageLocation:
+    """Where a run's stage/ lives: work_dir during the run, durable_dir between runs.
+
+    Without a scratch root both are book_dir/stage and checkpoints are no-ops.
+    """
+
+    durable_dir: Path
+    work_dir: Path
+
+    @property
+    def uses_scratch(self) -> bool:
+        return self.work_dir != self.durable_dir
+
+
+def resolve_stage_location(
+    book_dir: Path, book_id: str, scratch_root: Path | None
+) -> StageLocation:
+    durable_dir = book_dir / "stage"
+    if scratch_root is None:
+        return StageLocation(durable_dir=durable_dir, work_dir=durable_dir)
+    work_dir = scratch_root.resolve() / book_id / "stage"
+    return StageLocation(durable_dir=durable_dir, work_dir=work_dir)
+
+
+def _files_under(root: Path) -> list[Path]:
+    if root.is_file():
+        return [root]
+    if not root.is_dir():
+        return []
+    return [path for path in sorted(root.rglob("*")) if path.is_file()]
+
+
+def hydrate(location: StageLocation) -> int:
+    """Copy checkpointed artifacts missing from scratch back into it; return files copied."""
+    if not location.uses_scratch:
+        return 0
+    copied = 0
+    for source in _files_under(location.durable_dir):
+        target = location.work_dir / source.relative_to(location.durable_dir)
+        if target.exists() and target.stat().st_size == source.stat().st_size:
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        copy_file(source, target)
+        copied += 1
+    return copied
+
+
+def checkpoint(location: StageLocation, relative_paths: Iterable[str]) -> None:
+    """Durably publish the given stage/-relative files or directories from scratch."""
+    if not location.uses_scratch:
+        return
+    for relative_path in relative_paths:
+        for source in _files_under(location.work_dir / relative_path):
+            target = location.durable_dir / source.relative_to(location.work_dir)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            publish_file(source, target)
+
+
+def release(location: StageLocation) -> None:
+    """Delete this run's scratch directory."""
+    if location.uses_scratch:
+        shutil.rmtree(location.work_dir.parent, ignore_errors=True)
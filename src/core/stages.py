@@ -0,0 +1,227 @@
+"""Built-in pipeline stages and the stage registry used by run_pipeline."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+import time
+
+from core.assembler import assemble
+from core.cancellation import CancellationToken
+from core.cover_handler import apply_cover_order
+from core.dag import StageGraph, StageNode
+from core.finalizer import finalize, publish_text
+from core.manifest import Manifest
+from core.ocr import OCRResult, run_ocr
+from core.optimizer import optimize_pdf
+from core.pipeline_types import EXECUTION_MODES, PipelineSettings
+from core.streaming import stream_pages
+from core.thumbnail import make_thumbnail
+from core.validator import ProgressCallback, ValidationResult, list_image_files, validate
+
+
+@dataclass
+class StageContext:
+    """Everything a stage needs; `results` holds return values of stages run this time."""
+
+    book_dir: Path
+    stage_dir: Path
+    title: str
+    settings: PipelineSettings
+    manifest: Manifest
+    validation: ValidationResult
+    run_started: float
+    cancel_token: CancellationToken | None = None
+    results: dict[str, object] = field(default_factory=dict)
+
+    @property
+    def input_dir(self) -> Path:
+        return self.book_dir / "input"
+
+    def artifact(self, relative_path: str) -> Path:
+        """Resolve a book_dir-relative artifact name; stage/ may live in scratch."""
+        if relative_path.startswith("stage/"):
+            return self.stage_dir / relative_path.removeprefix("stage/")
+        return self.book_dir / relative_path
+
+
+def _page_progress(context: StageContext, stage: str) -> ProgressCallback:
+    def report(done: int, total: int) -> None:
+        context.manifest.update_progress(stage, done, total)
+        if context.cancel_token is not None:
+            context.cancel_token.raise_if_cancelled()
+
+    return report
+
+
+def _validate(context: StageContext) -> ValidationResult:
+    return validate(context.input_dir, progress=_page_progress(context, "validate"))
+
+
+def _assemble(context: StageContext) -> Path:
+    return assemble(
+        context.input_dir,
+        context.stage_dir,
+        front_cover=context.settings.front_cover,
+        back_cover=context.settings.back_cover,
+    )
+
+
+def _ocr(context: StageContext) -> OCRResult:
+    return run_ocr(
+        raw_pdf=context.stage_dir / "raw.pdf",
+        ocr_pdf=context.stage_dir / "ocr.pdf",
+        sidecar_text=context.stage_dir / "text.txt",
+        language=context.settings.language,
+        error_policy=context.settings.error_policy,
+        jobs=context.settings.ocr_jobs,
+        cancel_token=context.cancel_token,
+    )
+
+
+def _optimize(context: StageContext) -> Path:
+    return optimize_pdf(
+        ocr_pdf=context.stage_dir / "ocr.pdf",
+        optimized_pdf=context.stage_dir / "optimized.pdf",
+        mode=context.settings.optimize_mode,
+    )
+
+
+def _validate_numbering(context: StageContext) -> ValidationResult:
+    # Streaming verifies each image as it enters the page pipeline.
+    return validate(context.input_dir, verify_images=False)
+
+
+def _stream_pages(context: StageContext) -> OCRResult:
+    config = context.settings
+    return stream_pages(
+        apply_cover_order(
+            list_image_files(context.input_dir),
+            front_cover=config.front_cover,
+            back_cover=config.back_cover,
+        ),
+        context.stage_dir,
+        language=config.language,
+        error_policy=config.error_policy,
+        progress=_page_progress(context, "ocr"),
+        ocr_workers=config.ocr_jobs,
+        cancel_token=context.cancel_token,
+    )
+
+
+def _publish_text(context: StageContext) -> str:
+    return publish_text(context.book_dir, context.stage_dir)
+
+
+def _thumbnail(context: StageContext) -> Path:
+    return make_thumbnail(
+        context.input_dir,
+        context.book_dir / "out" / "thumbnail.jpg",
+        front_cover=context.settings.front_cover,
+    )
+
+
+def _finalize(context: StageContext) -> object:
+    ocr_result = context.results.get("ocr")
+    failed_pages = ocr_result.failed_pages if isinstance(ocr_result, OCRResult) else []
+    text_sha256 = context.results.get("publish_text")
+    config = context.settings
+    return finalize(
+        book_dir=context.book_dir,
+        title=context.title,
+        total_pages=context.validation.total_pages,
+        processing_time_sec=time.perf_counter() - context.run_started,
+        input_size_mb=context.validation.total_size_mb,
+        settings={
+            "ocr_language": config.language,
+            "optimize_mode": config.optimize_mode,
+            "error_policy": config.error_policy,
+        },
+        covers={"front": config.front_cover, "back": config.back_cover},
+        ocr_failed_pages=failed_pages,
+        stage_metrics=context.manifest.metrics,
+        text_sha256=text_sha256 if isinstance(text_sha256, str) else None,
+        stage_dir=context.stage_dir,
+    )
+
+
+BUILTIN_STAGES = (
+    StageNode("validate", _validate),
+    StageNode("assemble", _assemble, requires=("validate",), outputs=("stage/raw.pdf",)),
+    StageNode(
+        "ocr",
+        _ocr,
+        inputs=("stage/raw.pdf",),
+        outputs=("stage/ocr.pdf", "stage/text.txt"),
+    ),
+    StageNode(
+        "optimize",
+        _optimize,
+        inputs=("stage/ocr.pdf",),
+        outputs=("stage/optimized.pdf",),
+    ),
+    # Publishing text only needs OCR output, so it overlaps with optimize.
+    StageNode("publish_text", _publish_text, inputs=("stage/text.txt",), outputs=("out/book.txt",)),
+    StageNode(
+        "thumbnail",
+        _thumbnail,
+        requires=("validate",),
+        outputs=("out/thumbnail.jpg",),
+        optional=True,
+    ),
+    StageNode(
+        "finalize",
+        _finalize,
+        inputs=("stage/optimized.pdf", "out/book.txt"),
+        outputs=("out/book.pdf", "out/report.json"),
+    ),
+)
+
+_registry = StageGraph(BUILTIN_STAGES)
+
+
+def register_stage(node: StageNode, *, replace: bool = False) -> None:
+    """Add a stage to every subsequent run_pipeline call.
+
+    The node's run callable receives a StageContext. Its dependencies come from
+    `requires` and from whichever stages produce its `inputs`.
+    """
+    candidate = _registry.copy()
+    if replace:
+        candidate.replace(node)
+    else:
+        candidate.add(node)
+    # Fail at registration time rather than mid-run on cycles or unknown stages.
+    candidate.topological_order()
+    _registry.replace(node)
+
+
+def unregister_stage(name: str) -> None:
+    if name in {node.name for node in BUILTIN_STAGES}:
+        raise ValueError(f"Built-in stage '{name}' cannot be unregistered.")
+    _registry.remove(name)
+
+
+def default_stage_graph(execution_mode: str = "batch") -> StageGraph:
+    """Return a copy of the registered stage graph for the given execution mode.
+
+    In streaming mode assemble is dropped and ocr pushes pages through
+    validate → normalize → OCR itself, still producing stage/raw.pdf.
+    """
+    if execution_mode not in EXECUTION_MODES:
+        allowed = ", ".join(EXECUTION_MODES)
+        raise ValueError(f"Unknown execution mode '{execution_mode}'. Allowed: {allowed}.")
+
+    graph = _registry.copy()
+    if execution_mode == "streaming":
+        graph.replace(StageNode("validate", _validate_numbering))
+        graph.remove("assemble")
+        graph.replace(
+            StageNode(
+                "ocr",
+                _stream_pages,
+                requires=("validate",),
+                outputs=("stage/raw.pdf", "stage/ocr.pdf", "stage/text.txt"),
+            )
+        )
+    return graph
@@ -0,0 +1,326 @@
+"""Page-streaming execution: validate → normalize → OCR through bounded queues."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import json
+import os
+from pathlib import Path
+import queue
+import shutil
+import threading
+from typing import Callable
+
+from core.assembler import write_pdf
+from core.cancellation import CancellationToken
+from core.fileops import atomic_write_text
+from core.ocr import OCREngine, OCRResult, run_ocr
+from core.validator import ProgressCallback, extract_page_number, verify_image
+
+PAGES_DIR_NAME = "pages"
+PARTIAL_TEXT_NAME = "text.partial.txt"
+DEFAULT_QUEUE_SIZE = 8
+PAGE_SEPARATOR = "\f"
+
+_END = object()
+_POLL_SEC = 0.1
+# Page PDFs open at once while stitching; well below the usual 1024 file limit.
+_MERGE_BATCH = 256
+
+
+@dataclass(frozen=True)
+class _Page:
+    index: int
+    source: Path
+
+    @property
+    def number(self) -> int:
+        return extract_page_number(self.source)
+
+
+@dataclass(frozen=True)
+class _PageOutput:
+    index: int
+    ocr_pdf: Path
+    text: str
+    backend: str
+
+
+def _page_paths(pages_dir: Path, index: int) -> tuple[Path, Path, Path]:
+    stem = f"{index:05d}"
+    return (
+        pages_dir / f"{stem}.pdf",
+        pages_dir / f"{stem}.ocr.pdf",
+        pages_dir / f"{stem}.txt",
+    )
+
+
+def _page_result_path(pages_dir: Path, index: int) -> Path:
+    # Which backend produced the page, so a resumed run stitches and reports it the same.
+    return pages_dir / f"{index:05d}.json"
+
+
+def _read_page_backend(result_path: Path) -> str | None:
+    try:
+        return str(json.loads(result_path.read_text(encoding="utf-8"))["backend"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _merge_pdfs(pdf_paths: list[Path], output_pdf: Path) -> bool:
+    try:
+        import pikepdf
+    except ImportError:
+        return False
+
+    # Copied pages are read from their source when the merged file is saved, so sources
+    # stay open until then; saving every _MERGE_BATCH files bounds the open files.
+    partial_pdf = output_pdf.with_name(f"{output_pdf.name}.part")
+    merged = pikepdf.new()
+    sources: list[pikepdf.Pdf] = []
+    try:
+        for path in pdf_paths:
+            if len(sources) >= _MERGE_BATCH:
+                merged.save(output_pdf)
+                merged.close()
+                for source in sources:
+                    source.close()
+                sources.clear()
+                os.replace(output_pdf, partial_pdf)
+                merged = pikepdf.open(partial_pdf)
+            source = pikepdf.open(path)
+            sources.append(source)
+            merged.pages.extend(source.pages)
+        merged.save(output_pdf)
+    finally:
+        for source in sources:
+            source.close()
+        merged.close()
+        partial_pdf.unlink(missing_ok=True)
+    return True
+
+
+class _PageStream:
+    """Runs one validate thread, one normalize thread and a pool of OCR threads.
+
+    Queues between the steps are bounded, so a slow OCR pool throttles validation and
+    normalization instead of letting page PDFs pile up on disk.
+    """
+
+    def __init__(
+        self,
+        pages: list[_Page],
+        pages_dir: Path,
+        *,
+        language: str,
+        error_policy: str,
+        engine: OCREngine | None,
+        ocr_workers: int,
+        queue_size: int,
+        cancel_token: CancellationToken | None,
+    ) -> None:
+        self._pages = pages
+        self._pages_dir = pages_dir
+        self._language = language
+        self._error_policy = error_policy
+        self._engine = engine
+        self._ocr_workers = ocr_workers
+        self._cancel_token = cancel_token
+        self._normalize_queue: queue.Queue[object] = queue.Queue(maxsize=queue_size)
+        self._ocr_queue: queue.Queue[object] = queue.Queue(maxsize=queue_size)
+        self._stop = threading.Event()
+        self._error: BaseException | None = None
+        self._outputs: dict[int, _PageOutput] = {}
+        self._ready = threading.Condition()
+
+    def _put(self, target: queue.Queue[object], item: object) -> bool:
+        while not self._stop.is_set():
+            try:
+                target.put(item, timeout=_POLL_SEC)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _get(self, source: queue.Queue[object]) -> object:
+        while not self._stop.is_set():
+            try:
+                return source.get(timeout=_POLL_SEC)
+            except queue.Empty:
+                continue
+        return _END
+
+    def _guarded(self, body: Callable[[], None]) -> Callable[[], None]:
+        def run() -> None:
+            try:
+                body()
+            except BaseException as error:
+                with self._ready:
+                    if self._error is None:
+                        self._error = error
+                    self._stop.set()
+                    self._ready.notify_all()
+
+        return run
+
+    def _validate(self) -> None:
+        for page in self._pages:
+            if self._cancel_token is not None:
+                self._cancel_token.raise_if_cancelled()
+            verify_image(page.source)
+            if not self._put(self._normalize_queue, page):
+                return
+        self._put(self._normalize_queue, _END)
+
+    def _normalize(self) -> None:
+        while True:
+            page = self._get(self._normalize_queue)
+            if page is _END:
+                break
+            assert isinstance(page, _Page)
+            page_pdf, _, _ = _page_paths(self._pages_dir, page.index)
+            if not page_pdf.exists():
+                temp_pdf = page_pdf.with_suffix(".pdf.tmp")
+                write_pdf([page.source], temp_pdf)
+                os.replace(temp_pdf, page_pdf)
+            if not self._put(self._ocr_queue, page):
+                return
+        for _ in range(self._ocr_workers):
+            self._put(self._ocr_queue, _END)
+
+    def _ocr(self) -> None:
+        while True:
+            page = self._get(self._ocr_queue)
+            if page is _END:
+                return
+            assert isinstance(page, _Page)
+            output = self._ocr_page(page)
+            with self._ready:
+                self._outputs[page.index] = output
+                self._ready.notify_all()
+
+    def _ocr_page(self, page: _Page) -> _PageOutput:
+        page_pdf, ocr_pdf, text_path = _page_paths(self._pages_dir, page.index)
+        result_path = _page_result_path(self._pages_dir, page.index)
+        # The text file is renamed into place last, so it marks a finished page on resume.
+        if text_path.exists() and ocr_pdf.exists():
+            backend = _read_page_backend(result_path)
+            if backend is not None:
+                text = text_path.read_text(encoding="utf-8")
+                return _PageOutput(page.index, ocr_pdf, text, backend)
+
+        # A page takes seconds, so checking between pages is prompt enough; passing the
+        # token would start a killable child interpreter for every page.
+        if self._cancel_token is not None:
+            self._cancel_token.raise_if_cancelled()
+        temp_pdf = ocr_pdf.with_suffix(".pdf.tmp")
+        temp_text = text_path.with_suffix(".txt.tmp")
+        result = run_ocr(
+            raw_pdf=page_pdf,
+            ocr_pdf=temp_pdf,
+            sidecar_text=temp_text,
+            language=self._language,
+            error_policy=self._error_policy,
+            engine=self._engine,
+            jobs=1,
+        )
+        text = temp_text.read_text(encoding="utf-8").rstrip(PAGE_SEPARATOR)
+        os.replace(temp_pdf, ocr_pdf)
+        atomic_write_text(result_path, json.dumps({"backend": result.backend}))
+        atomic_write_text(text_path, text)
+        temp_text.unlink(missing_ok=True)
+        return _PageOutput(page.index, ocr_pdf, text, result.backend)
+
+    def run(self, partial_text: Path, progress: ProgressCallback | None) -> list[_PageOutput]:
+        threads = [
+            threading.Thread(target=self._guarded(self._validate), name="stream-validate"),
+            threading.Thread(target=self._guarded(self._normalize), name="stream-normalize"),
+        ]
+        threads.extend(
+            threading.Thread(target=self._guarded(self._ocr), name=f"stream-ocr-{index}")
+            for index in range(self._ocr_workers)
+        )
+        for thread in threads:
+            thread.start()
+
+        total = len(self._pages)
+        emitted: list[_PageOutput] = []
+        try:
+            with partial_text.open("w", encoding="utf-8") as handle:
+                while len(emitted) < total:
+                    with self._ready:
+                        while len(emitted) not in self._outputs and self._error is None:
+                            self._ready.wait()
+                        if self._error is not None:
+                            break
+                        output = self._outputs.pop(len(emitted))
+                    # Text is appended in reading order so readers always see a clean prefix.
+                    handle.write((PAGE_SEPARATOR if emitted else "") + output.text)
+                    handle.flush()
+                    emitted.append(output)
+                    if progress is not None:
+                        progress(len(emitted), total)
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        if self._error is not None:
+            raise self._error
+        return emitted
+
+
+def stream_pages(
+    page_paths: list[Path],
+    stage_dir: Path,
+    language: str = "kor+eng",
+    error_policy: str = "skip",
+    progress: ProgressCallback | None = None,
+    engine: OCREngine | None = None,
+    ocr_workers: int | None = None,
+    queue_size: int = DEFAULT_QUEUE_SIZE,
+    cancel_token: CancellationToken | None = None,
+) -> OCRResult:
+    """OCR pages one at a time and stitch stage/raw.pdf, stage/ocr.pdf and stage/text.txt.
+
+    page_paths must already be in reading order. OCR text is appended to
+    stage/text.partial.txt as pages finish; per-page artifacts under stage/pages/ let an
+    interrupted run skip pages that were already recognized.
+    """
+    if not page_paths:
+        raise ValueError("stream_pages needs at least one page.")
+
+    pages_dir = stage_dir / PAGES_DIR_NAME
+    pages_dir.mkdir(parents=True, exist_ok=True)
+    pages = [_Page(index, path) for index, path in enumerate(page_paths)]
+
+    outputs = _PageStream(
+        pages,
+        pages_dir,
+        language=language,
+        error_policy=error_policy,
+        engine=engine,
+        ocr_workers=max(1, ocr_workers or os.cpu_count() or 1),
+        queue_size=max(1, queue_size),
+        cancel_token=cancel_token,
+    ).run(stage_dir / PARTIAL_TEXT_NAME, progress)
+
+    raw_pdf = stage_dir / "raw.pdf"
+    ocr_pdf = stage_dir / "ocr.pdf"
+    page_pdfs = [_page_paths(pages_dir, page.index)[0] for page in pages]
+    if _merge_pdfs(page_pdfs, raw_pdf):
+        _merge_pdfs([output.ocr_pdf for output in outputs], ocr_pdf)
+    elif all(output.backend == "passthrough" for output in outputs):
+        # Without an OCR engine the OCR pages are plain copies; rebuild from the images.
+        write_pdf(page_paths, raw_pdf)
+        shutil.copy2(raw_pdf, ocr_pdf)
+    else:
+        raise RuntimeError("pikepdf is required to stitch OCR pages.")
+
+    os.replace(stage_dir / PARTIAL_TEXT_NAME, stage_dir / "text.txt")
+    failed_pages = [
+        pages[output.index].number for output in outputs if output.backend == "passthrough-error"
+    ]
+    backends = {output.backend for output in outputs}
+    backend = "ocrmypdf" if "ocrmypdf" in backends else "passthrough"
+    return OCRResult(backend=f"{backend}-streaming", failed_pages=failed_pages)
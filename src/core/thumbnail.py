@@ -0,0 +1,41 @@
+"""Cover thumbnail generation."""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+from PIL import Image
+
+from core.cover_handler import apply_cover_order
+from core.errors import NoImagesError
+from core.fileops import atomic_write_bytes
+from core.validator import list_image_files
+
+THUMBNAIL_SIZE = (320, 320)
+
+
+def make_thumbnail(
+    input_dir: Path,
+    output_path: Path,
+    front_cover: int | None = None,
+    size: tuple[int, int] = THUMBNAIL_SIZE,
+) -> Path:
+    """Write a JPEG thumbnail of the book's first page (after cover ordering)."""
+    page_paths = list_image_files(input_dir)
+    if not page_paths:
+        raise NoImagesError(f"No supported images found in {input_dir}")
+    first_page = apply_cover_order(page_paths, front_cover=front_cover)[0]
+
+    with Image.open(first_page) as source_image:
+        # draft() lets JPEG decode at reduced scale instead of full resolution.
+        source_image.draft("RGB", size)
+        image = source_image.convert("RGB")
+    image.thumbnail(size)
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG", quality=85)
+    image.close()
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(output_path, buffer.getvalue())
+    return output_path
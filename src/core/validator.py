@@ -3,9 +3,10 @@
 from __future__ import annotations
 
 from collections import Counter
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
 import re
+from typing import Callable
 
 from PIL import Image, UnidentifiedImageError
 
@@ -14,15 +15,33 @@ from core.errors import CorruptedImageError, DuplicatePageError, MissingPageErro
 SUPPORTED_IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".tif", ".tiff"}
 _NUMERIC_PREFIX_PATTERN = re.compile(r"^(\d+)")
 
+ProgressCallback = Callable[[int, int], None]
+
+
+@dataclass(frozen=True)
+class PageStats:
+    """Header-level facts about one page image, gathered while verifying it."""
+
+    path: Path
+    size_bytes: int
+    width: int
+    height: int
+    mode: str
+
+    @property
+    def pixels(self) -> int:
+        return self.width * self.height
+
 
 @dataclass(frozen=True)
 class ValidationResult:
-    """Outcome of directory validation."""
+    """Outcome of directory validation; `pages` is filled only when images were verified."""
 
     files: list[Path]
     page_numbers: list[int]
     total_pages: int
     total_size_mb: float
+    pages: list[PageStats] = field(default_factory=list)
 
 
 def extract_page_number(path: Path) -> int:
@@ -47,6 +66,14 @@ def list_image_files(input_dir: Path) -> list[Path]:
     return files
 
 
+def count_pages(input_dir: Path) -> int | None:
+    """Number of page images in input_dir, or None when it cannot be listed."""
+    try:
+        return len(list_image_files(input_dir))
+    except OSError:
+        return None
+
+
 def _find_missing_pages(page_numbers: list[int]) -> list[int]:
     if not page_numbers:
         return []
@@ -59,17 +86,42 @@ def _find_duplicate_pages(page_numbers: list[int]) -> list[int]:
     return sorted(number for number, count in counts.items() if count > 1)
 
 
-def _verify_images(files: list[Path]) -> None:
-    for file_path in files:
-        try:
-            with Image.open(file_path) as image:
-                image.verify()
-        except (UnidentifiedImageError, OSError) as error:
-            raise CorruptedImageError(str(file_path)) from error
+def verify_image(file_path: Path) -> PageStats:
+    """Raise CorruptedImageError unless file_path decodes as an image header."""
+    try:
+        with Image.open(file_path) as image:
+            width, height = image.size
+            mode = image.mode
+            image.verify()
+    except (UnidentifiedImageError, OSError) as error:
+        raise CorruptedImageError(str(file_path)) from error
+    return PageStats(
+        path=file_path,
+        size_bytes=file_path.stat().st_size,
+        width=width,
+        height=height,
+        mode=mode,
+    )
+
+
+def _verify_images(files: list[Path], progress: ProgressCallback | None = None) -> list[PageStats]:
+    pages: list[PageStats] = []
+    for index, file_path in enumerate(files, start=1):
+        pages.append(verify_image(file_path))
+        if progress is not None:
+            progress(index, len(files))
+    return pages
+
 
+def validate(
+    input_dir: Path,
+    progress: ProgressCallback | None = None,
+    verify_images: bool = True,
+) -> ValidationResult:
+    """Validate image sequence integrity and readability; progress gets (pages_done, total).
 
-def validate(input_dir: Path) -> ValidationResult:
-    """Validate image sequence integrity and readability."""
+    With verify_images=False only numbering is checked, leaving per-image checks to the caller.
+    """
     files = list_image_files(input_dir)
     if not files:
         raise NoImagesError(f"No supported images found in {input_dir}")
@@ -83,7 +135,7 @@ def validate(input_dir: Path) -> ValidationResult:
     if missing:
         raise MissingPageError(missing)
 
-    _verify_images(files)
+    pages = _verify_images(files, progress) if verify_images else []
 
     total_size_mb = sum(file_path.stat().st_size for file_path in files) / (1024 * 1024)
     return ValidationResult(
@@ -91,4 +143,5 @@ def validate(input_dir: Path) -> ValidationResult:
         page_numbers=page_numbers,
         total_pages=len(files),
         total_size_mb=total_size_mb,
+        pages=pages,
     )
@@ -14,6 +14,9 @@ from models.database import (
     get_latest_job_for_book,
     init_db,
     list_books,
+    list_books_page,
+    list_books_with_latest_job_page,
+    list_jobs_page,
     mark_job_done,
     mark_job_failed,
     mark_job_running,
@@ -30,6 +33,9 @@ __all__ = [
     "get_book",
     "delete_book",
     "list_books",
+    "list_books_page",
+    "list_books_with_latest_job_page",
+    "list_jobs_page",
     "update_book_settings",
     "update_book_status",
     "create_job",
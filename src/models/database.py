@@ -2,69 +2,339 @@
 
 from __future__ import annotations
 
+import base64
 from contextlib import contextmanager
-from datetime import datetime, timezone
+from dataclasses import replace
+from datetime import datetime, timedelta, timezone
+import json
+import os
 from pathlib import Path
+import socket
 import sqlite3
+import threading
+from typing import Iterator, Sequence
 from uuid import uuid4
 
-from models.schemas import Book, Job
+from models.notify import notify_job_available
+from models.schemas import Book, BookSpec, Job
 
 
 def utc_now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def default_lease_owner() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _epoch(iso_value: str) -> float:
+    return datetime.fromisoformat(iso_value).timestamp()
+
+
+def _not_before(now_value: str, scheduled_at: str | None) -> float:
+    now_epoch = _epoch(now_value)
+    return max(now_epoch, _epoch(scheduled_at)) if scheduled_at else now_epoch
+
+
+def _queue_keys(
+    conn: sqlite3.Connection,
+    *,
+    fair_key: str,
+    priority: int,
+    page_count: int | None,
+    not_before: float,
+) -> tuple[float, float]:
+    """Return (queue_key, sjf_key) for a new job and charge its cost to fair_key.
+
+    queue_key is start-time fair queuing: each fair_key has a virtual clock that
+    advances by the cost of every job it submits, so one submitter's 500 folders
+    interleave with everybody else's work instead of running first.
+    """
+    cost = page_count * PAGE_COST_SEC if page_count else DEFAULT_JOB_COST_SEC
+    boost = priority * PRIORITY_STEP_SEC
+    conn.execute(
+        """
+        INSERT INTO fair_shares (fair_key, virtual_time) VALUES (?, ?)
+        ON CONFLICT (fair_key) DO UPDATE
+        SET virtual_time = MAX(virtual_time, excluded.virtual_time - ?) + ?
+        """,
+        (fair_key, not_before + cost, cost, cost),
+    )
+    finish = conn.execute(
+        "SELECT virtual_time FROM fair_shares WHERE fair_key = ?", (fair_key,)
+    ).fetchone()[0]
+    return finish - cost - boost, not_before + cost - boost
+
+
+def _default_fair_key(source_path: str) -> str:
+    # Without an explicit submitter, folders queued from the same inbox share a key.
+    return str(Path(source_path).parent)
+
+
+def _lease_expiry(now_value: str, lease_sec: float) -> str:
+    return (datetime.fromisoformat(now_value) + timedelta(seconds=lease_sec)).isoformat()
+
+
+# Statements are cached per connection, so the cache only pays off on long-lived ones.
+STATEMENT_CACHE_SIZE = 256
+BUSY_TIMEOUT_MS = 5000
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_LEASE_SEC = 60.0
+
+SCHEDULING_POLICIES = ("fair", "sjf", "fifo")
+# One priority level moves a job this far ahead in the queue. Because keys are fixed
+# at enqueue time, later arrivals eventually sort behind it: that is the aging bound.
+PRIORITY_STEP_SEC = 3600.0
+# Rough OCR cost used to weigh jobs in fair share and shortest-job-first ordering.
+PAGE_COST_SEC = 2.0
+DEFAULT_JOB_COST_SEC = 300.0
+# Finished runs per stage averaged into progress ETAs.
+STAGE_HISTORY_SIZE = 20
+
+
+class _ConnectionPool:
+    """One persistent SQLite connection per (thread, database file).
+
+    Connections of threads that have exited are closed lazily the next time any
+    thread opens a connection. A forked child never reuses its parent's connections.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._connections: dict[tuple[threading.Thread, str], sqlite3.Connection] = {}
+        self._depth: dict[tuple[threading.Thread, str], int] = {}
+        self._pid = os.getpid()
+
+    def _open(self, db_path: Path) -> sqlite3.Connection:
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        # check_same_thread is off only so close_all() can run from another thread;
+        # each connection is otherwise used by the thread that opened it.
+        conn = sqlite3.connect(
+            db_path,
+            check_same_thread=False,
+            cached_statements=STATEMENT_CACHE_SIZE,
+        )
+        conn.row_factory = sqlite3.Row
+        # Set first: switching a new database to WAL needs a lock another process may hold.
+        conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA foreign_keys = ON")
+        return conn
+
+    def _key(self, db_path: Path) -> tuple[threading.Thread, str]:
+        return (threading.current_thread(), str(db_path))
+
+    def acquire(self, db_path: Path) -> tuple[sqlite3.Connection, bool]:
+        """Return this thread's connection and whether the caller is the outermost user."""
+        key = self._key(db_path)
+        with self._lock:
+            if os.getpid() != self._pid:
+                # Inherited over fork: the parent still owns these handles.
+                self._connections.clear()
+                self._depth.clear()
+                self._pid = os.getpid()
+            conn = self._connections.get(key)
+            if conn is None:
+                self._close_dead_threads()
+                conn = self._open(db_path)
+                self._connections[key] = conn
+            depth = self._depth.get(key, 0)
+            self._depth[key] = depth + 1
+        return conn, depth == 0
+
+    def release(self, db_path: Path) -> None:
+        key = self._key(db_path)
+        with self._lock:
+            self._depth[key] -= 1
+
+    def _close_dead_threads(self) -> None:
+        for key in [key for key in self._connections if not key[0].is_alive()]:
+            self._connections.pop(key).close()
+            self._depth.pop(key, None)
+
+    def close_all(self, db_path: Path | None = None) -> None:
+        target = str(db_path) if db_path is not None else None
+        with self._lock:
+            for key in list(self._connections):
+                if target is None or key[1] == target:
+                    self._connections.pop(key).close()
+                    self._depth.pop(key, None)
+
+
+_pool = _ConnectionPool()
+
+
 @contextmanager
 def connection(db_path: Path):
-    db_path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    """Yield the calling thread's pooled connection; commit when the outermost block exits."""
+    conn, outermost = _pool.acquire(db_path)
     try:
         yield conn
-        conn.commit()
+        if outermost:
+            conn.commit()
+    except BaseException:
+        if outermost:
+            conn.rollback()
+        raise
     finally:
-        conn.close()
+        _pool.release(db_path)
 
 
-def init_db(db_path: Path) -> None:
-    with connection(db_path) as conn:
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS books (
-                id TEXT PRIMARY KEY,
-                title TEXT NOT NULL,
-                source_path TEXT NOT NULL,
-                book_dir TEXT NOT NULL,
-                status TEXT NOT NULL DEFAULT 'pending',
-                current_stage TEXT NOT NULL DEFAULT 'validate',
-                ocr_language TEXT NOT NULL DEFAULT 'kor+eng',
-                optimize_mode TEXT NOT NULL DEFAULT 'basic',
-                error_policy TEXT NOT NULL DEFAULT 'skip',
-                front_cover INTEGER,
-                back_cover INTEGER,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
-            """
+def close_connections(db_path: Path | None = None) -> None:
+    """Close pooled connections (for one database file, or all of them)."""
+    _pool.close_all(db_path)
+
+
+# Each entry migrates the schema from version N to N + 1 (PRAGMA user_version).
+# Append new steps; never edit one that has shipped.
+MIGRATIONS: tuple[tuple[str, ...], ...] = (
+    (
+        """
+        CREATE TABLE IF NOT EXISTS books (
+            id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            source_path TEXT NOT NULL,
+            book_dir TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            current_stage TEXT NOT NULL DEFAULT 'validate',
+            ocr_language TEXT NOT NULL DEFAULT 'kor+eng',
+            optimize_mode TEXT NOT NULL DEFAULT 'basic',
+            error_policy TEXT NOT NULL DEFAULT 'skip',
+            front_cover INTEGER,
+            back_cover INTEGER,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
         )
-        conn.execute(
-            """
-            CREATE TABLE IF NOT EXISTS jobs (
-                id TEXT PRIMARY KEY,
-                book_id TEXT NOT NULL REFERENCES books(id) ON DELETE CASCADE,
-                status TEXT NOT NULL DEFAULT 'pending',
-                scheduled_at TEXT,
-                started_at TEXT,
-                finished_at TEXT,
-                error_message TEXT,
-                resume INTEGER NOT NULL DEFAULT 0,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
-            )
-            """
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS jobs (
+            id TEXT PRIMARY KEY,
+            book_id TEXT NOT NULL REFERENCES books(id) ON DELETE CASCADE,
+            status TEXT NOT NULL DEFAULT 'pending',
+            scheduled_at TEXT,
+            started_at TEXT,
+            finished_at TEXT,
+            error_message TEXT,
+            resume INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+        """,
+    ),
+    (
+        # Claim order; carries scheduled_at and id so the candidate lookup is covered.
+        """
+        CREATE INDEX IF NOT EXISTS idx_jobs_claim
+        ON jobs (status, COALESCE(scheduled_at, created_at), created_at, scheduled_at, id)
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status_created ON jobs (status, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_book_created ON jobs (book_id, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_created ON jobs (created_at)",
+        """
+        CREATE INDEX IF NOT EXISTS idx_books_source_updated
+        ON books (source_path, updated_at, status)
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_books_source_created ON books (source_path, created_at)",
+        "CREATE INDEX IF NOT EXISTS idx_books_created ON books (created_at)",
+    ),
+    (
+        # Keyset pagination walks (created_at, id); listings filtered by status too.
+        "CREATE INDEX IF NOT EXISTS idx_books_keyset ON books (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_books_status_keyset ON books (status, created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_keyset ON jobs (created_at, id)",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_status_keyset ON jobs (status, created_at, id)",
+    ),
+    (
+        # Covers the latest-job-per-book lookup, superseding idx_jobs_book_created.
+        "CREATE INDEX IF NOT EXISTS idx_jobs_book_latest ON jobs (book_id, created_at, id)",
+        "DROP INDEX IF EXISTS idx_jobs_book_created",
+    ),
+    (
+        # Running jobs hold a lease that their worker keeps renewing; expired ones are stolen.
+        "ALTER TABLE jobs ADD COLUMN lease_owner TEXT",
+        "ALTER TABLE jobs ADD COLUMN lease_expires_at TEXT",
+        "CREATE INDEX IF NOT EXISTS idx_jobs_lease ON jobs (status, lease_expires_at)",
+    ),
+    (
+        # Scheduling: queue_key (fair share + priority) and sjf_key (size + priority) are
+        # computed once at enqueue time, so every policy's claim is a single index probe.
+        "ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0",
+        "ALTER TABLE jobs ADD COLUMN fair_key TEXT NOT NULL DEFAULT ''",
+        "ALTER TABLE jobs ADD COLUMN page_count INTEGER",
+        "ALTER TABLE jobs ADD COLUMN queue_key REAL",
+        "ALTER TABLE jobs ADD COLUMN sjf_key REAL",
+        """
+        UPDATE jobs
+        SET queue_key = (julianday(COALESCE(scheduled_at, created_at)) - 2440587.5) * 86400.0,
+            sjf_key = (julianday(COALESCE(scheduled_at, created_at)) - 2440587.5) * 86400.0
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS fair_shares (
+            fair_key TEXT PRIMARY KEY,
+            virtual_time REAL NOT NULL
         )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_jobs_fair
+        ON jobs (status, queue_key, scheduled_at, id)
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_jobs_sjf ON jobs (status, sjf_key, scheduled_at, id)",
+    ),
+    (
+        # Seconds per page of each finished stage, the history behind progress ETAs.
+        """
+        CREATE TABLE IF NOT EXISTS stage_timings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            book_id TEXT NOT NULL,
+            stage TEXT NOT NULL,
+            ocr_language TEXT NOT NULL,
+            optimize_mode TEXT NOT NULL,
+            page_count INTEGER NOT NULL,
+            sec_per_page REAL NOT NULL,
+            recorded_at TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_stage_timings_lookup
+        ON stage_timings (ocr_language, optimize_mode, stage, recorded_at, sec_per_page)
+        """,
+    ),
+)
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def schema_version(db_path: Path) -> int:
+    with connection(db_path) as conn:
+        return int(conn.execute("PRAGMA user_version").fetchone()[0])
+
+
+def init_db(db_path: Path) -> None:
+    """Create the schema or bring an existing database up to SCHEMA_VERSION."""
+    with connection(db_path) as conn:
+        while True:
+            # One step per write transaction: a process starting at the same time waits
+            # for the lock and then reads the version this one left behind.
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                current = int(conn.execute("PRAGMA user_version").fetchone()[0])
+                if current > SCHEMA_VERSION:
+                    raise RuntimeError(
+                        f"Database schema version {current} is newer than supported "
+                        f"({SCHEMA_VERSION})."
+                    )
+                if current == SCHEMA_VERSION:
+                    conn.commit()
+                    return
+                for statement in MIGRATIONS[current]:
+                    conn.execute(statement)
+                # PRAGMA does not take parameters; current is an int we read.
+                conn.execute(f"PRAGMA user_version = {current + 1}")
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
 
 
 def create_book(
@@ -111,8 +381,9 @@ def create_book(
                 now,
             ),
         )
+        row = conn.execute("SELECT * FROM books WHERE id = ?", (resolved_book_id,)).fetchone()
 
-    book = get_book(db_path, resolved_book_id)
+    book = Book.from_row(row) if row is not None else None
     if book is None:
         raise RuntimeError("Book creation failed.")
     return book
@@ -182,6 +453,202 @@ def list_books(db_path: Path) -> list[Book]:
     return [Book.from_row(row) for row in rows]
 
 
+def encode_cursor(created_at: str, row_id: str) -> str:
+    """Opaque keyset cursor pointing just past the (created_at, id) of a row."""
+    payload = json.dumps([created_at, row_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError, UnicodeError) as error:
+        raise ValueError(f"Invalid cursor '{cursor}'.") from error
+    if not isinstance(created_at, str) or not isinstance(row_id, str):
+        raise ValueError(f"Invalid cursor '{cursor}'.")
+    return created_at, row_id
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _keyset_page(
+    conn: sqlite3.Connection,
+    *,
+    select_sql: str,
+    alias: str,
+    conditions: list[str],
+    params: list[object],
+    cursor: str | None,
+    limit: int,
+) -> tuple[list[sqlite3.Row], str | None]:
+    if limit < 1:
+        raise ValueError("limit must be at least 1.")
+    if cursor is not None:
+        conditions = [*conditions, f"({alias}.created_at, {alias}.id) < (?, ?)"]
+        params = [*params, *decode_cursor(cursor)]
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    # Fetch one extra row to learn whether another page exists.
+    rows = conn.execute(
+        f"{select_sql} {where} ORDER BY {alias}.created_at DESC, {alias}.id DESC LIMIT ?",
+        (*params, limit + 1),
+    ).fetchall()
+    if len(rows) <= limit:
+        return rows, None
+    last = rows[limit - 1]
+    return rows[:limit], encode_cursor(last["created_at"], last["id"])
+
+
+def _book_conditions(
+    *,
+    status: str | None,
+    stage: str | None,
+    title_prefix: str | None,
+    created_after: str | None,
+    created_before: str | None,
+) -> tuple[list[str], list[object]]:
+    conditions: list[str] = []
+    params: list[object] = []
+    if status is not None:
+        conditions.append("b.status = ?")
+        params.append(status)
+    if stage is not None:
+        conditions.append("b.current_stage = ?")
+        params.append(stage)
+    if title_prefix:
+        conditions.append("b.title LIKE ? ESCAPE '\\'")
+        params.append(f"{_escape_like(title_prefix)}%")
+    if created_after is not None:
+        conditions.append("b.created_at >= ?")
+        params.append(created_after)
+    if created_before is not None:
+        conditions.append("b.created_at < ?")
+        params.append(created_before)
+    return conditions, params
+
+
+def list_books_page(
+    db_path: Path,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    status: str | None = None,
+    stage: str | None = None,
+    title_prefix: str | None = None,
+    created_after: str | None = None,
+    created_before: str | None = None,
+) -> tuple[list[Book], str | None]:
+    """Newest-first page of books and the cursor of the next page (None on the last one)."""
+    conditions, params = _book_conditions(
+        status=status,
+        stage=stage,
+        title_prefix=title_prefix,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    with connection(db_path) as conn:
+        rows, next_cursor = _keyset_page(
+            conn,
+            select_sql="SELECT b.* FROM books AS b",
+            alias="b",
+            conditions=conditions,
+            params=params,
+            cursor=cursor,
+            limit=limit,
+        )
+    return [Book.from_row(row) for row in rows], next_cursor
+
+
+_JOB_COLUMNS = (
+    "id",
+    "book_id",
+    "status",
+    "scheduled_at",
+    "started_at",
+    "finished_at",
+    "error_message",
+    "resume",
+    "created_at",
+    "updated_at",
+    "lease_owner",
+    "lease_expires_at",
+    "priority",
+    "fair_key",
+    "page_count",
+    "queue_key",
+    "sjf_key",
+)
+
+# The correlated subquery is a single probe of idx_jobs_book_latest per book.
+_BOOKS_WITH_LATEST_JOB_SQL = (
+    "SELECT b.*, "
+    + ", ".join(f"j.{column} AS job_{column}" for column in _JOB_COLUMNS)
+    + """
+    FROM books AS b
+    LEFT JOIN jobs AS j ON j.id = (
+        SELECT latest.id FROM jobs AS latest
+        WHERE latest.book_id = b.id
+        ORDER BY latest.created_at DESC, latest.id DESC
+        LIMIT 1
+    )
+    """
+)
+
+
+def _latest_job_from_row(row: sqlite3.Row) -> Job | None:
+    if row["job_id"] is None:
+        return None
+    return Job.from_row({column: row[f"job_{column}"] for column in _JOB_COLUMNS})
+
+
+def list_books_with_latest_job_page(
+    db_path: Path,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    status: str | None = None,
+    stage: str | None = None,
+    title_prefix: str | None = None,
+    created_after: str | None = None,
+    created_before: str | None = None,
+) -> tuple[list[tuple[Book, Job | None]], str | None]:
+    """Like list_books_page, but each book comes with its latest job in the same query."""
+    conditions, params = _book_conditions(
+        status=status,
+        stage=stage,
+        title_prefix=title_prefix,
+        created_after=created_after,
+        created_before=created_before,
+    )
+    with connection(db_path) as conn:
+        rows, next_cursor = _keyset_page(
+            conn,
+            select_sql=_BOOKS_WITH_LATEST_JOB_SQL,
+            alias="b",
+            conditions=conditions,
+            params=params,
+            cursor=cursor,
+            limit=limit,
+        )
+    return [(Book.from_row(row), _latest_job_from_row(row)) for row in rows], next_cursor
+
+
+def iter_books_with_latest_job(
+    db_path: Path, *, page_size: int = DEFAULT_PAGE_SIZE, **filters: str | None
+) -> Iterator[list[tuple[Book, Job | None]]]:
+    """Yield pages of (book, latest job) lazily, following cursors until the last page."""
+    cursor: str | None = None
+    while True:
+        page, cursor = list_books_with_latest_job_page(
+            db_path, limit=page_size, cursor=cursor, **filters
+        )
+        if page:
+            yield page
+        if cursor is None:
+            return
+
+
 def find_latest_book_by_source(db_path: Path, source_path: Path) -> Book | None:
     resolved_source = str(source_path.resolve())
     with connection(db_path) as conn:
@@ -198,7 +665,7 @@ def find_latest_failed_book_by_source(db_path: Path, source_path: Path) -> Book
         row = conn.execute(
             """
             SELECT * FROM books
-            WHERE source_path = ? AND status = 'failed'
+            WHERE source_path = ? AND status IN ('failed', 'cancelled')
             ORDER BY updated_at DESC
             LIMIT 1
             """,
@@ -228,6 +695,135 @@ def update_book_status(
             )
 
 
+def create_books_and_jobs(
+    db_path: Path,
+    specs: Sequence[BookSpec],
+    *,
+    book_dir: Path,
+    with_jobs: bool = True,
+    scheduled_at: str | None = None,
+    resume: bool = False,
+    priority: int = 0,
+    submitter: str | None = None,
+) -> list[tuple[Book, Job | None]]:
+    """Insert many books (and one pending job each) in a single transaction.
+
+    Rows are built in Python and written with executemany, so nothing is re-read.
+    """
+    now = utc_now_iso()
+    not_before = _not_before(now, scheduled_at)
+    books_root = book_dir.resolve()
+    created: list[tuple[Book, Job | None]] = []
+    for spec in specs:
+        book_id = uuid4().hex[:12]
+        book = Book(
+            id=book_id,
+            title=spec.title or spec.source_path.name,
+            source_path=str(spec.source_path.resolve()),
+            book_dir=str(books_root / book_id),
+            status="pending",
+            current_stage="validate",
+            ocr_language=spec.ocr_language,
+            optimize_mode=spec.optimize_mode,
+            error_policy=spec.error_policy,
+            front_cover=spec.front_cover,
+            back_cover=spec.back_cover,
+            created_at=now,
+            updated_at=now,
+        )
+        job = None
+        if with_jobs:
+            job = Job(
+                id=uuid4().hex[:12],
+                book_id=book_id,
+                status="pending",
+                scheduled_at=scheduled_at,
+                started_at=None,
+                finished_at=None,
+                error_message=None,
+                resume=resume,
+                created_at=now,
+                updated_at=now,
+                priority=priority,
+                fair_key=submitter or _default_fair_key(book.source_path),
+                page_count=spec.page_count,
+            )
+        created.append((book, job))
+
+    with connection(db_path) as conn:
+        if with_jobs:
+            keyed = []
+            for book, job in created:
+                assert job is not None
+                queue_key, sjf_key = _queue_keys(
+                    conn,
+                    fair_key=job.fair_key,
+                    priority=job.priority,
+                    page_count=job.page_count,
+                    not_before=not_before,
+                )
+                keyed.append((book, replace(job, queue_key=queue_key, sjf_key=sjf_key)))
+            created = keyed
+        conn.executemany(
+            """
+            INSERT INTO books (
+                id, title, source_path, book_dir, status, current_stage,
+                ocr_language, optimize_mode, error_policy, front_cover, back_cover,
+                created_at, updated_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (
+                    book.id,
+                    book.title,
+                    book.source_path,
+                    book.book_dir,
+                    book.status,
+                    book.current_stage,
+                    book.ocr_language,
+                    book.optimize_mode,
+                    book.error_policy,
+                    book.front_cover,
+                    book.back_cover,
+                    book.created_at,
+                    book.updated_at,
+                )
+                for book, _ in created
+            ),
+        )
+        conn.executemany(
+            """
+            INSERT INTO jobs (
+                id, book_id, status, scheduled_at, started_at, finished_at,
+                error_message, resume, created_at, updated_at,
+                priority, fair_key, page_count, queue_key, sjf_key
+            )
+            VALUES (?, ?, 'pending', ?, NULL, NULL, NULL, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (
+                    job.id,
+                    job.book_id,
+                    job.scheduled_at,
+                    int(job.resume),
+                    job.created_at,
+                    job.updated_at,
+                    job.priority,
+                    job.fair_key,
+                    job.page_count,
+                    job.queue_key,
+                    job.sjf_key,
+                )
+                for _, job in created
+                if job is not None
+            ),
+        )
+    if with_jobs and created:
+        notify_job_available(db_path)
+    return created
+
+
 def create_job(
     db_path: Path,
     *,
@@ -235,23 +831,54 @@ def create_job(
     scheduled_at: str | None = None,
     resume: bool = False,
     job_id: str | None = None,
+    priority: int = 0,
+    submitter: str | None = None,
+    page_count: int | None = None,
 ) -> Job:
     now = utc_now_iso()
     resolved_job_id = job_id or uuid4().hex[:12]
     with connection(db_path) as conn:
+        fair_key = submitter
+        if fair_key is None:
+            book_row = conn.execute(
+                "SELECT source_path FROM books WHERE id = ?", (book_id,)
+            ).fetchone()
+            fair_key = _default_fair_key(book_row["source_path"]) if book_row else ""
+        queue_key, sjf_key = _queue_keys(
+            conn,
+            fair_key=fair_key,
+            priority=priority,
+            page_count=page_count,
+            not_before=_not_before(now, scheduled_at),
+        )
         conn.execute(
             """
             INSERT INTO jobs (
                 id, book_id, status, scheduled_at, started_at, finished_at,
-                error_message, resume, created_at, updated_at
+                error_message, resume, created_at, updated_at,
+                priority, fair_key, page_count, queue_key, sjf_key
             )
-            VALUES (?, ?, 'pending', ?, NULL, NULL, NULL, ?, ?, ?)
+            VALUES (?, ?, 'pending', ?, NULL, NULL, NULL, ?, ?, ?, ?, ?, ?, ?, ?)
             """,
-            (resolved_job_id, book_id, scheduled_at, int(resume), now, now),
+            (
+                resolved_job_id,
+                book_id,
+                scheduled_at,
+                int(resume),
+                now,
+                now,
+                priority,
+                fair_key,
+                page_count,
+                queue_key,
+                sjf_key,
+            ),
         )
-    job = get_job(db_path, resolved_job_id)
+        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (resolved_job_id,)).fetchone()
+    job = Job.from_row(row) if row is not None else None
     if job is None:
         raise RuntimeError("Job creation failed.")
+    notify_job_available(db_path)
     return job
 
 
@@ -273,10 +900,151 @@ def list_jobs(db_path: Path, status: str | None = None) -> list[Job]:
     return [Job.from_row(row) for row in rows]
 
 
+def list_jobs_page(
+    db_path: Path,
+    *,
+    limit: int = DEFAULT_PAGE_SIZE,
+    cursor: str | None = None,
+    status: str | None = None,
+    book_id: str | None = None,
+    stage: str | None = None,
+    title_prefix: str | None = None,
+    created_after: str | None = None,
+    created_before: str | None = None,
+) -> tuple[list[Job], str | None]:
+    """Newest-first page of jobs; stage and title_prefix filter on the job's book."""
+    conditions: list[str] = []
+    params: list[object] = []
+    if status is not None:
+        conditions.append("j.status = ?")
+        params.append(status)
+    if book_id is not None:
+        conditions.append("j.book_id = ?")
+        params.append(book_id)
+    if stage is not None:
+        conditions.append("b.current_stage = ?")
+        params.append(stage)
+    if title_prefix:
+        conditions.append("b.title LIKE ? ESCAPE '\\'")
+        params.append(f"{_escape_like(title_prefix)}%")
+    if created_after is not None:
+        conditions.append("j.created_at >= ?")
+        params.append(created_after)
+    if created_before is not None:
+        conditions.append("j.created_at < ?")
+        params.append(created_before)
+
+    select_sql = "SELECT j.* FROM jobs AS j"
+    if stage is not None or title_prefix:
+        select_sql += " JOIN books AS b ON b.id = j.book_id"
+    with connection(db_path) as conn:
+        rows, next_cursor = _keyset_page(
+            conn,
+            select_sql=select_sql,
+            alias="j",
+            conditions=conditions,
+            params=params,
+            cursor=cursor,
+            limit=limit,
+        )
+    return [Job.from_row(row) for row in rows], next_cursor
+
+
+def get_job_states(db_path: Path, job_ids: Sequence[str]) -> dict[str, tuple[str, str | None]]:
+    """Map each existing job id to (job status, its book's current stage) in one query."""
+    if not job_ids:
+        return {}
+    placeholders = ", ".join("?" for _ in job_ids)
+    with connection(db_path) as conn:
+        rows = conn.execute(
+            f"""
+            SELECT j.id, j.status, b.current_stage
+            FROM jobs AS j LEFT JOIN books AS b ON b.id = j.book_id
+            WHERE j.id IN ({placeholders})
+            """,
+            tuple(job_ids),
+        ).fetchall()
+    return {row["id"]: (row["status"], row["current_stage"]) for row in rows}
+
+
+def get_active_job_states(db_path: Path) -> dict[str, tuple[str, str | None]]:
+    """get_job_states for every pending or running job."""
+    with connection(db_path) as conn:
+        rows = conn.execute(
+            """
+            SELECT j.id, j.status, b.current_stage
+            FROM jobs AS j LEFT JOIN books AS b ON b.id = j.book_id
+            WHERE j.status IN ('pending', 'running')
+            ORDER BY j.status, j.created_at
+            """
+        ).fetchall()
+    return {row["id"]: (row["status"], row["current_stage"]) for row in rows}
+
+
+def record_stage_timings(
+    db_path: Path,
+    *,
+    book_id: str,
+    ocr_language: str,
+    optimize_mode: str,
+    page_count: int,
+    wall_time_sec: dict[str, float],
+) -> None:
+    """Store how long each stage of a finished book took, per page."""
+    if page_count <= 0 or not wall_time_sec:
+        return
+    now = utc_now_iso()
+    with connection(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO stage_timings (
+                book_id, stage, ocr_language, optimize_mode, page_count, sec_per_page,
+                recorded_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (book_id, stage, ocr_language, optimize_mode, page_count, seconds / page_count, now)
+                for stage, seconds in wall_time_sec.items()
+            ),
+        )
+
+
+def stage_seconds_per_page(
+    db_path: Path,
+    *,
+    ocr_language: str,
+    optimize_mode: str,
+    stages: Sequence[str],
+    recent: int = STAGE_HISTORY_SIZE,
+) -> dict[str, float]:
+    """Average seconds per page of the `recent` latest runs of each stage with these settings.
+
+    Stages without history are left out.
+    """
+    averages: dict[str, float] = {}
+    with connection(db_path) as conn:
+        for stage in stages:
+            row = conn.execute(
+                """
+                SELECT AVG(sec_per_page) AS sec_per_page FROM (
+                    SELECT sec_per_page FROM stage_timings
+                    WHERE ocr_language = ? AND optimize_mode = ? AND stage = ?
+                    ORDER BY recorded_at DESC
+                    LIMIT ?
+                )
+                """,
+                (ocr_language, optimize_mode, stage, recent),
+            ).fetchone()
+            if row["sec_per_page"] is not None:
+                averages[stage] = row["sec_per_page"]
+    return averages
+
+
 def get_latest_job_for_book(db_path: Path, book_id: str) -> Job | None:
     with connection(db_path) as conn:
         row = conn.execute(
-            "SELECT * FROM jobs WHERE book_id = ? ORDER BY created_at DESC LIMIT 1",
+            "SELECT * FROM jobs WHERE book_id = ? ORDER BY created_at DESC, id DESC LIMIT 1",
             (book_id,),
         ).fetchone()
     return Job.from_row(row) if row is not None else None
@@ -298,15 +1066,65 @@ def fetch_pending_jobs(db_path: Path, *, now_iso: str | None = None, limit: int
     return [Job.from_row(row) for row in rows]
 
 
-def claim_next_pending_job(db_path: Path, *, now_iso: str | None = None) -> Job | None:
+_CLAIM_ORDER = {
+    "fair": "queue_key",
+    "sjf": "sjf_key",
+    "fifo": "COALESCE(scheduled_at, created_at), created_at",
+}
+
+
+def claim_next_pending_job(
+    db_path: Path,
+    *,
+    now_iso: str | None = None,
+    owner: str | None = None,
+    lease_sec: float = DEFAULT_LEASE_SEC,
+    policy: str = "fair",
+) -> Job | None:
+    """Lease the next due job to owner, in the order of the given scheduling policy.
+
+    A running job whose lease expired (its worker died or hung) is taken over first and
+    flagged resume, so the pipeline continues from the manifest's last completed stage.
+    """
+    if policy not in SCHEDULING_POLICIES:
+        allowed = ", ".join(SCHEDULING_POLICIES)
+        raise ValueError(f"Unknown scheduling policy '{policy}'. Allowed: {allowed}")
     now_value = now_iso or utc_now_iso()
+    lease_owner = owner or default_lease_owner()
+    expires_at = _lease_expiry(now_value, lease_sec)
     with connection(db_path) as conn:
-        candidate = conn.execute(
+        expired = conn.execute(
             """
             SELECT id FROM jobs
+            WHERE status = 'running'
+              AND (lease_expires_at IS NULL OR lease_expires_at <= ?)
+            ORDER BY lease_expires_at
+            LIMIT 1
+            """,
+            (now_value,),
+        ).fetchone()
+        if expired is not None:
+            stolen = conn.execute(
+                """
+                UPDATE jobs
+                SET lease_owner = ?, lease_expires_at = ?, resume = 1, updated_at = ?
+                WHERE id = ? AND status = 'running'
+                  AND (lease_expires_at IS NULL OR lease_expires_at <= ?)
+                """,
+                (lease_owner, expires_at, now_value, expired["id"], now_value),
+            )
+            if stolen.rowcount == 1:
+                row = conn.execute("SELECT * FROM jobs WHERE id = ?", (expired["id"],)).fetchone()
+                return Job.from_row(row)
+
+        # Keys are never earlier than scheduled_at, so future jobs rarely sit at the
+        # head of the index and the probe stays O(log n).
+        candidate = conn.execute(
+            f"""
+            SELECT id FROM jobs
             WHERE status = 'pending'
               AND (scheduled_at IS NULL OR scheduled_at <= ?)
-            ORDER BY COALESCE(scheduled_at, created_at), created_at
+            ORDER BY {_CLAIM_ORDER[policy]}
             LIMIT 1
             """,
             (now_value,),
@@ -317,10 +1135,11 @@ def claim_next_pending_job(db_path: Path, *, now_iso: str | None = None) -> Job
         updated = conn.execute(
             """
             UPDATE jobs
-            SET status = 'running', started_at = ?, updated_at = ?
+            SET status = 'running', started_at = ?, updated_at = ?,
+                lease_owner = ?, lease_expires_at = ?
             WHERE id = ? AND status = 'pending'
             """,
-            (now_value, now_value, candidate["id"]),
+            (now_value, now_value, lease_owner, expires_at, candidate["id"]),
         )
         if updated.rowcount != 1:
             return None
@@ -329,7 +1148,14 @@ def claim_next_pending_job(db_path: Path, *, now_iso: str | None = None) -> Job
     return Job.from_row(row) if row is not None else None
 
 
-def claim_job_by_id(db_path: Path, job_id: str, *, now_iso: str | None = None) -> Job | None:
+def claim_job_by_id(
+    db_path: Path,
+    job_id: str,
+    *,
+    now_iso: str | None = None,
+    owner: str | None = None,
+    lease_sec: float = DEFAULT_LEASE_SEC,
+) -> Job | None:
     now_value = now_iso or utc_now_iso()
     with connection(db_path) as conn:
         row = conn.execute(
@@ -348,10 +1174,17 @@ def claim_job_by_id(db_path: Path, job_id: str, *, now_iso: str | None = None) -
         updated = conn.execute(
             """
             UPDATE jobs
-            SET status = 'running', started_at = ?, updated_at = ?
+            SET status = 'running', started_at = ?, updated_at = ?,
+                lease_owner = ?, lease_expires_at = ?
             WHERE id = ? AND status = 'pending'
             """,
-            (now_value, now_value, job_id),
+            (
+                now_value,
+                now_value,
+                owner or default_lease_owner(),
+                _lease_expiry(now_value, lease_sec),
+                job_id,
+            ),
         )
         if updated.rowcount != 1:
             return None
@@ -359,20 +1192,111 @@ def claim_job_by_id(db_path: Path, job_id: str, *, now_iso: str | None = None) -
     return Job.from_row(claimed) if claimed is not None else None
 
 
+def heartbeat_job(
+    db_path: Path,
+    job_id: str,
+    owner: str,
+    *,
+    lease_sec: float = DEFAULT_LEASE_SEC,
+    now_iso: str | None = None,
+) -> bool:
+    """Extend owner's lease on a running job; False means the lease was lost."""
+    now_value = now_iso or utc_now_iso()
+    with connection(db_path) as conn:
+        result = conn.execute(
+            """
+            UPDATE jobs
+            SET lease_expires_at = ?, updated_at = ?
+            WHERE id = ? AND status = 'running' AND lease_owner = ?
+            """,
+            (_lease_expiry(now_value, lease_sec), now_value, job_id, owner),
+        )
+    return result.rowcount == 1
+
+
+def requeue_expired_jobs(db_path: Path, *, now_iso: str | None = None) -> int:
+    """Put running jobs whose lease expired back in the queue, flagged to resume."""
+    now_value = now_iso or utc_now_iso()
+    with connection(db_path) as conn:
+        expired_rows = conn.execute(
+            """
+            SELECT id, book_id FROM jobs
+            WHERE status = 'running'
+              AND (lease_expires_at IS NULL OR lease_expires_at <= ?)
+            """,
+            (now_value,),
+        ).fetchall()
+        requeued = 0
+        for row in expired_rows:
+            result = conn.execute(
+                """
+                UPDATE jobs
+                SET status = 'pending', resume = 1, lease_owner = NULL,
+                    lease_expires_at = NULL, updated_at = ?
+                WHERE id = ? AND status = 'running'
+                  AND (lease_expires_at IS NULL OR lease_expires_at <= ?)
+                """,
+                (now_value, row["id"], now_value),
+            )
+            if result.rowcount != 1:
+                continue
+            requeued += 1
+            conn.execute(
+                "UPDATE books SET status = 'pending', updated_at = ? WHERE id = ?",
+                (now_value, row["book_id"]),
+            )
+    if requeued:
+        notify_job_available(db_path)
+    return requeued
+
+
+def next_wakeup_at(db_path: Path, *, now_iso: str | None = None) -> str | None:
+    """Earliest future moment a job becomes claimable: a scheduled_at or a lease expiry.
+
+    Unscheduled jobs were created in the past, so the claim index's
+    COALESCE(scheduled_at, created_at) finds the next scheduled job in one probe.
+    """
+    now_value = now_iso or utc_now_iso()
+    with connection(db_path) as conn:
+        next_scheduled = conn.execute(
+            """
+            SELECT MIN(COALESCE(scheduled_at, created_at)) FROM jobs
+            WHERE status = 'pending' AND COALESCE(scheduled_at, created_at) > ?
+            """,
+            (now_value,),
+        ).fetchone()[0]
+        next_expiry = conn.execute(
+            """
+            SELECT MIN(lease_expires_at) FROM jobs
+            WHERE status = 'running' AND lease_expires_at > ?
+            """,
+            (now_value,),
+        ).fetchone()[0]
+    candidates = [value for value in (next_scheduled, next_expiry) if value]
+    return min(candidates, key=_epoch) if candidates else None
+
+
 def fetch_running_jobs(db_path: Path) -> list[Job]:
     return list_jobs(db_path, status="running")
 
 
-def mark_job_running(db_path: Path, job_id: str) -> None:
+def mark_job_running(
+    db_path: Path,
+    job_id: str,
+    *,
+    owner: str | None = None,
+    lease_sec: float = DEFAULT_LEASE_SEC,
+) -> None:
     now = utc_now_iso()
     with connection(db_path) as conn:
         conn.execute(
             """
             UPDATE jobs
-            SET status = 'running', started_at = ?, updated_at = ?
+            SET status = 'running', started_at = ?, updated_at = ?,
+                lease_owner = ?, lease_expires_at = ?
             WHERE id = ?
             """,
-            (now, now, job_id),
+            (now, now, owner or default_lease_owner(), _lease_expiry(now, lease_sec), job_id),
         )
 
 
@@ -395,30 +1319,35 @@ def cancel_job(db_path: Path, job_id: str) -> bool:
     return result.rowcount == 1
 
 
-def mark_job_done(db_path: Path, job_id: str) -> None:
+def _finish_job(
+    db_path: Path, job_id: str, status: str, error_message: str | None, owner: str | None
+) -> bool:
     now = utc_now_iso()
+    # With an owner, a worker whose lease was taken over cannot overwrite the new run.
+    owner_clause = "" if owner is None else " AND lease_owner = ?"
     with connection(db_path) as conn:
-        conn.execute(
-            """
+        result = conn.execute(
+            f"""
             UPDATE jobs
-            SET status = 'done', finished_at = ?, error_message = NULL, updated_at = ?
-            WHERE id = ?
+            SET status = ?, finished_at = ?, error_message = ?, updated_at = ?,
+                lease_owner = NULL, lease_expires_at = NULL
+            WHERE id = ? AND status != 'cancelled'{owner_clause}
             """,
-            (now, now, job_id),
+            (status, now, error_message, now, job_id, *(() if owner is None else (owner,))),
         )
+    return result.rowcount == 1
 
 
-def mark_job_failed(db_path: Path, job_id: str, error_message: str) -> None:
-    now = utc_now_iso()
-    with connection(db_path) as conn:
-        conn.execute(
-            """
-            UPDATE jobs
-            SET status = 'failed', finished_at = ?, error_message = ?, updated_at = ?
-            WHERE id = ?
-            """,
-            (now, error_message, now, job_id),
-        )
+def mark_job_done(db_path: Path, job_id: str, *, owner: str | None = None) -> bool:
+    """Mark a job done unless it was cancelled meanwhile; return whether the row changed."""
+    return _finish_job(db_path, job_id, "done", None, owner)
+
+
+def mark_job_failed(
+    db_path: Path, job_id: str, error_message: str, *, owner: str | None = None
+) -> bool:
+    """Mark a job failed unless it was cancelled meanwhile; return whether the row changed."""
+    return _finish_job(db_path, job_id, "failed", error_message, owner)
 
 
 def mark_running_jobs_failed(db_path: Path, message: str) -> int:
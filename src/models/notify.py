@@ -0,0 +1,150 @@
+"""Wake idle workers as soon as a job becomes claimable, instead of on the next poll.
+
+Waiters in the same process block on a condition variable. Every process that waits
+also binds a Unix datagram socket in a private directory shared by this user's
+processes of the same database; notify() pokes the local condition and sends one byte
+to each of those sockets, whose listener thread then pokes the condition in that
+process. Where Unix sockets are unavailable, or the directory cannot be trusted,
+workers fall back to their poll interval.
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import os
+from pathlib import Path
+import socket
+import stat
+import tempfile
+import threading
+from uuid import uuid4
+
+
+def _channel_dir(db_path: Path) -> Path:
+    # Socket paths are limited to ~100 bytes, so the directory is keyed by a digest.
+    digest = hashlib.sha1(str(Path(db_path).resolve()).encode()).hexdigest()[:16]
+    # The per-user runtime directory is not writable by others; /tmp is, so a
+    # directory found there is only used once _is_private_dir() vouches for it.
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    base = runtime_dir if runtime_dir and os.path.isdir(runtime_dir) else tempfile.gettempdir()
+    return Path(base) / f"ebookgen-notify-{digest}"
+
+
+def _is_private_dir(path: Path) -> bool:
+    """True if path is a real directory (not a symlink) owned by us with mode 0o700."""
+    try:
+        info = os.lstat(path)
+    except OSError:
+        return False
+    if not stat.S_ISDIR(info.st_mode) or stat.S_IMODE(info.st_mode) != 0o700:
+        return False
+    return not hasattr(os, "getuid") or info.st_uid == os.getuid()
+
+
+class JobNotifier:
+    """Per-database wake-up channel shared by the workers of one process."""
+
+    def __init__(self, db_path: Path) -> None:
+        self._channel_dir = _channel_dir(db_path)
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._socket: socket.socket | None = None
+        self._socket_path: Path | None = None
+
+    @property
+    def generation(self) -> int:
+        """Counter bumped by every wake-up; read it before looking for work."""
+        with self._condition:
+            return self._generation
+
+    def wake(self) -> None:
+        """Wake this process's waiters only."""
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+
+    def notify(self) -> None:
+        """Wake waiters in this process and in every other process using the database."""
+        self.wake()
+        if not hasattr(socket, "AF_UNIX") or not _is_private_dir(self._channel_dir):
+            return
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sender:
+            sender.setblocking(False)
+            for path in self._channel_dir.glob("*.sock"):
+                if path == self._socket_path:
+                    continue
+                try:
+                    sender.sendto(b"\x01", str(path))
+                except BlockingIOError:
+                    pass  # The receiver already has wake-ups queued.
+                except (ConnectionRefusedError, FileNotFoundError):
+                    path.unlink(missing_ok=True)  # Left behind by a dead process.
+                except OSError:
+                    pass
+
+    def wait(self, since: int, timeout: float | None) -> bool:
+        """Block until a wake-up newer than `since` or the timeout; True if woken."""
+        self._listen()
+        with self._condition:
+            return self._condition.wait_for(lambda: self._generation != since, timeout)
+
+    def _listen(self) -> None:
+        with self._condition:
+            if self._socket is not None or not hasattr(socket, "AF_UNIX"):
+                return
+            try:
+                self._channel_dir.mkdir(mode=0o700, exist_ok=True)
+                if not _is_private_dir(self._channel_dir):
+                    # Created first by someone else (or through a symlink): polling only.
+                    return
+                path = self._channel_dir / f"{os.getpid()}-{uuid4().hex[:8]}.sock"
+                listener = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                listener.bind(str(path))
+            except OSError:
+                return
+            self._socket = listener
+            self._socket_path = path
+        atexit.register(self._close)
+        threading.Thread(target=self._relay, name="job-notify", daemon=True).start()
+
+    def _close(self) -> None:
+        if self._socket_path is None:
+            return
+        self._socket_path.unlink(missing_ok=True)
+        try:
+            self._channel_dir.rmdir()
+        except OSError:
+            pass  # Other processes are still listening.
+
+    def _relay(self) -> None:
+        assert self._socket is not None
+        while True:
+            try:
+                self._socket.recv(64)
+            except OSError:
+                return
+            self.wake()
+
+
+_notifiers: dict[str, JobNotifier] = {}
+_notifiers_lock = threading.Lock()
+_notifiers_pid = os.getpid()
+
+
+def job_notifier(db_path: Path) -> JobNotifier:
+    global _notifiers_pid
+    key = str(Path(db_path).resolve())
+    with _notifiers_lock:
+        if _notifiers_pid != os.getpid():
+            # A forked child has no listener thread; start over with its own sockets.
+            _notifiers.clear()
+            _notifiers_pid = os.getpid()
+        notifier = _notifiers.get(key)
+        if notifier is None:
+            notifier = _notifiers[key] = JobNotifier(db_path)
+        return notifier
+
+
+def notify_job_available(db_path: Path) -> None:
+    job_notifier(db_path).notify()
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from pathlib import Path
 import sqlite3
 
 
@@ -53,6 +54,13 @@ class Job:
     resume: bool
     created_at: str
     updated_at: str
+    lease_owner: str | None = None
+    lease_expires_at: str | None = None
+    priority: int = 0
+    fair_key: str = ""
+    page_count: int | None = None
+    queue_key: float | None = None
+    sjf_key: float | None = None
 
     @classmethod
     def from_row(cls, row: sqlite3.Row) -> "Job":
@@ -67,5 +75,26 @@ class Job:
             resume=bool(row["resume"]),
             created_at=row["created_at"],
             updated_at=row["updated_at"],
+            lease_owner=row["lease_owner"],
+            lease_expires_at=row["lease_expires_at"],
+            priority=row["priority"],
+            fair_key=row["fair_key"],
+            page_count=row["page_count"],
+            queue_key=row["queue_key"],
+            sjf_key=row["sjf_key"],
         )
 
+
+
+@dataclass(frozen=True)
+class BookSpec:
+    """Settings for a book that does not exist yet (bulk creation input)."""
+
+    source_path: Path
+    title: str | None = None
+    ocr_language: str = "kor+eng"
+    optimize_mode: str = "basic"
+    error_policy: str = "skip"
+    front_cover: int | None = None
+    back_cover: int | None = None
+    page_count: int | None = None
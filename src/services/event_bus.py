@@ -0,0 +1,304 @@
+"""In-process pub/sub for job progress, from worker threads to asyncio subscribers."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Callable
+
+from core.pipeline_types import STAGE_NAMES
+
+TERMINAL_STATUSES = frozenset({"done", "failed", "cancelled"})
+DEFAULT_MAX_RETAINED = 1000
+DEFAULT_POLL_INTERVAL_SEC = 0.5
+
+JobState = dict[str, Any]
+# job_ids -> {job_id: (status, current_stage)}; jobs that no longer exist are left out.
+StateFetcher = Callable[[list[str]], dict[str, tuple[str, str | None]]]
+# () -> the same mapping for every pending or running job.
+ActiveStateFetcher = Callable[[], dict[str, tuple[str, str | None]]]
+
+
+def _enter_stage(state: JobState, stage: str, started_at: float | None) -> None:
+    if state.get("stage") != stage:
+        state.update(stage=stage, done=None, total=None, stage_started_at=started_at)
+    elif state.get("stage_started_at") is None:
+        state["stage_started_at"] = started_at
+
+
+def _apply_event(state: JobState, event: dict[str, Any]) -> bool:
+    """Fold a job or manifest event into state; return True if anything changed."""
+    before = dict(state)
+    event_type = event.get("type")
+    if event_type == "job":
+        # A finished job never runs again (retries are new jobs), so a stale poll
+        # result arriving after completion must not resurrect it.
+        if state.get("status") not in TERMINAL_STATUSES:
+            state["status"] = event["status"]
+        if event.get("stage"):
+            # Pollers only see the stage, not when it started.
+            _enter_stage(state, event["stage"], None)
+        for name in ("page_count", "sec_per_page"):
+            if name in event:
+                state[name] = event[name]
+    elif event_type == "stage":
+        if event["stage"] in STAGE_NAMES and event["status"] == "running":
+            _enter_stage(state, event["stage"], event.get("ts") or time.time())
+    elif event_type == "progress":
+        _enter_stage(state, event["stage"], event.get("ts") or time.time())
+        state["done"] = event["done"]
+        state["total"] = event["total"]
+    return state != before
+
+
+class Subscription:
+    """Job states pushed by the bus, read from one event loop.
+
+    States are conflated per job: a subscriber that falls behind skips a job's
+    intermediate states but always gets its latest one, and never holds more than one
+    pending state per job.
+    """
+
+    def __init__(self, bus: EventBus, job_id: str | None, loop: asyncio.AbstractEventLoop) -> None:
+        self.bus = bus
+        self.job_id = job_id
+        self._loop = loop
+        self._pending: OrderedDict[str, JobState] = OrderedDict()
+        self._ready = asyncio.Event()
+
+    async def get(self) -> JobState:
+        while not self._pending:
+            self._ready.clear()
+            await self._ready.wait()
+        return self._pending.popitem(last=False)[1]
+
+    def drain(self) -> list[JobState]:
+        """Return and clear every state already pushed, without waiting."""
+        states = list(self._pending.values())
+        self._pending.clear()
+        return states
+
+    def close(self) -> None:
+        self.bus._unsubscribe(self)
+
+    def __enter__(self) -> Subscription:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _push(self, state: JobState) -> None:
+        try:
+            self._loop.call_soon_threadsafe(self._offer, state)
+        except RuntimeError:
+            self.close()  # The subscriber's loop is gone.
+
+    def _offer(self, state: JobState) -> None:
+        self._pending.pop(state["job_id"], None)
+        self._pending[state["job_id"]] = state
+        self._ready.set()
+
+
+class EventBus:
+    """Latest state per job plus fan-out of every change to subscribers.
+
+    publish() may be called from any thread. Events from this process's worker are
+    published with local=True; while such a job runs, events from pollers are ignored
+    because the worker's own events are newer than anything in the database.
+    """
+
+    def __init__(self, max_retained: int = DEFAULT_MAX_RETAINED) -> None:
+        self._lock = threading.Lock()
+        self._states: OrderedDict[str, JobState] = OrderedDict()
+        self._local: set[str] = set()
+        self._subscribers: dict[str | None, set[Subscription]] = {}
+        self._max_retained = max_retained
+        self._seq = 0
+        self._evicted_seq = 0
+
+    def publish(self, job_id: str, event: dict[str, Any], *, local: bool = True) -> bool:
+        """Apply event to the job's state and push the new state; False if unchanged."""
+        with self._lock:
+            if not local and job_id in self._local:
+                return False
+            state = self._states.get(job_id)
+            if state is None:
+                state = {"job_id": job_id, "status": "pending", "stage": None}
+                self._states[job_id] = state
+            changed = _apply_event(state, event)
+            if local:
+                if state["status"] in TERMINAL_STATUSES:
+                    self._local.discard(job_id)
+                else:
+                    self._local.add(job_id)
+            if not changed:
+                return False
+            self._seq += 1
+            state["seq"] = self._seq
+            snapshot = dict(state)
+            self._states.move_to_end(job_id)
+            self._evict()
+            subscribers = [
+                *self._subscribers.get(job_id, ()),
+                *self._subscribers.get(None, ()),
+            ]
+        for subscription in subscribers:
+            subscription._push(snapshot)
+        return True
+
+    @property
+    def seq(self) -> int:
+        """Sequence number of the latest change; states carry the seq of their change."""
+        with self._lock:
+            return self._seq
+
+    def can_resume(self, seq: int) -> bool:
+        """True if states(since_seq=seq) holds every change made after seq."""
+        with self._lock:
+            return self._evicted_seq <= seq <= self._seq
+
+    def states(
+        self, *, since_seq: int | None = None, active_only: bool = False
+    ) -> list[JobState]:
+        """Retained job states in change order, optionally only those changed after since_seq."""
+        with self._lock:
+            return [
+                dict(state)
+                for state in self._states.values()
+                if (since_seq is None or state.get("seq", 0) > since_seq)
+                and not (active_only and state["status"] in TERMINAL_STATUSES)
+            ]
+
+    def polled_active_jobs(self) -> list[str]:
+        """Unfinished jobs whose state comes from pollers rather than a local worker."""
+        with self._lock:
+            return [
+                job_id
+                for job_id, state in self._states.items()
+                if job_id not in self._local and state["status"] not in TERMINAL_STATUSES
+            ]
+
+    def release(self, job_id: str) -> None:
+        """Stop treating job_id as run by this process, so pollers update it again."""
+        with self._lock:
+            self._local.discard(job_id)
+
+    def state(self, job_id: str) -> JobState | None:
+        with self._lock:
+            state = self._states.get(job_id)
+            return dict(state) if state is not None else None
+
+    def is_local(self, job_id: str) -> bool:
+        with self._lock:
+            return job_id in self._local
+
+    def subscribe(self, job_id: str | None = None) -> Subscription:
+        """Subscribe the running event loop to one job, or to every job with None."""
+        subscription = Subscription(self, job_id, asyncio.get_running_loop())
+        with self._lock:
+            self._subscribers.setdefault(job_id, set()).add(subscription)
+        return subscription
+
+    def _unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.job_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.job_id]
+
+    def _evict(self) -> None:
+        excess = len(self._states) - self._max_retained
+        if excess <= 0:
+            return
+        for job_id in list(self._states):
+            if excess <= 0:
+                return
+            if job_id in self._local or job_id in self._subscribers:
+                continue
+            evicted = self._states.pop(job_id)
+            self._evicted_seq = max(self._evicted_seq, evicted.get("seq", 0))
+            excess -= 1
+
+
+class JobStatePoller:
+    """One asyncio task that polls the database for watched jobs no local worker runs.
+
+    Jobs run by other processes (or not started yet) only change in the database; all
+    subscribers share this poller, which checks every watched job with one query.
+    Dashboards watch all active jobs instead, which adds one query for every pending
+    or running job.
+    """
+
+    def __init__(
+        self,
+        bus: EventBus,
+        fetch: StateFetcher,
+        interval_sec: float = DEFAULT_POLL_INTERVAL_SEC,
+        fetch_active: ActiveStateFetcher | None = None,
+    ) -> None:
+        self.bus = bus
+        self._fetch = fetch
+        self._fetch_active = fetch_active
+        self._interval_sec = interval_sec
+        self._watched: dict[str, int] = {}
+        self._active_watchers = 0
+        self._task: asyncio.Task[None] | None = None
+
+    def watch(self, job_id: str) -> None:
+        """Start polling job_id (reference counted); call from the event loop."""
+        self._watched[job_id] = self._watched.get(job_id, 0) + 1
+        self._ensure_task()
+
+    def unwatch(self, job_id: str) -> None:
+        count = self._watched.get(job_id, 0) - 1
+        if count > 0:
+            self._watched[job_id] = count
+        else:
+            self._watched.pop(job_id, None)
+
+    def watch_active(self) -> None:
+        """Start polling every pending or running job (reference counted)."""
+        self._active_watchers += 1
+        self._ensure_task()
+
+    def unwatch_active(self) -> None:
+        self._active_watchers = max(0, self._active_watchers - 1)
+
+    def _ensure_task(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or self._task.get_loop() is not loop:
+            self._task = loop.create_task(self._run())
+
+    def _collect(
+        self, job_ids: list[str], include_active: bool
+    ) -> dict[str, tuple[str, str | None]]:
+        states = self._fetch_active() if include_active and self._fetch_active else {}
+        missing = [job_id for job_id in job_ids if job_id not in states]
+        if missing:
+            states.update(self._fetch(missing))
+        return states
+
+    async def poll_once(self) -> None:
+        include_active = self._active_watchers > 0
+        job_ids = set(self._watched)
+        if include_active:
+            # Jobs that left the active set since the last poll still need their outcome.
+            job_ids.update(self.bus.polled_active_jobs())
+        job_ids = {job_id for job_id in job_ids if not self.bus.is_local(job_id)}
+        if not job_ids and not include_active:
+            return
+        states = await asyncio.to_thread(self._collect, sorted(job_ids), include_active)
+        for job_id, (status, stage) in states.items():
+            self.bus.publish(job_id, {"type": "job", "status": status, "stage": stage}, local=False)
+
+    async def _run(self) -> None:
+        while self._watched or self._active_watchers:
+            try:
+                await self.poll_once()
+            except Exception:
+                pass  # e.g. a locked database; subscribers still get the next poll.
+            await asyncio.sleep(self._interval_sec)
@@ -0,0 +1,103 @@
+"""Page-level progress and ETA for a job from its stage, page counters and history."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any, Mapping
+
+from core.pipeline_types import STAGE_NAMES
+
+# Seconds per page used until a language/optimize combination has recorded history.
+DEFAULT_SEC_PER_PAGE = {
+    "validate": 0.01,
+    "assemble": 0.05,
+    "ocr": 2.0,
+    "optimize": 0.3,
+    "finalize": 0.02,
+}
+# A stage without page counters is never shown as finished before it is.
+_MAX_TIME_FRACTION = 0.95
+
+
+@dataclass(frozen=True)
+class ProgressEstimate:
+    """How far a job is: pages within the current stage, overall percent and ETA."""
+
+    stage: str | None
+    pages_done: int | None
+    pages_total: int | None
+    percent: float
+    eta_sec: float | None
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+
+def estimate_progress(
+    *,
+    status: str,
+    stage: str | None,
+    pages_done: int | None = None,
+    pages_total: int | None = None,
+    page_count: int | None = None,
+    stage_started_at: float | None = None,
+    now: float | None = None,
+    sec_per_page: Mapping[str, float] | None = None,
+) -> ProgressEstimate:
+    """Estimate a job's progress.
+
+    Stages are weighted by their expected duration (historical seconds per page,
+    DEFAULT_SEC_PER_PAGE otherwise), so the hour of OCR is most of the bar. Within the
+    current stage the page counters give the fraction done and the observed throughput
+    gives its remaining time; stages that do not count pages fall back to elapsed time
+    against their expected duration. The ETA needs the book's page count.
+    """
+    rates = {**DEFAULT_SEC_PER_PAGE, **(sec_per_page or {})}
+    pages = page_count or pages_total
+    if status == "done":
+        return ProgressEstimate(stage, pages_done, pages_total, 100.0, 0.0)
+
+    # Weights use one page when the size is unknown; only their ratios matter.
+    expected = {name: rates[name] * (pages or 1) for name in STAGE_NAMES}
+    index = STAGE_NAMES.index(stage) if stage in STAGE_NAMES else 0
+    current = STAGE_NAMES[index]
+    elapsed = None
+    if now is not None and stage_started_at is not None:
+        elapsed = max(0.0, now - stage_started_at)
+
+    fraction = 0.0
+    current_remaining = expected[current]
+    if status == "running":
+        if pages_done is not None and pages_total:
+            fraction = min(1.0, pages_done / pages_total)
+            if pages_done and elapsed:
+                current_remaining = (pages_total - pages_done) * elapsed / pages_done
+            else:
+                current_remaining = expected[current] * (1.0 - fraction)
+        elif elapsed is not None and expected[current] > 0:
+            fraction = min(_MAX_TIME_FRACTION, elapsed / expected[current])
+            current_remaining = max(0.0, expected[current] - elapsed)
+
+    before = sum(expected[name] for name in STAGE_NAMES[:index])
+    after = sum(expected[name] for name in STAGE_NAMES[index + 1 :])
+    total = before + expected[current] + after
+    percent = 100.0 * (before + expected[current] * fraction) / total if total else 0.0
+
+    eta_sec = None
+    if pages and status in {"pending", "running"}:
+        eta_sec = round(current_remaining + after, 1)
+    return ProgressEstimate(stage, pages_done, pages_total, round(percent, 1), eta_sec)
+
+
+def estimate_from_state(state: Mapping[str, Any], now: float) -> ProgressEstimate:
+    """estimate_progress for an event-bus job state."""
+    return estimate_progress(
+        status=state["status"],
+        stage=state.get("stage"),
+        pages_done=state.get("done"),
+        pages_total=state.get("total"),
+        page_count=state.get("page_count"),
+        stage_started_at=state.get("stage_started_at"),
+        now=now,
+        sec_per_page=state.get("sec_per_page"),
+    )
@@ -1,5 +1,6 @@
 """Worker package for ebookgen."""
 
 from worker.loop import WorkerLoop
+from worker.pool import WorkerPool
 
-__all__ = ["WorkerLoop"]
+__all__ = ["WorkerLoop", "WorkerPool"]
@@ -0,0 +1,113 @@
+"""Bounded in-process executor for jobs the API is asked to run right away."""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass, field
+import threading
+
+from worker.loop import WorkerLoop
+
+DEFAULT_JOB_CONCURRENCY = 2
+DEFAULT_JOB_BACKLOG = 50
+
+
+class ExecutorFullError(RuntimeError):
+    """Raised when the executor's backlog limit is reached."""
+
+
+@dataclass
+class JobExecutor:
+    """Run submitted jobs on at most `concurrency` threads, queueing up to `max_backlog`.
+
+    Each job still runs through WorkerLoop.process_job, so a job that another worker
+    claimed (or that was cancelled) while it waited here is skipped.
+    """
+
+    worker: WorkerLoop
+    concurrency: int = DEFAULT_JOB_CONCURRENCY
+    max_backlog: int = DEFAULT_JOB_BACKLOG
+    _queue: deque[str] = field(default_factory=deque, init=False, repr=False)
+    _running: set[str] = field(default_factory=set, init=False, repr=False)
+    _threads: list[threading.Thread] = field(default_factory=list, init=False, repr=False)
+    _condition: threading.Condition = field(
+        default_factory=threading.Condition, init=False, repr=False
+    )
+
+    def __post_init__(self) -> None:
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        if self.max_backlog < 0:
+            raise ValueError("max_backlog must not be negative.")
+
+    @property
+    def backlog(self) -> int:
+        with self._condition:
+            return len(self._queue)
+
+    @property
+    def full(self) -> bool:
+        """True if submit() would raise ExecutorFullError for a new job."""
+        with self._condition:
+            return not self._idle_slots() and len(self._queue) >= self.max_backlog
+
+    def _idle_slots(self) -> int:
+        return max(0, self.concurrency - len(self._running) - len(self._queue))
+
+    def position(self, job_id: str) -> int | None:
+        """0 while the job runs, n if n - 1 jobs wait ahead of it, None if unknown here."""
+        with self._condition:
+            if job_id in self._running:
+                return 0
+            try:
+                index = self._queue.index(job_id)
+            except ValueError:
+                return None
+            # The first jobs in line are already being picked up by free threads.
+            return max(0, index + 1 - (self.concurrency - len(self._running)))
+
+    def submit(self, job_id: str) -> int:
+        """Queue job_id and return its position (see position())."""
+        with self._condition:
+            current = self.position(job_id)
+            if current is not None:
+                return current
+            if not self._idle_slots() and len(self._queue) >= self.max_backlog:
+                raise ExecutorFullError(
+                    f"Job backlog is full ({self.max_backlog} jobs waiting)."
+                )
+            self._queue.append(job_id)
+            self._ensure_threads()
+            self._condition.notify()
+            return self.position(job_id)
+
+    def discard(self, job_id: str) -> bool:
+        """Drop a job that has not started yet; True if it was waiting here."""
+        with self._condition:
+            try:
+                self._queue.remove(job_id)
+            except ValueError:
+                return False
+            return True
+
+    def _ensure_threads(self) -> None:
+        # A thread killed by an unexpected error is replaced on the next submit.
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < self.concurrency:
+            thread = threading.Thread(
+                target=self._run, name=f"api-job-{len(self._threads)}", daemon=True
+            )
+            self._threads.append(thread)
+            thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: bool(self._queue))
+                job_id = self._queue.popleft()
+                self._running.add(job_id)
+            try:
+                self.worker.process_job(job_id)
+            finally:
+                with self._condition:
+                    self._running.discard(job_id)
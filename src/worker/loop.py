@@ -2,46 +2,110 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-import time
-from typing import Callable
+import threading
+from typing import Any, Callable
+from uuid import uuid4
 
-from core.manifest import read_current_stage
+from core.cancellation import DEFAULT_POLL_INTERVAL_SEC, CancellationToken
+from core.errors import PipelineCancelledError
+from core.manifest import read_current_stage, read_manifest_state
 from core.pipeline import run_pipeline
-from core.pipeline_types import PipelineSettings
+from core.pipeline_types import STAGE_NAMES, PipelineSettings
 from models.database import (
+    DEFAULT_LEASE_SEC,
+    cancel_job,
     claim_job_by_id,
     claim_next_pending_job,
+    default_lease_owner,
     get_job,
     get_book,
+    heartbeat_job,
     init_db,
     mark_job_done,
     mark_job_failed,
-    mark_running_jobs_failed,
+    next_wakeup_at,
+    record_stage_timings,
+    requeue_expired_jobs,
+    stage_seconds_per_page,
     update_book_status,
 )
-from models.schemas import Job
+from models.notify import JobNotifier, job_notifier
+from models.schemas import Book, Job
+from services.event_bus import TERMINAL_STATUSES, EventBus
 
 PipelineRunner = Callable[..., object]
 
 
+def _new_worker_id() -> str:
+    return f"{default_lease_owner()}:{uuid4().hex[:6]}"
+
+
 @dataclass
 class WorkerLoop:
     db_path: Path
     workspace_books_dir: Path
-    poll_interval_sec: float = 5.0
+    # Idle workers are woken when jobs are created and when scheduled jobs fall due;
+    # polling only catches changes made behind the notifier's back.
+    poll_interval_sec: float = 30.0
     pipeline_runner: PipelineRunner = run_pipeline
+    ingest_mode: str = "copy"
+    profile: bool = False
+    execution_mode: str = "batch"
+    scratch_root: Path | None = None
+    cancel_poll_interval_sec: float = DEFAULT_POLL_INTERVAL_SEC
+    # Jobs are leased to worker_id and renewed every lease_sec / 3 while they run.
+    worker_id: str = field(default_factory=_new_worker_id)
+    lease_sec: float = DEFAULT_LEASE_SEC
+    scheduling_policy: str = "fair"
+    ocr_jobs: int | None = None
+    # Receives job status changes and every manifest event of the jobs run here.
+    event_bus: EventBus | None = None
+    _cancel_tokens: dict[str, CancellationToken] = field(
+        default_factory=dict, init=False, repr=False
+    )
 
     def initialize(self) -> None:
         init_db(self.db_path)
 
-    def recover_interrupted(self, message: str = "Interrupted - abnormal termination") -> int:
-        return mark_running_jobs_failed(self.db_path, message)
+    @property
+    def notifier(self) -> JobNotifier:
+        return job_notifier(self.db_path)
+
+    def wake(self) -> None:
+        """Interrupt wait_for_work in this process, e.g. to stop the loop."""
+        self.notifier.wake()
+
+    def wait_for_work(self, since: int, now_iso: str | None = None) -> bool:
+        """Sleep until a job is queued, the next scheduled job or lease falls due, or
+        the poll interval passes. `since` is notifier.generation read before the last
+        claim, so a job queued in between is not missed. Returns True if woken early.
+        """
+        now = datetime.fromisoformat(now_iso) if now_iso else datetime.now(timezone.utc)
+        timeout = self.poll_interval_sec
+        due_at = next_wakeup_at(self.db_path, now_iso=now.isoformat())
+        if due_at is not None:
+            until_due = (datetime.fromisoformat(due_at) - now).total_seconds()
+            timeout = min(timeout, max(0.0, until_due))
+        return self.notifier.wait(since, timeout)
+
+    def recover_interrupted(self, now_iso: str | None = None) -> int:
+        """Requeue running jobs whose lease expired so they resume from their manifest.
+
+        Jobs still leased by a live worker (in this or another process) are left alone.
+        """
+        return requeue_expired_jobs(self.db_path, now_iso=now_iso)
 
     def process_once(self, now_iso: str | None = None) -> bool:
-        claimed_job = claim_next_pending_job(self.db_path, now_iso=now_iso)
+        claimed_job = claim_next_pending_job(
+            self.db_path,
+            now_iso=now_iso,
+            owner=self.worker_id,
+            lease_sec=self.lease_sec,
+            policy=self.scheduling_policy,
+        )
         if claimed_job is None:
             return False
 
@@ -52,19 +116,122 @@ class WorkerLoop:
         # Keep visibility of missing jobs explicit while still claiming atomically.
         if get_job(self.db_path, job_id) is None:
             return False
-        claimed_job = claim_job_by_id(self.db_path, job_id)
+        claimed_job = claim_job_by_id(
+            self.db_path, job_id, owner=self.worker_id, lease_sec=self.lease_sec
+        )
         if claimed_job is None:
             return False
         self._execute_job(claimed_job)
         return True
 
+    def request_cancel(self, job_id: str) -> bool:
+        """Cancel a job in the DB and signal its pipeline if this worker is running it."""
+        cancelled = cancel_job(self.db_path, job_id)
+        token = self._cancel_tokens.get(job_id)
+        if cancelled and token is not None:
+            token.cancel()
+        return cancelled
+
+    def _job_cancelled(self, job_id: str) -> bool:
+        # Cancellations made by another process only show up in the DB.
+        job = get_job(self.db_path, job_id)
+        return job is not None and job.status == "cancelled"
+
+    def _start_heartbeat(self, job_id: str) -> tuple[threading.Event, threading.Event]:
+        """Renew the job's lease in the background; returns (stop, lease_lost) events."""
+        stop = threading.Event()
+        lease_lost = threading.Event()
+
+        def renew() -> None:
+            while not stop.wait(self.lease_sec / 3):
+                renewed = heartbeat_job(
+                    self.db_path, job_id, self.worker_id, lease_sec=self.lease_sec
+                )
+                if not renewed:
+                    lease_lost.set()
+                    return
+
+        threading.Thread(target=renew, name=f"lease-{job_id}", daemon=True).start()
+        return stop, lease_lost
+
+    def _publish(self, job_id: str, event: dict[str, Any]) -> None:
+        if self.event_bus is not None:
+            self.event_bus.publish(job_id, event)
+
+    def _publish_outcome(self, job_id: str) -> None:
+        if self.event_bus is None:
+            return
+        job = get_job(self.db_path, job_id)
+        if job is None:
+            self.event_bus.release(job_id)
+            return
+        book = get_book(self.db_path, job.book_id)
+        stage = book.current_stage if book is not None else None
+        if job.status in TERMINAL_STATUSES:
+            self.event_bus.publish(job_id, {"type": "job", "status": job.status, "stage": stage})
+        else:
+            # Another worker took the job over; the database is the source of truth again.
+            self.event_bus.release(job_id)
+
+    def _stage_history(self, book: Book) -> dict[str, float]:
+        return stage_seconds_per_page(
+            self.db_path,
+            ocr_language=book.ocr_language,
+            optimize_mode=book.optimize_mode,
+            stages=STAGE_NAMES,
+        )
+
+    def _record_stage_timings(self, book: Book, job: Job) -> None:
+        """Feed the finished run's stage durations into future progress ETAs."""
+        manifest_path = Path(book.book_dir) / "manifest.json"
+        if not job.page_count or not manifest_path.exists():
+            return
+        metrics = read_manifest_state(manifest_path).get("metrics", {})
+        wall_time_sec = {
+            stage: metrics[stage]["wall_time_sec"]
+            for stage in STAGE_NAMES
+            if metrics.get(stage, {}).get("wall_time_sec") is not None
+        }
+        record_stage_timings(
+            self.db_path,
+            book_id=book.id,
+            ocr_language=book.ocr_language,
+            optimize_mode=book.optimize_mode,
+            page_count=job.page_count,
+            wall_time_sec=wall_time_sec,
+        )
+
+    def _settle_unrecorded(self, book: Book, job_id: str) -> None:
+        # The outcome was not recorded: the job was cancelled, or its lease was taken
+        # over by another worker, which now owns the book's status.
+        if self._job_cancelled(job_id):
+            self._mark_book_cancelled(book)
+
+    def _mark_book_cancelled(self, book: Book) -> None:
+        manifest_path = Path(book.book_dir) / "manifest.json"
+        current_stage = read_current_stage(manifest_path) if manifest_path.exists() else None
+        update_book_status(self.db_path, book.id, status="cancelled", current_stage=current_stage)
+
     def _execute_job(self, job: Job) -> None:
         book = get_book(self.db_path, job.book_id)
         if book is None:
-            mark_job_failed(self.db_path, job.id, f"Book not found: {job.book_id}")
+            mark_job_failed(
+                self.db_path, job.id, f"Book not found: {job.book_id}", owner=self.worker_id
+            )
             return
 
         update_book_status(self.db_path, book.id, status="running")
+        if self.event_bus is not None:
+            self._publish(
+                job.id,
+                {
+                    "type": "job",
+                    "status": "running",
+                    "stage": book.current_stage,
+                    "page_count": job.page_count,
+                    "sec_per_page": self._stage_history(book),
+                },
+            )
 
         settings = PipelineSettings(
             language=book.ocr_language,
@@ -72,8 +239,18 @@ class WorkerLoop:
             error_policy=book.error_policy,
             front_cover=book.front_cover,
             back_cover=book.back_cover,
+            ingest_mode=self.ingest_mode,
+            profile=self.profile,
+            execution_mode=self.execution_mode,
+            ocr_jobs=self.ocr_jobs,
         )
 
+        stop_heartbeat, lease_lost = self._start_heartbeat(job.id)
+        cancel_token = CancellationToken(
+            check=lambda: lease_lost.is_set() or self._job_cancelled(job.id),
+            poll_interval_sec=self.cancel_poll_interval_sec,
+        )
+        self._cancel_tokens[job.id] = cancel_token
         try:
             self.pipeline_runner(
                 input_dir=Path(book.source_path),
@@ -81,14 +258,28 @@ class WorkerLoop:
                 settings=settings,
                 book_id=book.id,
                 resume=job.resume,
+                cancel_token=cancel_token,
+                scratch_root=self.scratch_root,
+                on_event=(lambda event: self._publish(job.id, event)) if self.event_bus else None,
             )
-            mark_job_done(self.db_path, job.id)
-            update_book_status(self.db_path, book.id, status="done", current_stage="finalize")
+            if mark_job_done(self.db_path, job.id, owner=self.worker_id):
+                update_book_status(self.db_path, book.id, status="done", current_stage="finalize")
+                self._record_stage_timings(book, job)
+            else:
+                self._settle_unrecorded(book, job.id)
+        except PipelineCancelledError:
+            self._settle_unrecorded(book, job.id)
         except Exception as error:
-            mark_job_failed(self.db_path, job.id, str(error))
+            if not mark_job_failed(self.db_path, job.id, str(error), owner=self.worker_id):
+                self._settle_unrecorded(book, job.id)
+                return
             manifest_path = Path(book.book_dir) / "manifest.json"
             current_stage = read_current_stage(manifest_path) if manifest_path.exists() else None
             update_book_status(self.db_path, book.id, status="failed", current_stage=current_stage)
+        finally:
+            stop_heartbeat.set()
+            self._cancel_tokens.pop(job.id, None)
+            self._publish_outcome(job.id)
 
     def run(self, max_iterations: int | None = None) -> None:
         self.initialize()
@@ -96,7 +287,8 @@ class WorkerLoop:
         while True:
             if max_iterations is not None and iterations >= max_iterations:
                 return
+            since = self.notifier.generation
             processed = self.process_once(now_iso=datetime.now(timezone.utc).isoformat())
             if not processed:
-                time.sleep(self.poll_interval_sec)
+                self.wait_for_work(since)
             iterations += 1
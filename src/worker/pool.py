@@ -0,0 +1,233 @@
+"""Run several WorkerLoops side by side, one per child process ("slot")."""
+
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+import multiprocessing
+import os
+from pathlib import Path
+import signal
+import threading
+import time
+from typing import Any, Callable
+
+from core.processes import kill_tracked_groups
+from models.database import DEFAULT_LEASE_SEC
+from models.notify import notify_job_available
+from worker.loop import WorkerLoop
+
+_SUPERVISE_SEC = 0.5
+# A slot that keeps crashing on startup is restarted after this delay, doubled for
+# every further crash up to _MAX_RESTART_DELAY_SEC; a slot that stayed up for
+# _STABLE_SLOT_SEC starts over from the base delay.
+_RESTART_DELAY_SEC = 1.0
+_MAX_RESTART_DELAY_SEC = 30.0
+_STABLE_SLOT_SEC = 60.0
+# How long terminate() gives slots to kill their OCR process groups before SIGKILL.
+_TERMINATE_GRACE_SEC = 2.0
+# Asks a slot to stop at once rather than drain; SIGTERM/SIGINT only drain it.
+_STOP_NOW_SIGNAL = getattr(signal, "SIGUSR1", signal.SIGTERM)
+
+
+def slot_ocr_jobs(concurrency: int, cpu_count: int | None = None) -> int:
+    """OCR parallelism per slot that fills the machine without oversubscribing it.
+
+    OCR is the only CPU-bound stage that fans out, so the cores are split between
+    slots; the serial stages of one book overlap with another book's OCR.
+    """
+    cpus = cpu_count or os.cpu_count() or 1
+    return max(1, cpus // max(1, concurrency))
+
+
+@dataclass(frozen=True)
+class _SlotConfig:
+    db_path: Path
+    workspace_books_dir: Path
+    poll_interval_sec: float
+    ingest_mode: str
+    execution_mode: str
+    scratch_root: Path | None
+    scheduling_policy: str
+    lease_sec: float
+    ocr_jobs: int
+
+
+def _install_slot_signal_handlers(drain: Any, wake: Callable[[], None]) -> None:
+    # A stop signal sent to the whole process group (Ctrl-C, systemd) drains the slot:
+    # the current job finishes, then the slot exits.
+    def request_drain(signum: int, frame: object) -> None:
+        drain.set()
+        wake()
+
+    # OCR children run in their own process groups (see core.ocr.run_killable), so
+    # killing the slot alone would leave them running as orphans.
+    def stop_now(signum: int, frame: object) -> None:
+        kill_tracked_groups()
+        os._exit(128 + signum)
+
+    signal.signal(signal.SIGINT, request_drain)
+    signal.signal(signal.SIGTERM, request_drain)
+    if _STOP_NOW_SIGNAL not in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(_STOP_NOW_SIGNAL, stop_now)
+
+
+def _slot_main(config: _SlotConfig, drain: Any, slot_index: int) -> None:
+    loop = WorkerLoop(**asdict(config))
+    loop.worker_id = f"{loop.worker_id}:slot{slot_index}"
+    _install_slot_signal_handlers(drain, loop.wake)
+
+    while not drain.is_set():
+        since = loop.notifier.generation
+        if not loop.process_once():
+            loop.wait_for_work(since)
+
+
+@dataclass
+class WorkerPool:
+    """Supervise `concurrency` worker slots that claim jobs from the shared queue.
+
+    Claims are atomic in the database, so slots (and other pools on other machines)
+    never run the same job. drain() lets running jobs finish; a slot that dies is
+    restarted, and its job is resumed by whichever slot steals the expired lease.
+    """
+
+    db_path: Path
+    workspace_books_dir: Path
+    concurrency: int = 1
+    ocr_jobs: int | None = None
+    poll_interval_sec: float = 30.0
+    ingest_mode: str = "copy"
+    execution_mode: str = "batch"
+    scratch_root: Path | None = None
+    scheduling_policy: str = "fair"
+    lease_sec: float = DEFAULT_LEASE_SEC
+    _context: Any = field(default=None, init=False, repr=False)
+    _drain: Any = field(default=None, init=False, repr=False)
+    _slots: dict[int, multiprocessing.process.BaseProcess] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _started_at: dict[int, float] = field(default_factory=dict, init=False, repr=False)
+    _restart_delay: dict[int, float] = field(default_factory=dict, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+        self._context = multiprocessing.get_context("spawn")
+        self._drain = self._context.Event()
+
+    @property
+    def slot_ocr_jobs(self) -> int:
+        return self.ocr_jobs or slot_ocr_jobs(self.concurrency)
+
+    @property
+    def draining(self) -> bool:
+        return self._drain.is_set()
+
+    def alive_slots(self) -> int:
+        return sum(1 for process in self._slots.values() if process.is_alive())
+
+    def _config(self) -> _SlotConfig:
+        return _SlotConfig(
+            db_path=self.db_path,
+            workspace_books_dir=self.workspace_books_dir,
+            poll_interval_sec=self.poll_interval_sec,
+            ingest_mode=self.ingest_mode,
+            execution_mode=self.execution_mode,
+            scratch_root=self.scratch_root,
+            scheduling_policy=self.scheduling_policy,
+            lease_sec=self.lease_sec,
+            ocr_jobs=self.slot_ocr_jobs,
+        )
+
+    def _restart_at(self, slot_index: int) -> float:
+        return self._started_at[slot_index] + self._restart_delay.get(
+            slot_index, _RESTART_DELAY_SEC
+        )
+
+    def _restart_slot(self, slot_index: int) -> None:
+        delay = self._restart_delay.get(slot_index, _RESTART_DELAY_SEC)
+        if time.monotonic() - self._started_at[slot_index] >= _STABLE_SLOT_SEC:
+            self._restart_delay[slot_index] = _RESTART_DELAY_SEC
+        else:
+            self._restart_delay[slot_index] = min(delay * 2, _MAX_RESTART_DELAY_SEC)
+        self._start_slot(slot_index)
+
+    def _start_slot(self, slot_index: int) -> None:
+        process = self._context.Process(
+            target=_slot_main,
+            args=(self._config(), self._drain, slot_index),
+            name=f"ebookgen-slot-{slot_index}",
+        )
+        process.start()
+        self._slots[slot_index] = process
+        self._started_at[slot_index] = time.monotonic()
+
+    def start(self) -> None:
+        WorkerLoop(db_path=self.db_path, workspace_books_dir=self.workspace_books_dir).initialize()
+        for slot_index in range(self.concurrency):
+            self._start_slot(slot_index)
+
+    def drain(self) -> None:
+        """Stop claiming new jobs; slots exit once their current job is done."""
+        self._drain.set()
+        # Idle slots are blocked on the job notifier; a spurious wake-up of other
+        # workers on the same database costs them one claim query.
+        notify_job_available(self.db_path)
+
+    def terminate(self) -> None:
+        """Stop immediately; interrupted jobs are resumed later through their leases."""
+        self._drain.set()
+        # Slots treat SIGTERM as a drain request; the stop-now signal makes them kill
+        # their OCR process groups and exit, and SIGKILL covers a slot that hangs.
+        for process in self._slots.values():
+            if process.is_alive() and process.pid is not None:
+                try:
+                    os.kill(process.pid, _STOP_NOW_SIGNAL)
+                except ProcessLookupError:
+                    pass
+        deadline = time.monotonic() + _TERMINATE_GRACE_SEC
+        for process in self._slots.values():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+        for process in self._slots.values():
+            process.join()
+
+    def supervise(self) -> None:
+        """Block until every slot exited after a drain, restarting slots that crash."""
+        while True:
+            next_restart: float | None = None
+            for slot_index, process in list(self._slots.items()):
+                process.join(_SUPERVISE_SEC / max(1, len(self._slots)))
+                if process.is_alive() or self.draining:
+                    continue
+                restart_at = self._restart_at(slot_index)
+                if time.monotonic() >= restart_at:
+                    self._restart_slot(slot_index)
+                elif next_restart is None or restart_at < next_restart:
+                    next_restart = restart_at
+            if self.draining and self.alive_slots() == 0:
+                return
+            if next_restart is not None:
+                # join() returns at once for dead slots, so wait for the restart here.
+                time.sleep(min(_SUPERVISE_SEC, max(0.0, next_restart - time.monotonic())))
+
+    def run(self, install_signal_handlers: bool = True) -> None:
+        """Start the slots and supervise them; SIGTERM/SIGINT drain, a second one kills."""
+        if install_signal_handlers and threading.current_thread() is threading.main_thread():
+
+            def handle_stop(signum: int, frame: object) -> None:
+                if self.draining:
+                    self.terminate()
+                else:
+                    self.drain()
+
+            signal.signal(signal.SIGTERM, handle_stop)
+            signal.signal(signal.SIGINT, handle_stop)
+
+        self.start()
+        try:
+            self.supervise()
+        finally:
+            if self.alive_slots():
+                self.terminate()
@@ -0,0 +1,179 @@
+"""Run pipelines in isolated child processes with progress relayed over a pipe."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import multiprocessing
+from multiprocessing.connection import Connection
+import os
+import threading
+import time
+from typing import Any, Callable
+
+from core.cancellation import CancellationToken
+from core.errors import PipelineCancelledError
+from core.pipeline import PipelineResult, run_pipeline
+from core.processes import DEFAULT_KILL_GRACE_SEC, terminate_group
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None  # type: ignore[assignment]
+
+_POLL_SEC = 0.2
+
+EventCallback = Callable[[dict[str, Any]], None]
+
+
+class JobProcessError(RuntimeError):
+    """Raised when the pipeline child process fails or dies."""
+
+    def __init__(self, message: str, exitcode: int | None = None) -> None:
+        self.exitcode = exitcode
+        super().__init__(message)
+
+
+class JobTimeoutError(JobProcessError):
+    """Raised when a job exceeds its wall-clock limit."""
+
+
+def _limit_memory(limit_bytes: int) -> None:
+    if resource is None:
+        return
+    resource.setrlimit(resource.RLIMIT_AS, (limit_bytes, limit_bytes))
+
+
+def _child_main(
+    conn: Connection,
+    cancel_event: Any,
+    pipeline_kwargs: dict[str, Any],
+    memory_limit_bytes: int | None,
+) -> None:
+    if hasattr(os, "setsid"):
+        os.setsid()
+    if memory_limit_bytes is not None:
+        _limit_memory(memory_limit_bytes)
+
+    send_lock = threading.Lock()
+
+    def send(message: tuple[Any, ...]) -> None:
+        # Stages run on several threads; Connection.send is not thread-safe.
+        with send_lock:
+            conn.send(message)
+
+    token = CancellationToken(check=cancel_event.is_set, poll_interval_sec=0.0)
+    try:
+        result = run_pipeline(
+            **pipeline_kwargs,
+            cancel_token=token,
+            on_event=lambda event: send(("event", event)),
+        )
+    except BaseException as error:
+        try:
+            send(("error", type(error).__name__, str(error)))
+        finally:
+            conn.close()
+        raise SystemExit(1)
+    send(("result", result))
+    conn.close()
+
+
+@dataclass
+class SubprocessJobRunner:
+    """Drop-in WorkerLoop.pipeline_runner that runs run_pipeline in a spawned process.
+
+    Manifest events are forwarded to on_event (the runner's and the call's) as they
+    happen. Cancellation and the wall clock limit first ask the child to stop
+    cooperatively (so the manifest records a resumable state), then kill its process
+    group after kill_grace_sec. memory_limit_mb caps the child's address space with
+    RLIMIT_AS.
+    """
+
+    memory_limit_mb: int | None = None
+    timeout_sec: float | None = None
+    kill_grace_sec: float = DEFAULT_KILL_GRACE_SEC
+    on_event: EventCallback | None = None
+
+    def __call__(
+        self,
+        *,
+        cancel_token: CancellationToken | None = None,
+        on_event: EventCallback | None = None,
+        **pipeline_kwargs: Any,
+    ) -> PipelineResult:
+        context = multiprocessing.get_context("spawn")
+        receiver, sender = context.Pipe(duplex=False)
+        cancel_event = context.Event()
+        memory_limit_bytes = (
+            self.memory_limit_mb * 1024 * 1024 if self.memory_limit_mb is not None else None
+        )
+        process = context.Process(
+            target=_child_main,
+            args=(sender, cancel_event, pipeline_kwargs, memory_limit_bytes),
+            name="ebookgen-job",
+        )
+        process.start()
+        sender.close()
+
+        started = time.monotonic()
+        stop_reason: str | None = None
+        stop_deadline = 0.0
+        outcome: tuple[Any, ...] | None = None
+        try:
+            while True:
+                if receiver.poll(_POLL_SEC):
+                    try:
+                        message = receiver.recv()
+                    except EOFError:
+                        break
+                    if message[0] == "event":
+                        for listener in (self.on_event, on_event):
+                            if listener is not None:
+                                listener(message[1])
+                    else:
+                        outcome = message
+
+                now = time.monotonic()
+                if stop_reason is None:
+                    if cancel_token is not None and cancel_token.cancelled:
+                        stop_reason = "cancelled"
+                    elif self.timeout_sec is not None and now - started > self.timeout_sec:
+                        stop_reason = "timeout"
+                    if stop_reason is not None:
+                        cancel_event.set()
+                        stop_deadline = now + self.kill_grace_sec
+                elif now > stop_deadline:
+                    terminate_group(process, self.kill_grace_sec)
+        finally:
+            process.join(self.kill_grace_sec)
+            if process.is_alive():
+                terminate_group(process, self.kill_grace_sec)
+            receiver.close()
+
+        return self._translate(process.exitcode, outcome, stop_reason)
+
+    def _translate(
+        self,
+        exitcode: int | None,
+        outcome: tuple[Any, ...] | None,
+        stop_reason: str | None,
+    ) -> PipelineResult:
+        if stop_reason == "timeout":
+            raise JobTimeoutError(f"Job exceeded time limit of {self.timeout_sec:g}s", exitcode)
+        if stop_reason == "cancelled":
+            raise PipelineCancelledError("Pipeline cancelled")
+
+        if outcome is not None and outcome[0] == "result" and exitcode == 0:
+            return outcome[1]
+        if outcome is not None and outcome[0] == "error":
+            _, error_type, message = outcome
+            if error_type == "PipelineCancelledError":
+                raise PipelineCancelledError(message)
+            if error_type == "MemoryError":
+                raise JobProcessError(
+                    f"Job exceeded memory limit of {self.memory_limit_mb} MB", exitcode
+                )
+            raise JobProcessError(message or error_type, exitcode)
+        if exitcode is not None and exitcode < 0:
+            raise JobProcessError(f"Job process killed by signal {-exitcode}", exitcode)
+        raise JobProcessError(f"Job process exited with code {exitcode}", exitcode)
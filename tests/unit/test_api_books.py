@@ -5,6 +5,8 @@ from pathlib import Path
 from fastapi.testclient import TestClient
 
 from api.app import create_app
+from core.manifest import Manifest
+from core.pipeline_types import PipelineSettings
 
 
 def _client(tmp_path: Path) -> TestClient:
@@ -19,6 +21,7 @@ def test_list_books(make_image_sequence, tmp_path: Path) -> None:
         response = client.get("/api/books")
         assert response.status_code == 200
         assert len(response.json()) == 1
+        assert "X-Next-Cursor" not in response.headers
 
 
 def test_get_book_detail(make_image_sequence, tmp_path: Path) -> None:
@@ -72,3 +75,124 @@ def test_get_preview_image(make_image_sequence, tmp_path: Path) -> None:
         assert payload["front"] == ["0001.jpg", "0002.jpg", "0003.jpg", "0004.jpg", "0005.jpg"]
         assert payload["back"] == ["0003.jpg", "0004.jpg", "0005.jpg", "0006.jpg", "0007.jpg"]
 
+
+
+def test_book_text_serves_partial_text(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2], directory_name="book_text")
+    with _client(tmp_path) as client:
+        created = client.post("/api/books", json={"path": str(input_dir)}).json()
+        assert client.get(f"/api/books/{created['id']}/text").status_code == 404
+
+        stage_dir = Path(created["book_dir"]) / "stage"
+        stage_dir.mkdir(parents=True, exist_ok=True)
+        (stage_dir / "text.partial.txt").write_text("page one", encoding="utf-8")
+        response = client.get(f"/api/books/{created['id']}/text")
+        assert response.status_code == 200
+        assert response.text == "page one"
+        assert response.headers["X-Text-Complete"] == "false"
+
+
+def test_book_text_reads_partial_text_from_scratch(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2], directory_name="book_text_scratch")
+    with _client(tmp_path) as client:
+        created = client.post("/api/books", json={"path": str(input_dir)}).json()
+        scratch_stage = tmp_path / "scratch" / created["id"] / "stage"
+        book_dir = Path(created["book_dir"])
+        book_dir.mkdir(parents=True, exist_ok=True)
+        manifest = Manifest.create(
+            book_dir=book_dir,
+            book_id=created["id"],
+            title="scratch",
+            settings=PipelineSettings(),
+            journal_path=scratch_stage / "events.jsonl",
+        )
+        manifest.close()
+
+        scratch_stage.mkdir(parents=True, exist_ok=True)
+        (scratch_stage / "text.partial.txt").write_text("page one", encoding="utf-8")
+        response = client.get(f"/api/books/{created['id']}/text")
+        assert response.status_code == 200
+        assert response.text == "page one"
+        assert response.headers["X-Text-Complete"] == "false"
+
+
+def test_plan_book_estimates_without_running(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2, 3, 4], directory_name="book_plan")
+    with _client(tmp_path) as client:
+        created = client.post("/api/books", json={"path": str(input_dir)}).json()
+        response = client.post(f"/api/books/{created['id']}/plan", json={"sample_pages": 2})
+        assert response.status_code == 200
+        payload = response.json()
+        assert payload["total_pages"] == 4
+        assert payload["sampled_pages"] == [1, 4]
+        assert client.get(f"/api/books/{created['id']}").json()["status"] == created["status"]
+        assert client.post("/api/books/missing/plan").status_code == 404
+
+
+def test_plan_book_returns_429_while_plans_are_saturated(
+    make_image_sequence, tmp_path: Path
+) -> None:
+    input_dir = make_image_sequence([1, 2], directory_name="book_plan_busy")
+    with _client(tmp_path) as client:
+        created = client.post("/api/books", json={"path": str(input_dir)}).json()
+        plan_slots = client.app.state.plan_slots
+        assert plan_slots.acquire(blocking=False)
+        try:
+            response = client.post(f"/api/books/{created['id']}/plan")
+            assert response.status_code == 429
+        finally:
+            plan_slots.release()
+        assert client.post(f"/api/books/{created['id']}/plan").status_code == 200
+
+
+def test_list_books_paginates_with_cursor(make_image_sequence, tmp_path: Path) -> None:
+    with _client(tmp_path) as client:
+        for name in ("page_a", "page_b", "page_c"):
+            input_dir = make_image_sequence([1], directory_name=name)
+            client.post("/api/books", json={"path": str(input_dir)})
+
+        first = client.get("/api/books", params={"limit": 2})
+        cursor = first.headers["X-Next-Cursor"]
+        second = client.get("/api/books", params={"limit": 2, "cursor": cursor})
+        titles = [book["title"] for book in first.json() + second.json()]
+        assert sorted(titles) == ["page_a", "page_b", "page_c"]
+        assert "X-Next-Cursor" not in second.headers
+
+        filtered = client.get("/api/books", params={"title_prefix": "page_b"})
+        assert [book["title"] for book in filtered.json()] == ["page_b"]
+        assert client.get("/api/books", params={"cursor": "bogus"}).status_code == 400
+
+
+def test_list_books_includes_latest_job(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1], directory_name="book_latest")
+    with _client(tmp_path) as client:
+        book = client.post("/api/books", json={"path": str(input_dir)}).json()
+        job = client.post("/api/jobs", json={"book_id": book["id"], "run_now": False}).json()
+
+        plain = client.get("/api/books").json()
+        assert "latest_job" not in plain[0]
+        included = client.get("/api/books", params={"include": "latest_job"}).json()
+        assert included[0]["latest_job"]["id"] == job["job"]["id"]
+        assert client.get("/api/books", params={"include": "jobs"}).status_code == 400
+
+
+def test_create_books_batch(make_image_sequence, tmp_path: Path) -> None:
+    first = make_image_sequence([1], directory_name="batch_a")
+    second = make_image_sequence([1], directory_name="batch_b")
+    with _client(tmp_path) as client:
+        response = client.post(
+            "/api/books:batch",
+            json={"books": [{"path": str(first)}, {"path": str(second), "optimize_mode": "max"}]},
+        )
+        assert response.status_code == 201
+        books = response.json()["books"]
+        assert [book["title"] for book in books] == ["batch_a", "batch_b"]
+        assert books[1]["optimize_mode"] == "max"
+        assert all(book["latest_job"]["status"] == "pending" for book in books)
+
+        rejected = client.post(
+            "/api/books:batch",
+            json={"books": [{"path": str(first)}, {"path": str(tmp_path / "missing")}]},
+        )
+        assert rejected.status_code == 400
+        assert len(client.get("/api/books").json()) == 2
@@ -2,12 +2,14 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+import threading
 import time
 
 from fastapi.testclient import TestClient
 
 from api.app import create_app
 from models.database import mark_job_failed
+from worker.executor import JobExecutor
 
 
 def _client(tmp_path: Path) -> TestClient:
@@ -38,13 +40,45 @@ def test_create_job_immediate(make_image_sequence, tmp_path: Path) -> None:
     with _client(tmp_path) as client:
         book = _create_book(client, source_dir)
         created = client.post("/api/jobs", json={"book_id": book["id"], "run_now": True})
-        assert created.status_code == 201
+        assert created.status_code == 202
         payload = created.json()
         assert payload["started"] is True
+        assert payload["job"]["queue_position"] == 0
         final_status = _wait_job_status(client, payload["job"]["id"])
         assert final_status == "done"
 
 
+class _BlockingWorker:
+    def __init__(self) -> None:
+        self.release = threading.Event()
+
+    def process_job(self, job_id: str) -> bool:
+        return self.release.wait(10.0)
+
+
+def test_run_now_jobs_queue_then_return_429(make_image_sequence, tmp_path: Path) -> None:
+    source_dir = make_image_sequence([1, 2, 3], directory_name="job_backlog")
+    worker = _BlockingWorker()
+    with _client(tmp_path) as client:
+        client.app.state.executor = JobExecutor(worker=worker, concurrency=1, max_backlog=1)
+        book = _create_book(client, source_dir)
+        try:
+            running = client.post("/api/jobs", json={"book_id": book["id"]})
+            waiting = client.post("/api/jobs", json={"book_id": book["id"]})
+            rejected = client.post("/api/jobs", json={"book_id": book["id"]})
+
+            assert running.status_code == 202
+            assert waiting.status_code == 202
+            assert waiting.json()["job"]["queue_position"] == 1
+            assert rejected.status_code == 429
+            waiting_id = waiting.json()["job"]["id"]
+            assert client.get(f"/api/jobs/{waiting_id}").json()["queue_position"] == 1
+            # The rejected request did not leave a job behind.
+            assert len(client.get("/api/jobs").json()) == 2
+        finally:
+            worker.release.set()
+
+
 def test_create_job_scheduled(make_image_sequence, tmp_path: Path) -> None:
     source_dir = make_image_sequence([1, 2, 3], directory_name="job_scheduled")
     scheduled_at = (datetime.now(timezone.utc) + timedelta(hours=1)).isoformat()
@@ -67,6 +101,29 @@ def test_get_job_status(make_image_sequence, tmp_path: Path) -> None:
         response = client.get(f"/api/jobs/{created['job']['id']}")
         assert response.status_code == 200
         assert response.json()["status"] == "pending"
+        progress = response.json()["progress"]
+        assert progress["percent"] == 0.0
+        assert progress["stage"] == "validate"
+
+
+def test_list_jobs_filters_and_paginates(make_image_sequence, tmp_path: Path) -> None:
+    source_dir = make_image_sequence([1, 2, 3], directory_name="job_list")
+    with _client(tmp_path) as client:
+        book = _create_book(client, source_dir)
+        created = [
+            client.post("/api/jobs", json={"book_id": book["id"], "run_now": False}).json()
+            for _ in range(3)
+        ]
+        job_ids = {payload["job"]["id"] for payload in created}
+
+        first = client.get("/api/jobs", params={"status": "pending", "limit": 2})
+        assert first.status_code == 200
+        second = client.get(
+            "/api/jobs",
+            params={"status": "pending", "limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+        )
+        assert {job["id"] for job in first.json() + second.json()} == job_ids
+        assert client.get("/api/jobs", params={"status": "done"}).json() == []
 
 
 def test_cancel_job(make_image_sequence, tmp_path: Path) -> None:
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from pathlib import Path
+import threading
+import time
+
+import pytest
+
+from core.cancellation import CancellationToken
+from core.errors import PipelineCancelledError
+from core.ocr import run_killable
+from core.pipeline import PipelineSettings, run_pipeline
+from core.stages import default_stage_graph
+from models.database import create_book, create_job, get_book, get_job, init_db
+from worker.loop import WorkerLoop
+
+
+def test_token_polls_check_at_most_once_per_interval() -> None:
+    now = [0.0]
+    calls: list[float] = []
+
+    def check() -> bool:
+        calls.append(now[0])
+        return now[0] >= 2.0
+
+    token = CancellationToken(check=check, poll_interval_sec=1.0, clock=lambda: now[0])
+    assert token.cancelled is False
+    now[0] = 0.5
+    assert token.cancelled is False
+    now[0] = 2.0
+    assert token.cancelled is True
+    assert calls == [0.0, 2.0]
+    with pytest.raises(PipelineCancelledError):
+        token.raise_if_cancelled()
+
+
+def test_run_killable_terminates_child_on_cancel() -> None:
+    token = CancellationToken()
+    threading.Timer(0.3, token.cancel).start()
+
+    started = time.monotonic()
+    with pytest.raises(PipelineCancelledError):
+        run_killable(time.sleep, 30, cancel_token=token)
+    assert time.monotonic() - started < 10
+
+
+def test_cancelled_pipeline_resumes_from_cancelled_stage(
+    make_image_sequence, tmp_path: Path
+) -> None:
+    input_dir = make_image_sequence([1, 2, 3], directory_name="cancel_book")
+    workspace_dir = tmp_path / "workspace" / "books"
+    token = CancellationToken()
+    graph = default_stage_graph()
+    assemble_node = graph.node("assemble")
+
+    def assemble_then_cancel(context: object) -> object:
+        result = assemble_node.run(context)
+        token.cancel()
+        return result
+
+    graph.replace(dataclasses.replace(assemble_node, run=assemble_then_cancel))
+    with pytest.raises(PipelineCancelledError):
+        run_pipeline(
+            input_dir=input_dir,
+            workspace_dir=workspace_dir,
+            settings=PipelineSettings(),
+            book_id="cancelled",
+            stages=graph,
+            cancel_token=token,
+        )
+
+    manifest_path = workspace_dir / "cancelled" / "manifest.json"
+    stages = json.loads(manifest_path.read_text(encoding="utf-8"))["stages"]
+    assert stages["assemble"] == "done"
+    assert stages["ocr"] == "cancelled"
+
+    result = run_pipeline(
+        input_dir=input_dir, workspace_dir=workspace_dir, book_id="cancelled", resume=True
+    )
+    assert result.output_pdf.exists()
+
+
+def test_worker_keeps_cancelled_status(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    books_root = tmp_path / "books"
+    books_root.mkdir(parents=True)
+    init_db(db_path)
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    book = create_book(db_path, source_path=source_dir, book_dir=books_root)
+    job = create_job(db_path, book_id=book.id)
+    worker: WorkerLoop
+
+    def runner(*, cancel_token: CancellationToken, **_: object) -> None:
+        assert worker.request_cancel(job.id) is True
+        cancel_token.raise_if_cancelled()
+
+    worker = WorkerLoop(db_path=db_path, workspace_books_dir=books_root, pipeline_runner=runner)
+    worker.process_once()
+
+    job_state = get_job(db_path, job.id)
+    book_state = get_book(db_path, book.id)
+    assert job_state is not None and job_state.status == "cancelled"
+    assert book_state is not None and book_state.status == "cancelled"
@@ -55,3 +55,64 @@ def test_convert_with_options(make_image_sequence, tmp_path: Path) -> None:
     assert len(created_books) == 1
     assert (created_books[0] / "manifest.json").exists()
 
+
+
+def test_convert_with_profile_writes_stage_profiles(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2], directory_name="cli_profile_book")
+    output_root = tmp_path / "books"
+    output_root.mkdir(parents=True, exist_ok=True)
+
+    result = runner.invoke(
+        app, ["convert", str(input_dir), "--output", str(output_root), "--profile"]
+    )
+    assert result.exit_code == 0
+    book_dir = _count_book_directories(output_root)[0]
+    profile_dir = book_dir / "stage" / "profile"
+    assert (profile_dir / "assemble.prof").exists()
+    assert (profile_dir / "assemble.alloc.txt").exists()
+
+    table = runner.invoke(
+        app, ["profile", book_dir.name, "--output", str(output_root), "--top", "5"]
+    )
+    assert table.exit_code == 0
+    assert "tottime" in table.stdout
+    assert len(table.stdout.strip().splitlines()) == 6
+
+
+def test_convert_without_profile_writes_nothing(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2], directory_name="cli_no_profile_book")
+    output_root = tmp_path / "books"
+    output_root.mkdir(parents=True, exist_ok=True)
+
+    result = runner.invoke(app, ["convert", str(input_dir), "--output", str(output_root)])
+    assert result.exit_code == 0
+    book_dir = _count_book_directories(output_root)[0]
+    assert not (book_dir / "stage" / "profile").exists()
+
+
+def test_plan_command_prints_estimates(make_image_sequence) -> None:
+    input_dir = make_image_sequence([1, 2, 3], directory_name="cli_plan")
+
+    result = runner.invoke(app, ["plan", str(input_dir), "--sample", "2"])
+    assert result.exit_code == 0
+    assert "pages: 3" in result.stdout
+    assert "sampled_pages: 1, 3" in result.stdout
+    assert "estimated_wall_time_sec:" in result.stdout
+
+
+def test_status_streams_pages(make_image_sequence, tmp_path: Path) -> None:
+    output_root = tmp_path / "books"
+    for name in ("status_a", "status_b", "status_c"):
+        input_dir = make_image_sequence([1], directory_name=name)
+        result = runner.invoke(app, ["convert", str(input_dir), "--output", str(output_root)])
+        assert result.exit_code == 0
+
+    result = runner.invoke(app, ["status", "--output", str(output_root), "--page-size", "2"])
+    assert result.exit_code == 0
+    assert sum("latest_job=done" in line for line in result.stdout.splitlines()) == 3
+
+    result = runner.invoke(
+        app, ["status", "--output", str(output_root), "--title", "status_b", "--status", "done"]
+    )
+    assert result.stdout.count("status_b") == 1
+    assert "status_a" not in result.stdout
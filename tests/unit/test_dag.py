@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import threading
+
+import pytest
+
+from core.dag import StageGraph, StageGraphError, StageNode, execute_graph
+
+
+def _noop(_: object) -> None:
+    return None
+
+
+def test_dependencies_resolve_from_artifacts() -> None:
+    graph = StageGraph(
+        [
+            StageNode("a", _noop, outputs=("stage/a.pdf",)),
+            StageNode("b", _noop, inputs=("stage/a.pdf",), outputs=("stage/b.pdf",)),
+            StageNode("c", _noop, inputs=("stage/a.pdf",)),
+            StageNode("d", _noop, requires=("b", "c")),
+        ]
+    )
+
+    assert graph.dependencies() == {"a": set(), "b": {"a"}, "c": {"a"}, "d": {"b", "c"}}
+    assert graph.names == ["a", "b", "c", "d"]
+
+
+def test_cycle_is_rejected() -> None:
+    graph = StageGraph(
+        [
+            StageNode("a", _noop, requires=("b",)),
+            StageNode("b", _noop, requires=("a",)),
+        ]
+    )
+
+    with pytest.raises(StageGraphError):
+        graph.topological_order()
+
+
+def test_independent_nodes_run_concurrently() -> None:
+    barrier = threading.Barrier(2, timeout=5)
+    graph = StageGraph(
+        [
+            StageNode("root", _noop),
+            StageNode("left", _noop, requires=("root",)),
+            StageNode("right", _noop, requires=("root",)),
+            StageNode("join", _noop, requires=("left", "right")),
+        ]
+    )
+    order: list[str] = []
+
+    def run_node(node: StageNode) -> None:
+        if node.name in {"left", "right"}:
+            # Both branches must be in flight at once for the barrier to release.
+            barrier.wait()
+        order.append(node.name)
+
+    executed = execute_graph(graph, run_node, is_done=lambda name: name == "root")
+
+    assert "root" not in executed
+    assert sorted(executed) == ["join", "left", "right"]
+    assert order[-1] == "join"
+
+
+def test_failure_stops_downstream_nodes() -> None:
+    graph = StageGraph(
+        [
+            StageNode("a", _noop),
+            StageNode("b", _noop, requires=("a",)),
+        ]
+    )
+    started: list[str] = []
+
+    def run_node(node: StageNode) -> None:
+        started.append(node.name)
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        execute_graph(graph, run_node, is_done=lambda _: False)
+    assert started == ["a"]
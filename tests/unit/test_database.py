@@ -2,15 +2,26 @@ from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+import sqlite3
+import threading
+
+import pytest
 
 from models.database import (
+    close_connections,
+    connection,
     create_book,
+    create_books_and_jobs,
     create_job,
     fetch_pending_jobs,
     get_book,
     init_db,
+    list_books_page,
+    list_books_with_latest_job_page,
+    list_jobs_page,
     update_book_status,
 )
+from models.schemas import BookSpec
 
 
 def test_create_book(tmp_path: Path) -> None:
@@ -66,3 +77,131 @@ def test_fetch_pending_jobs(tmp_path: Path) -> None:
     pending = fetch_pending_jobs(db_path, now_iso=now.isoformat(), limit=10)
     assert [job.id for job in pending] == [eligible.id]
 
+
+
+def test_connections_are_pooled_per_thread_in_wal_mode(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+
+    with connection(db_path) as first, connection(db_path) as nested:
+        assert first is nested
+        assert first.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    with connection(db_path) as again:
+        assert again is first
+
+    other: list[object] = []
+
+    def use_connection() -> None:
+        with connection(db_path) as conn:
+            other.append(conn)
+
+    thread = threading.Thread(target=use_connection)
+    thread.start()
+    thread.join()
+    assert other[0] is not first
+    close_connections(db_path)
+
+
+def test_failed_block_rolls_back(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    book = create_book(db_path, source_path=source_dir, book_dir=tmp_path / "books")
+
+    with pytest.raises(RuntimeError):
+        with connection(db_path) as conn:
+            conn.execute("UPDATE books SET status = 'done' WHERE id = ?", (book.id,))
+            raise RuntimeError("boom")
+
+    reloaded = get_book(db_path, book.id)
+    assert reloaded is not None
+    assert reloaded.status == "pending"
+
+
+def test_keyset_pages_cover_every_row_once(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    created = [
+        create_book(db_path, source_path=source_dir, book_dir=tmp_path / "books", title=f"vol {i}")
+        for i in range(7)
+    ]
+    create_book(db_path, source_path=source_dir, book_dir=tmp_path / "books", title="other")
+    update_book_status(db_path, created[0].id, status="failed")
+
+    seen: list[str] = []
+    cursor = None
+    while True:
+        page, cursor = list_books_page(db_path, limit=3, cursor=cursor, title_prefix="vol")
+        seen.extend(book.id for book in page)
+        if cursor is None:
+            break
+    assert sorted(seen) == sorted(book.id for book in created)
+    assert len(seen) == len(set(seen))
+
+    failed, next_cursor = list_books_page(db_path, status="failed")
+    assert [book.id for book in failed] == [created[0].id]
+    assert next_cursor is None
+
+    create_job(db_path, book_id=created[0].id)
+    create_job(db_path, book_id=created[1].id)
+    jobs, _ = list_jobs_page(db_path, title_prefix="vol", book_id=created[1].id)
+    assert [job.book_id for job in jobs] == [created[1].id]
+
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        list_books_page(db_path, cursor="not-a-cursor")
+
+
+def test_books_come_with_their_latest_job(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    with_jobs = create_book(db_path, source_path=source_dir, book_dir=tmp_path / "books")
+    without_jobs = create_book(db_path, source_path=source_dir, book_dir=tmp_path / "books")
+    # Ids break created_at ties, so name them in creation order.
+    create_job(db_path, book_id=with_jobs.id, job_id="job-1")
+    latest = create_job(db_path, book_id=with_jobs.id, job_id="job-2", resume=True)
+
+    page, cursor = list_books_with_latest_job_page(db_path)
+
+    assert cursor is None
+    latest_by_book = {book.id: job for book, job in page}
+    assert latest_by_book[with_jobs.id] == latest
+    assert latest_by_book[without_jobs.id] is None
+
+
+def test_create_books_and_jobs_in_one_transaction(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+    sources = []
+    for name in ("vol1", "vol2", "vol3"):
+        source_dir = tmp_path / name
+        source_dir.mkdir()
+        sources.append(source_dir)
+
+    created = create_books_and_jobs(
+        db_path,
+        [BookSpec(source_path=source, optimize_mode="max") for source in sources],
+        book_dir=tmp_path / "books",
+    )
+
+    assert [book.title for book, _ in created] == ["vol1", "vol2", "vol3"]
+    for book, job in created:
+        assert get_book(db_path, book.id) == book
+        assert job is not None and job.book_id == book.id
+    assert len(fetch_pending_jobs(db_path, limit=10)) == 3
+
+    # A failing job insert must not leave its book behind.
+    with connection(db_path) as conn:
+        conn.execute(
+            "CREATE TRIGGER reject_jobs AFTER INSERT ON jobs BEGIN SELECT RAISE(ABORT, 'no'); END"
+        )
+    with pytest.raises(sqlite3.IntegrityError):
+        create_books_and_jobs(
+            db_path, [BookSpec(source_path=sources[0])], book_dir=tmp_path / "books"
+        )
+    page, _ = list_books_page(db_path)
+    assert len(page) == 3
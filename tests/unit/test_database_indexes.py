@@ -0,0 +1,188 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+import threading
+
+import pytest
+
+from models.database import (
+    MIGRATIONS,
+    SCHEMA_VERSION,
+    claim_next_pending_job,
+    connection,
+    fetch_pending_jobs,
+    find_latest_book_by_source,
+    find_latest_failed_book_by_source,
+    get_active_job_states,
+    get_latest_job_for_book,
+    init_db,
+    list_books_page,
+    list_books_with_latest_job_page,
+    list_jobs,
+    list_jobs_page,
+    next_wakeup_at,
+    schema_version,
+    stage_seconds_per_page,
+)
+
+ROWS = 100_000
+
+
+def _populate(db_path: Path) -> None:
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    statuses = ("pending", "running", "done", "failed", "cancelled")
+
+    def stamp(index: int) -> str:
+        return (start + timedelta(seconds=index)).isoformat()
+
+    with connection(db_path) as conn:
+        conn.executemany(
+            """
+            INSERT INTO books (id, title, source_path, book_dir, status, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (f"b{i}", f"book {i}", f"/src/{i % 5000}", f"/books/b{i}", statuses[i % 5],
+                 stamp(i), stamp(i))
+                for i in range(ROWS)
+            ),
+        )
+        conn.executemany(
+            """
+            INSERT INTO jobs (id, book_id, status, scheduled_at, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (f"j{i}", f"b{i % ROWS}", "done" if i % 100 else "pending",
+                 stamp(i) if i % 3 == 0 else None, stamp(i), stamp(i))
+                for i in range(ROWS)
+            ),
+        )
+        conn.executemany(
+            """
+            INSERT INTO stage_timings (
+                book_id, stage, ocr_language, optimize_mode, page_count, sec_per_page,
+                recorded_at
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                (f"b{i}", ("validate", "ocr", "optimize")[i % 3], ("kor+eng", "eng")[i % 2],
+                 "basic", 100, 1.0, stamp(i))
+                for i in range(ROWS // 10)
+            ),
+        )
+        conn.execute("ANALYZE")
+
+
+@pytest.fixture(scope="module")
+def large_db(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    db_path = tmp_path_factory.mktemp("indexes") / "db.sqlite"
+    init_db(db_path)
+    _populate(db_path)
+    return db_path
+
+
+def _query_plans(db_path: Path, call) -> list[str]:
+    statements: list[str] = []
+    with connection(db_path) as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            conn.set_trace_callback(None)
+        plans = []
+        for statement in statements:
+            if not statement.lstrip().upper().startswith("SELECT"):
+                continue
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {statement}").fetchall()
+            plans.append([row["detail"] for row in rows])
+    return plans
+
+
+def test_init_db_records_schema_version(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+    init_db(db_path)
+    assert schema_version(db_path) == SCHEMA_VERSION
+
+
+def test_concurrent_init_db_migrates_once(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    # A version-1 database, so every later step (including ALTER TABLE ADD COLUMN,
+    # which is not idempotent) is still to be applied.
+    with connection(db_path) as conn:
+        for statement in MIGRATIONS[0]:
+            conn.execute(statement)
+        conn.execute("PRAGMA user_version = 1")
+    barrier = threading.Barrier(4)
+    errors: list[BaseException] = []
+
+    def start_up() -> None:
+        barrier.wait()
+        try:
+            init_db(db_path)
+        except BaseException as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=start_up) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert schema_version(db_path) == SCHEMA_VERSION
+
+
+@pytest.mark.parametrize(
+    "call",
+    [
+        lambda db: claim_next_pending_job(db, now_iso="2024-01-02T00:00:00+00:00"),
+        lambda db: claim_next_pending_job(db, now_iso="2024-01-02T00:00:00+00:00", policy="sjf"),
+        lambda db: claim_next_pending_job(db, now_iso="2024-01-02T00:00:00+00:00", policy="fifo"),
+        lambda db: fetch_pending_jobs(db, limit=5),
+        lambda db: next_wakeup_at(db, now_iso="2024-01-01T12:00:00+00:00"),
+        lambda db: get_active_job_states(db),
+        lambda db: stage_seconds_per_page(
+            db, ocr_language="eng", optimize_mode="basic", stages=("ocr",)
+        ),
+        lambda db: get_latest_job_for_book(db, "b42"),
+        lambda db: find_latest_failed_book_by_source(db, Path("/src/42")),
+        lambda db: find_latest_book_by_source(db, Path("/src/42")),
+        lambda db: list_jobs(db, status="running"),
+        lambda db: list_books_page(db, cursor=list_books_page(db, limit=10)[1]),
+        lambda db: list_jobs_page(db, status="done", limit=10),
+        lambda db: list_books_with_latest_job_page(db, limit=10),
+        lambda db: list_books_with_latest_job_page(db, status="failed", limit=10),
+    ],
+    ids=[
+        "claim",
+        "claim-sjf",
+        "claim-fifo",
+        "pending",
+        "next-wakeup",
+        "active-jobs",
+        "stage-history",
+        "latest-job",
+        "latest-failed",
+        "latest-book",
+        "jobs-by-status",
+        "books-keyset",
+        "jobs-keyset",
+        "books-with-latest-job",
+        "failed-books-with-latest-job",
+    ],
+)
+def test_hot_queries_use_indexes(large_db: Path, call) -> None:
+    plans = _query_plans(large_db, lambda: call(large_db))
+
+    assert plans
+    for plan in plans:
+        for step in plan:
+            assert "TEMP B-TREE" not in step, plan
+            # An index-ordered SCAN stops at LIMIT; a bare SCAN reads the whole table.
+            # Scanning a subquery only reads the rows it already produced.
+            if step.startswith("SCAN") and not step.startswith("SCAN (subquery"):
+                assert "USING" in step and "INDEX" in step, plan
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+
+from services.event_bus import EventBus, JobStatePoller
+
+
+def test_subscriber_receives_states_published_from_other_threads() -> None:
+    bus = EventBus()
+    events = [
+        {"type": "job", "status": "running", "stage": "validate"},
+        {"type": "stage", "stage": "ocr", "status": "running"},
+        {"type": "progress", "stage": "ocr", "done": 2, "total": 5},
+        {"type": "job", "status": "done", "stage": "finalize"},
+    ]
+
+    async def scenario() -> list[dict[str, object]]:
+        subscription = bus.subscribe("job-1")
+        received = []
+        for event in events:
+            publisher = threading.Thread(target=bus.publish, args=("job-1", event))
+            publisher.start()
+            received.append(await asyncio.wait_for(subscription.get(), 5.0))
+            publisher.join()
+        subscription.close()
+        return received
+
+    received = asyncio.run(scenario())
+
+    assert [(state["status"], state["stage"]) for state in received] == [
+        ("running", "validate"),
+        ("running", "ocr"),
+        ("running", "ocr"),
+        ("done", "finalize"),
+    ]
+    assert received[2]["done"] == 2 and received[2]["total"] == 5
+    assert [state["seq"] for state in received] == sorted(state["seq"] for state in received)
+
+
+def test_slow_subscriber_gets_latest_state_per_job() -> None:
+    bus = EventBus()
+
+    async def scenario() -> list[dict[str, object]]:
+        subscription = bus.subscribe()
+        for done in range(1, 101):
+            bus.publish("job-1", {"type": "progress", "stage": "ocr", "done": done, "total": 100})
+        bus.publish("job-2", {"type": "job", "status": "running"})
+        bus.publish("job-1", {"type": "metrics", "name": "ocr", "metrics": {}})
+        await asyncio.sleep(0)
+        states = subscription.drain()
+        subscription.close()
+        return states
+
+    states = asyncio.run(scenario())
+
+    assert [(state["job_id"], state.get("done")) for state in states] == [
+        ("job-1", 100),
+        ("job-2", None),
+    ]
+
+
+def test_local_jobs_ignore_polled_states_and_terminal_status_sticks() -> None:
+    bus = EventBus()
+    bus.publish("job-1", {"type": "job", "status": "running", "stage": "ocr"})
+
+    assert bus.is_local("job-1")
+    assert not bus.publish("job-1", {"type": "job", "status": "pending"}, local=False)
+
+    bus.publish("job-1", {"type": "job", "status": "done", "stage": "finalize"})
+    assert not bus.is_local("job-1")
+    assert not bus.publish("job-1", {"type": "job", "status": "running"}, local=False)
+    assert bus.state("job-1")["status"] == "done"
+
+
+def test_poller_fetches_all_watched_jobs_in_one_call() -> None:
+    bus = EventBus()
+    calls: list[list[str]] = []
+
+    def fetch(job_ids: list[str]) -> dict[str, tuple[str, str | None]]:
+        calls.append(sorted(job_ids))
+        return {job_id: ("running", "ocr") for job_id in job_ids if job_id != "gone"}
+
+    bus.publish("local", {"type": "job", "status": "running"})
+
+    async def scenario() -> None:
+        poller = JobStatePoller(bus, fetch, interval_sec=60.0)
+        for job_id in ("a", "b", "local", "gone"):
+            poller.watch(job_id)
+        await poller.poll_once()
+        for job_id in ("a", "b", "local", "gone"):
+            poller.unwatch(job_id)
+
+    asyncio.run(scenario())
+
+    assert calls[0] == ["a", "b", "gone"]
+    assert bus.state("a") is not None and bus.state("a")["stage"] == "ocr"
+    assert bus.state("gone") is None
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+import threading
+import time
+
+import pytest
+
+from worker.executor import ExecutorFullError, JobExecutor
+
+
+class _FakeWorker:
+    def __init__(self) -> None:
+        self.release = threading.Event()
+        self.started: list[str] = []
+        self.finished: list[str] = []
+
+    def process_job(self, job_id: str) -> bool:
+        self.started.append(job_id)
+        self.release.wait(10.0)
+        self.finished.append(job_id)
+        return True
+
+
+def _wait_until(predicate, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_executor_bounds_concurrency_and_reports_positions() -> None:
+    worker = _FakeWorker()
+    executor = JobExecutor(worker=worker, concurrency=2, max_backlog=2)
+
+    assert executor.submit("a") == 0
+    assert executor.submit("b") == 0
+    _wait_until(lambda: len(worker.started) == 2)
+    assert executor.submit("c") == 1
+    assert executor.submit("d") == 2
+    assert executor.submit("c") == 1
+    assert executor.full
+    with pytest.raises(ExecutorFullError):
+        executor.submit("e")
+
+    assert executor.position("a") == 0
+    assert executor.position("d") == 2
+    assert executor.discard("c") is True
+    assert executor.position("d") == 1
+    assert executor.position("unknown") is None
+
+    worker.release.set()
+    _wait_until(lambda: len(worker.finished) == 3)
+    assert sorted(worker.started) == ["a", "b", "d"]
+    assert executor.backlog == 0
+    assert executor.position("a") is None
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+import errno
+import hashlib
+from pathlib import Path
+
+from core import fileops
+from core.fileops import atomic_write_text, publish_file
+
+
+def test_publish_same_filesystem_uses_hardlink(tmp_path: Path) -> None:
+    source = tmp_path / "stage.pdf"
+    source.write_bytes(b"payload")
+    target = tmp_path / "out" / "book.pdf"
+    target.parent.mkdir()
+
+    checksum = publish_file(source, target)
+    assert checksum == hashlib.sha256(b"payload").hexdigest()
+    assert target.stat().st_ino == source.stat().st_ino
+
+
+def test_publish_falls_back_to_streaming_copy(tmp_path: Path, monkeypatch) -> None:
+    source = tmp_path / "stage.pdf"
+    source.write_bytes(b"payload" * 1000)
+    target = tmp_path / "book.pdf"
+
+    def _cross_device(src: Path, dst: Path) -> None:
+        raise OSError(errno.EXDEV, "cross-device link")
+
+    monkeypatch.setattr(fileops.os, "link", _cross_device)
+    checksum = publish_file(source, target)
+    assert checksum == hashlib.sha256(b"payload" * 1000).hexdigest()
+    assert target.read_bytes() == source.read_bytes()
+    assert target.stat().st_ino != source.stat().st_ino
+
+
+def test_atomic_write_replaces_existing(tmp_path: Path) -> None:
+    target = tmp_path / "report.json"
+    target.write_text("old", encoding="utf-8")
+
+    atomic_write_text(target, "new")
+    assert target.read_text(encoding="utf-8") == "new"
+    assert [path.name for path in tmp_path.iterdir()] == ["report.json"]
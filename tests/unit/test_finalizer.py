@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import hashlib
 import json
 from pathlib import Path
 
@@ -53,3 +54,23 @@ def test_output_files_exist(tmp_path: Path) -> None:
     assert result.output_txt.exists()
     assert result.report_json.exists()
 
+
+
+def test_report_includes_output_checksums(tmp_path: Path) -> None:
+    book_dir = tmp_path / "book"
+    _prepare_stage(book_dir)
+
+    result = finalize(
+        book_dir=book_dir,
+        title="Sample Book",
+        total_pages=1,
+        processing_time_sec=1.0,
+        input_size_mb=1.0,
+        settings={},
+        covers={"front": None, "back": None},
+    )
+    payload = json.loads(result.report_json.read_text(encoding="utf-8"))
+    expected_pdf = hashlib.sha256(b"%PDF-1.4 optimized").hexdigest()
+    assert payload["output_sha256"]["book.pdf"] == expected_pdf
+    assert payload["output_sha256"]["book.txt"] == hashlib.sha256(b"sample text").hexdigest()
+    assert not any(path.name.endswith(".tmp") for path in result.output_pdf.parent.iterdir())
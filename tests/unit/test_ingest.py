@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from core.ingest import ingest_files
+from core.validator import list_image_files
+
+
+def test_copy_places_all_files(make_image_sequence, tmp_path: Path) -> None:
+    source_dir = make_image_sequence([1, 2, 3])
+    target_dir = tmp_path / "input"
+
+    result = ingest_files(list_image_files(source_dir), target_dir, mode="copy")
+    assert result.copied == 3
+    names = sorted(path.name for path in target_dir.iterdir())
+    assert names == ["0001.jpg", "0002.jpg", "0003.jpg"]
+
+
+def test_hardlink_shares_inode(make_image_sequence, tmp_path: Path) -> None:
+    source_dir = make_image_sequence([1, 2])
+    target_dir = tmp_path / "input"
+
+    result = ingest_files(list_image_files(source_dir), target_dir, mode="hardlink")
+    assert result.zero_copy == 2
+    assert os.path.samefile(source_dir / "0001.jpg", target_dir / "0001.jpg")
+
+
+def test_reflink_falls_back_to_copy(make_image_sequence, tmp_path: Path) -> None:
+    source_dir = make_image_sequence([1, 2])
+    target_dir = tmp_path / "input"
+
+    result = ingest_files(list_image_files(source_dir), target_dir, mode="reflink")
+    assert result.zero_copy + result.copied == 2
+    assert (target_dir / "0002.jpg").read_bytes() == (source_dir / "0002.jpg").read_bytes()
+
+
+def test_move_removes_source(make_image_sequence, tmp_path: Path) -> None:
+    source_dir = make_image_sequence([1, 2])
+    target_dir = tmp_path / "input"
+
+    ingest_files(list_image_files(source_dir), target_dir, mode="move")
+    assert not (source_dir / "0001.jpg").exists()
+    assert (target_dir / "0001.jpg").exists()
+
+
+def test_skips_files_with_matching_size_and_mtime(make_image_sequence, tmp_path: Path) -> None:
+    source_dir = make_image_sequence([1, 2])
+    target_dir = tmp_path / "input"
+    files = list_image_files(source_dir)
+
+    ingest_files(files, target_dir, mode="copy")
+    result = ingest_files(files, target_dir, mode="copy")
+    assert result.skipped == 2
+    assert result.copied == 0
+
+
+def test_rejects_unknown_mode(make_image_sequence, tmp_path: Path) -> None:
+    source_dir = make_image_sequence([1])
+    with pytest.raises(ValueError):
+        ingest_files(list_image_files(source_dir), tmp_path / "input", mode="symlink")
@@ -3,12 +3,15 @@ from __future__ import annotations
 from pathlib import Path
 
 from core.manifest import (
+    Manifest,
     create_manifest,
     read_current_stage,
     read_manifest,
+    read_manifest_state,
     resolve_resume_stage,
     update_stage_status,
 )
+from core.journal import EventJournal, read_events
 from core.pipeline_types import PipelineSettings
 
 
@@ -72,3 +75,111 @@ def test_resume_from_manifest(tmp_path: Path) -> None:
 
     assert resolve_resume_stage(manifest_path) == "ocr"
 
+
+
+def test_manifest_coalesces_progress_updates(tmp_path: Path) -> None:
+    book_dir = tmp_path / "book"
+    book_dir.mkdir(parents=True)
+    now = [0.0]
+    manifest = Manifest.create(
+        book_dir=book_dir,
+        book_id="book-1",
+        title="Test Book",
+        settings=PipelineSettings(),
+        flush_interval_sec=1.0,
+        clock=lambda: now[0],
+    )
+    writes_after_create = manifest.flush_count
+
+    for page in range(1, 501):
+        manifest.update_progress("ocr", page, 500)
+    assert manifest.flush_count == writes_after_create
+    assert "progress" not in read_manifest(manifest.path)
+
+    now[0] = 1.5
+    manifest.update_progress("ocr", 500, 500)
+    assert manifest.flush_count == writes_after_create + 1
+    assert read_manifest(manifest.path)["progress"] == {"stage": "ocr", "done": 500, "total": 500}
+
+
+def test_manifest_stage_transition_flushes_immediately(tmp_path: Path) -> None:
+    book_dir = tmp_path / "book"
+    book_dir.mkdir(parents=True)
+    manifest = Manifest.create(
+        book_dir=book_dir,
+        book_id="book-1",
+        title="Test Book",
+        settings=PipelineSettings(),
+        clock=lambda: 0.0,
+    )
+
+    manifest.set_stage_status("validate", "done")
+    manifest.set_stage_status("assemble", "running")
+    payload = read_manifest(manifest.path)
+    assert payload["stages"]["validate"] == "done"
+    assert payload["current_stage"] == "assemble"
+    assert Manifest.load(manifest.path).resume_stage() == "assemble"
+    assert not any(path.name.endswith(".tmp") for path in book_dir.iterdir())
+
+
+def test_resume_stage_replays_journal_past_snapshot(tmp_path: Path) -> None:
+    book_dir = tmp_path / "book"
+    book_dir.mkdir(parents=True)
+    manifest = Manifest.create(
+        book_dir=book_dir,
+        book_id="book-1",
+        title="Test Book",
+        settings=PipelineSettings(),
+    )
+    manifest.set_stage_status("validate", "done")
+    snapshot_before_crash = manifest.path.read_text(encoding="utf-8")
+
+    # Simulate a crash after the journal append but before the snapshot write.
+    manifest.set_stage_status("assemble", "done")
+    manifest.update_progress("ocr", 3, 10)
+    manifest.close()
+    manifest.path.write_text(snapshot_before_crash, encoding="utf-8")
+
+    assert read_manifest(manifest.path)["stages"]["assemble"] == "pending"
+    assert resolve_resume_stage(manifest.path) == "ocr"
+    progress = read_manifest_state(manifest.path)["progress"]
+    assert progress == {"stage": "ocr", "done": 3, "total": 10}
+
+
+def test_manifest_state_follows_journal_in_scratch(tmp_path: Path) -> None:
+    book_dir = tmp_path / "book"
+    book_dir.mkdir(parents=True)
+    scratch_stage = tmp_path / "scratch" / "book-1" / "stage"
+    manifest = Manifest.create(
+        book_dir=book_dir,
+        book_id="book-1",
+        title="Test Book",
+        settings=PipelineSettings(),
+        journal_path=scratch_stage / "events.jsonl",
+        flush_interval_sec=3600,
+    )
+    manifest.set_stage_status("ocr", "running")
+    # Coalesced: journaled in scratch, not yet in the workspace snapshot.
+    manifest.update_progress("ocr", 3, 10)
+
+    assert "progress" not in read_manifest(manifest.path)
+    progress = read_manifest_state(manifest.path)["progress"]
+    assert progress == {"stage": "ocr", "done": 3, "total": 10}
+    manifest.close()
+
+
+def test_journal_compaction_keeps_stage_timeline(tmp_path: Path) -> None:
+    journal = EventJournal(tmp_path / "events.jsonl", compact_threshold_bytes=0)
+    journal.append("stage", stage="ocr", status="running")
+    for page in range(1, 51):
+        journal.append("progress", stage="ocr", done=page, total=50)
+    journal.append("stage", stage="ocr", status="done")
+
+    assert journal.needs_compaction()
+    journal.compact(upto_seq=journal.last_seq)
+    events = read_events(journal.path)
+    assert [event["type"] for event in events] == ["stage", "progress", "stage"]
+    assert events[1]["done"] == 50
+
+    journal.append("stage", stage="optimize", status="running")
+    assert read_events(journal.path, after_seq=52)[0]["seq"] == 53
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import threading
+
+from core.metrics import StageMeter, summarize_metrics
+
+
+def test_stage_meter_records_wall_and_cpu_time() -> None:
+    with StageMeter() as meter:
+        sum(range(100_000))
+
+    assert meter.metrics is not None
+    assert meter.metrics.wall_time_sec >= 0
+    assert meter.metrics.cpu_time_sec >= 0
+    assert not meter.metrics.overlapped
+
+
+def test_overlapping_stages_report_unknown_cpu_and_their_own_thread_cpu() -> None:
+    inner_started = threading.Event()
+    outer_done = threading.Event()
+    inner = StageMeter()
+
+    def busy_stage() -> None:
+        with inner:
+            inner_started.set()
+            outer_done.wait(5)
+
+    thread = threading.Thread(target=busy_stage)
+    thread.start()
+    inner_started.wait(5)
+    with StageMeter() as outer:
+        sum(range(2_000_000))
+    outer_done.set()
+    thread.join()
+
+    assert outer.metrics is not None and inner.metrics is not None
+    assert outer.metrics.overlapped and inner.metrics.overlapped
+    # Child CPU cannot be split between the stages, so neither claims a total.
+    assert outer.metrics.cpu_time_sec is None and inner.metrics.cpu_time_sec is None
+    # The waiting stage must not be charged for the other stage's work.
+    assert inner.metrics.thread_cpu_time_sec < outer.metrics.thread_cpu_time_sec
+
+
+def test_summarize_metrics_totals_and_peaks() -> None:
+    summary = summarize_metrics(
+        {
+            "ocr": {
+                "wall_time_sec": 2.0,
+                "cpu_time_sec": 6.0,
+                "peak_rss_mb": 300.0,
+                "read_bytes": 10,
+            },
+            "optimize": {
+                "wall_time_sec": 1.5,
+                "cpu_time_sec": 1.0,
+                "peak_rss_mb": 120.0,
+                "read_bytes": None,
+            },
+        }
+    )
+    assert summary["wall_time_sec"] == 3.5
+    assert summary["cpu_time_sec"] == 7.0
+    assert summary["peak_rss_mb"] == 300.0
+    assert summary["read_bytes"] == 10
+    assert summary["write_bytes"] is None
+
+
+def test_summarize_metrics_uses_run_wall_time_when_stages_overlap() -> None:
+    stages = {
+        "optimize": {"wall_time_sec": 3.0, "cpu_time_sec": None, "overlapped": True},
+        "thumbnail": {"wall_time_sec": 2.0, "cpu_time_sec": None, "overlapped": True},
+    }
+
+    assert summarize_metrics(stages, wall_time_sec=3.2)["wall_time_sec"] == 3.2
+
+
+def test_summarize_metrics_cpu_total_is_unknown_for_overlapped_stages() -> None:
+    stages = {
+        "optimize": {"wall_time_sec": 3.0, "cpu_time_sec": None, "overlapped": True},
+        "thumbnail": {"wall_time_sec": 2.0, "cpu_time_sec": None, "overlapped": True},
+    }
+
+    assert summarize_metrics(stages)["cpu_time_sec"] is None
+    assert summarize_metrics(stages, cpu_time_sec=4.25)["cpu_time_sec"] == 4.25
@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+import os
+from pathlib import Path
+import subprocess
+import sys
+import threading
+import time
+
+import pytest
+
+from models import notify
+from models.database import create_book, create_job, init_db, next_wakeup_at
+from models.notify import job_notifier
+from worker.loop import WorkerLoop
+
+SRC_DIR = Path(__file__).resolve().parents[2] / "src"
+
+
+def _book(db_path: Path, tmp_path: Path):
+    source_dir = tmp_path / "source"
+    source_dir.mkdir(exist_ok=True)
+    return create_book(db_path, source_path=source_dir, book_dir=tmp_path / "books")
+
+
+def _wait_in_thread(db_path: Path, timeout: float) -> tuple[threading.Thread, dict[str, object]]:
+    notifier = job_notifier(db_path)
+    since = notifier.generation
+    outcome: dict[str, object] = {}
+
+    def wait() -> None:
+        started = time.monotonic()
+        outcome["woken"] = notifier.wait(since, timeout)
+        outcome["elapsed"] = time.monotonic() - started
+
+    thread = threading.Thread(target=wait)
+    thread.start()
+    return thread, outcome
+
+
+def test_create_job_wakes_waiter_in_same_process(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+    book = _book(db_path, tmp_path)
+
+    thread, outcome = _wait_in_thread(db_path, timeout=10.0)
+    create_job(db_path, book_id=book.id)
+    thread.join(10.0)
+
+    assert outcome["woken"] is True
+    assert outcome["elapsed"] < 5.0
+
+
+def test_notify_from_other_process_wakes_waiter(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+    # Bind this process's socket before the other process looks for listeners.
+    job_notifier(db_path).wait(job_notifier(db_path).generation, 0.0)
+
+    thread, outcome = _wait_in_thread(db_path, timeout=10.0)
+    subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import sys; from pathlib import Path; sys.path.insert(0, sys.argv[1]);"
+            "from models.notify import notify_job_available;"
+            "notify_job_available(Path(sys.argv[2]))",
+            str(SRC_DIR),
+            str(db_path),
+        ],
+        check=True,
+    )
+    thread.join(10.0)
+
+    assert outcome["woken"] is True
+    assert outcome["elapsed"] < 5.0
+
+
+def test_next_wakeup_at_returns_next_scheduled_job(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+    book = _book(db_path, tmp_path)
+    create_job(db_path, book_id=book.id)
+    now = datetime.now(timezone.utc)
+    soon = (now + timedelta(minutes=5)).isoformat()
+    create_job(db_path, book_id=book.id, scheduled_at=(now + timedelta(hours=1)).isoformat())
+    create_job(db_path, book_id=book.id, scheduled_at=soon)
+
+    assert next_wakeup_at(db_path, now_iso=now.isoformat()) == soon
+    assert next_wakeup_at(db_path, now_iso=(now + timedelta(days=1)).isoformat()) is None
+
+
+def test_worker_sleeps_until_scheduled_job_is_due(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+    book = _book(db_path, tmp_path)
+    due_at = datetime.now(timezone.utc) + timedelta(seconds=0.3)
+    create_job(db_path, book_id=book.id, scheduled_at=due_at.isoformat())
+
+    worker = WorkerLoop(
+        db_path=db_path,
+        workspace_books_dir=tmp_path / "books",
+        poll_interval_sec=30.0,
+        pipeline_runner=lambda **_: None,
+    )
+    since = worker.notifier.generation
+    assert worker.process_once() is False
+    woken = worker.wait_for_work(since)
+
+    assert woken is False
+    assert datetime.now(timezone.utc) >= due_at
+    assert worker.process_once() is True
+
+
+@pytest.mark.parametrize("kind", ["shared-mode", "symlink"])
+def test_listener_refuses_untrusted_channel_dir(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, kind: str
+) -> None:
+    runtime_dir = tmp_path / "runtime"
+    runtime_dir.mkdir()
+    monkeypatch.setenv("XDG_RUNTIME_DIR", str(runtime_dir))
+    db_path = tmp_path / "db.sqlite"
+    channel_dir = notify._channel_dir(db_path)
+    assert channel_dir.parent == runtime_dir
+    if kind == "shared-mode":
+        channel_dir.mkdir()
+        os.chmod(channel_dir, 0o777)
+    else:
+        target = tmp_path / "elsewhere"
+        target.mkdir(mode=0o700)
+        channel_dir.symlink_to(target, target_is_directory=True)
+
+    notifier = notify.JobNotifier(db_path)
+    assert notifier.wait(notifier.generation, 0.0) is False
+    notifier.notify()
+
+    assert notifier._socket is None
+    assert not list(channel_dir.glob("*.sock"))
@@ -3,6 +3,9 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import pytest
+
+from core.errors import CorruptedImageError
 from core.pipeline import PipelineSettings, run_pipeline
 
 
@@ -34,3 +37,66 @@ def test_manifest_tracks_stages(make_image_sequence, tmp_path: Path) -> None:
     assert payload["stages"]["optimize"] == "done"
     assert payload["stages"]["finalize"] == "done"
 
+
+
+def test_report_includes_stage_metrics(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2], directory_name="metrics_book")
+    workspace_dir = tmp_path / "workspace" / "books"
+
+    result = run_pipeline(
+        input_dir=input_dir, workspace_dir=workspace_dir, settings=PipelineSettings()
+    )
+
+    manifest = json.loads(result.manifest_path.read_text(encoding="utf-8"))
+    report = json.loads(result.report_json.read_text(encoding="utf-8"))
+    for stage in ("ingest", "validate", "assemble", "ocr", "optimize", "finalize"):
+        assert stage in manifest["metrics"]
+        assert report["stage_metrics"][stage]["wall_time_sec"] >= 0
+    assert report["metrics_total"]["cpu_time_sec"] >= 0
+    assert report["processing_time_sec"] >= report["stage_metrics"]["assemble"]["wall_time_sec"]
+
+
+def test_registered_stage_runs_after_its_inputs(make_image_sequence, tmp_path: Path) -> None:
+    from core.dag import StageNode
+    from core.stages import register_stage, unregister_stage
+
+    input_dir = make_image_sequence([1, 2], directory_name="plugin_book")
+    workspace_dir = tmp_path / "workspace" / "books"
+    seen: list[bool] = []
+
+    def word_count(context) -> None:
+        seen.append(context.artifact("out/book.txt").exists())
+
+    register_stage(StageNode("word_count", word_count, inputs=("out/book.txt",)))
+    try:
+        result = run_pipeline(
+            input_dir=input_dir, workspace_dir=workspace_dir, settings=PipelineSettings()
+        )
+    finally:
+        unregister_stage("word_count")
+
+    manifest = json.loads(result.manifest_path.read_text(encoding="utf-8"))
+    assert seen == [True]
+    assert manifest["stages"]["word_count"] == "done"
+    assert manifest["stages"]["thumbnail"] == "done"
+    assert (result.book_dir / "out" / "thumbnail.jpg").exists()
+
+
+def test_move_ingest_leaves_source_intact_when_an_image_is_corrupt(
+    make_image_sequence, tmp_path: Path
+) -> None:
+    input_dir = make_image_sequence([1, 2, 3], directory_name="corrupt_book")
+    (input_dir / "0002.jpg").write_bytes(b"not a jpeg")
+
+    with pytest.raises(CorruptedImageError):
+        run_pipeline(
+            input_dir=input_dir,
+            workspace_dir=tmp_path / "workspace" / "books",
+            settings=PipelineSettings(ingest_mode="move"),
+        )
+
+    assert sorted(path.name for path in input_dir.iterdir()) == [
+        "0001.jpg",
+        "0002.jpg",
+        "0003.jpg",
+    ]
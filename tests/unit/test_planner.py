@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+from pathlib import Path
+import shutil
+
+import pytest
+
+from core.errors import MissingPageError
+from core.pipeline_types import PipelineSettings
+from core.planner import plan_conversion
+
+
+def _counting_engine(calls: list[str]):
+    def engine(input_pdf: str, output_pdf: str, **kwargs: object) -> None:
+        calls.append(input_pdf)
+        shutil.copy2(input_pdf, output_pdf)
+        Path(str(kwargs["sidecar"])).write_text("sampled text\f", encoding="utf-8")
+
+    return engine
+
+
+def test_plan_samples_a_few_pages(make_image_sequence) -> None:
+    input_dir = make_image_sequence(list(range(1, 11)), directory_name="plan_book")
+    calls: list[str] = []
+
+    estimate = plan_conversion(
+        input_dir,
+        settings=PipelineSettings(ingest_mode="hardlink"),
+        sample_pages=3,
+        ocr_engine=_counting_engine(calls),
+        workers=2,
+    )
+
+    assert len(calls) == 3
+    assert estimate.total_pages == 10
+    assert estimate.sampled_pages == [1, 5, 10]
+    assert estimate.ocr_backend == "ocrmypdf"
+    assert estimate.estimated_wall_time_sec >= 0
+    assert estimate.estimated_peak_memory_mb > 0
+    assert estimate.estimated_output_mb > 0
+    assert estimate.estimated_disk_mb >= estimate.estimated_output_mb
+    assert not (input_dir.parent / "stage").exists()
+
+
+def test_plan_fails_on_invalid_sequence(make_image_sequence) -> None:
+    input_dir = make_image_sequence([1, 3], directory_name="plan_gap")
+    with pytest.raises(MissingPageError):
+        plan_conversion(input_dir, sample_pages=1)
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import signal
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from core.cancellation import CancellationToken
+from core.ocr import run_killable
+from models.database import create_book, create_job, get_job, init_db
+from worker import pool as pool_module
+from worker.pool import WorkerPool, slot_ocr_jobs
+
+
+def _busy_slot(config: Any, drain: Any, slot_index: int) -> None:
+    # Like _slot_main: SIGTERM only asks the slot to drain after its current job.
+    signal.signal(signal.SIGTERM, lambda signum, frame: drain.set())
+    (config.workspace_books_dir / f"slot-{slot_index}.started").touch()
+    time.sleep(20)
+
+
+def _sleep_in_ocr_child(pid_path: Path) -> None:
+    pid_path.write_text(str(os.getpid()), encoding="utf-8")
+    time.sleep(60)
+
+
+def _ocr_slot(config: Any, drain: Any, slot_index: int) -> None:
+    # Like _slot_main with a job stuck in OCR, which runs in its own process group.
+    pool_module._install_slot_signal_handlers(drain, lambda: None)
+    pid_path = config.workspace_books_dir / f"slot-{slot_index}.ocr-pid"
+    run_killable(_sleep_in_ocr_child, pid_path, cancel_token=CancellationToken())
+
+
+def _crashing_slot(config: Any, drain: Any, slot_index: int) -> None:
+    with (config.workspace_books_dir / "starts.log").open("a", encoding="utf-8") as log:
+        log.write(f"{slot_index}\n")
+    raise SystemExit(1)
+
+
+def _process_running(pid: int) -> bool:
+    try:
+        stat = Path(f"/proc/{pid}/stat").read_text(encoding="utf-8")
+    except FileNotFoundError:
+        return False
+    # An orphan reaped late still shows up as a zombie.
+    return stat.rsplit(")", 1)[1].split()[0] != "Z"
+
+
+def test_slot_ocr_jobs_splits_cores_between_slots() -> None:
+    assert slot_ocr_jobs(1, cpu_count=8) == 8
+    assert slot_ocr_jobs(3, cpu_count=8) == 2
+    assert slot_ocr_jobs(16, cpu_count=8) == 1
+
+
+def test_pool_runs_queued_jobs_and_drains(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    books_root = tmp_path / "books"
+    books_root.mkdir()
+    init_db(db_path)
+
+    job_ids = []
+    for index in range(3):
+        # Empty sources fail validation quickly, which is enough to see every job claimed once.
+        source_dir = tmp_path / f"source-{index}"
+        source_dir.mkdir()
+        book = create_book(db_path, source_path=source_dir, book_dir=books_root)
+        job_ids.append(create_job(db_path, book_id=book.id).id)
+
+    pool = WorkerPool(
+        db_path=db_path,
+        workspace_books_dir=books_root,
+        concurrency=2,
+        ocr_jobs=1,
+        poll_interval_sec=0.05,
+    )
+    thread = threading.Thread(target=pool.run, kwargs={"install_signal_handlers": False})
+    thread.start()
+    try:
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            statuses = {get_job(db_path, job_id).status for job_id in job_ids}
+            if statuses <= {"done", "failed"}:
+                break
+            time.sleep(0.1)
+    finally:
+        pool.drain()
+        thread.join(30)
+
+    assert not thread.is_alive()
+    assert pool.alive_slots() == 0
+    for job_id in job_ids:
+        job = get_job(db_path, job_id)
+        assert job is not None
+        assert job.status == "failed"
+        assert job.lease_owner is None
+
+
+def test_terminate_kills_slots_with_running_jobs(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    db_path = tmp_path / "db.sqlite"
+    books_root = tmp_path / "books"
+    books_root.mkdir()
+    monkeypatch.setattr(pool_module, "_slot_main", _busy_slot)
+    pool = WorkerPool(db_path=db_path, workspace_books_dir=books_root, concurrency=2)
+    pool.start()
+    try:
+        deadline = time.monotonic() + 30
+        while len(list(books_root.glob("*.started"))) < 2 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert len(list(books_root.glob("*.started"))) == 2
+        pool.drain()
+
+        started = time.monotonic()
+        pool.terminate()
+        elapsed = time.monotonic() - started
+    finally:
+        for process in pool._slots.values():
+            process.kill()
+
+    assert elapsed < 5
+    assert pool.alive_slots() == 0
+
+
+@pytest.mark.skipif(not Path("/proc/self/stat").exists(), reason="needs /proc")
+def test_terminate_kills_ocr_process_groups_of_slots(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    books_root = tmp_path / "books"
+    books_root.mkdir()
+    monkeypatch.setattr(pool_module, "_slot_main", _ocr_slot)
+    pool = WorkerPool(db_path=tmp_path / "db.sqlite", workspace_books_dir=books_root)
+    pool._start_slot(0)
+    pid_path = books_root / "slot-0.ocr-pid"
+    try:
+        deadline = time.monotonic() + 30
+        while not pid_path.exists() and time.monotonic() < deadline:
+            time.sleep(0.05)
+        ocr_pid = int(pid_path.read_text(encoding="utf-8"))
+        assert _process_running(ocr_pid)
+
+        pool.terminate()
+
+        deadline = time.monotonic() + 5
+        while _process_running(ocr_pid) and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert not _process_running(ocr_pid)
+    finally:
+        for process in pool._slots.values():
+            process.kill()
+        if pid_path.exists() and _process_running(int(pid_path.read_text(encoding="utf-8"))):
+            os.kill(int(pid_path.read_text(encoding="utf-8")), signal.SIGKILL)
+
+
+def test_supervise_backs_off_slots_that_crash_on_startup(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    books_root = tmp_path / "books"
+    books_root.mkdir()
+    monkeypatch.setattr(pool_module, "_slot_main", _crashing_slot)
+    monkeypatch.setattr(pool_module, "_RESTART_DELAY_SEC", 0.2)
+    pool = WorkerPool(db_path=tmp_path / "db.sqlite", workspace_books_dir=books_root)
+    pool._start_slot(0)
+    cpu_time = []
+
+    def supervise() -> None:
+        started = time.thread_time()
+        pool.supervise()
+        cpu_time.append(time.thread_time() - started)
+
+    thread = threading.Thread(target=supervise)
+    thread.start()
+    time.sleep(2.0)
+    pool.drain()
+    thread.join(30)
+
+    assert not thread.is_alive()
+    # Restarts after 0.2, 0.4 and 0.8 seconds rather than every 0.2 seconds.
+    starts = (books_root / "starts.log").read_text(encoding="utf-8").split()
+    assert 2 <= len(starts) <= 5
+    # Waiting for a restart sleeps instead of spinning on join().
+    assert cpu_time[0] < 1.0
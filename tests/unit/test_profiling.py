@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+import threading
+
+import pytest
+
+from core import profiling
+from core.profiling import profile_stage
+
+
+class _SingleToolProfile:
+    """Stand-in for Python 3.12+ cProfile, where only one profiler may be enabled."""
+
+    active = 0
+
+    def enable(self) -> None:
+        if _SingleToolProfile.active:
+            raise ValueError("Another profiling tool is already active")
+        _SingleToolProfile.active += 1
+
+    def disable(self) -> None:
+        _SingleToolProfile.active -= 1
+
+    def dump_stats(self, path: str) -> None:
+        Path(path).write_bytes(b"")
+
+
+@pytest.mark.parametrize("single_tool", [False, True], ids=["per-thread", "single-tool"])
+def test_concurrent_profiled_stages_both_complete(
+    single_tool: bool, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    if single_tool:
+        monkeypatch.setattr(profiling.cProfile, "Profile", _SingleToolProfile)
+    both_entered = threading.Barrier(2, timeout=5)
+    errors: list[BaseException] = []
+
+    def stage(name: str) -> None:
+        try:
+            with profile_stage(tmp_path, name, enabled=True):
+                both_entered.wait()
+                sum(range(10_000))
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=stage, args=(name,)) for name in ("optimize", "thumbnail")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    profile_dir = tmp_path / profiling.PROFILE_DIR_NAME
+    assert (profile_dir / "optimize.alloc.txt").exists()
+    assert (profile_dir / "thumbnail.alloc.txt").exists()
+    profiles = sorted(path.stem for path in profile_dir.glob("*.prof"))
+    notes = [
+        path.stem.removesuffix(".alloc")
+        for path in profile_dir.glob("*.alloc.txt")
+        if "cProfile skipped" in path.read_text(encoding="utf-8")
+    ]
+    assert len(profiles) == (1 if single_tool else 2)
+    assert sorted(profiles + notes) == ["optimize", "thumbnail"]
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from models.database import init_db, record_stage_timings, stage_seconds_per_page
+from services.event_bus import EventBus
+from services.progress import DEFAULT_SEC_PER_PAGE, estimate_from_state, estimate_progress
+
+
+def test_done_job_is_complete() -> None:
+    estimate = estimate_progress(status="done", stage="finalize", page_count=100)
+
+    assert estimate.percent == 100.0
+    assert estimate.eta_sec == 0.0
+
+
+def test_page_counters_drive_percent_and_eta() -> None:
+    rates = {name: 0.0 for name in DEFAULT_SEC_PER_PAGE} | {"ocr": 1.0}
+
+    estimate = estimate_progress(
+        status="running",
+        stage="ocr",
+        pages_done=25,
+        pages_total=100,
+        page_count=100,
+        stage_started_at=1000.0,
+        now=1050.0,
+        sec_per_page=rates,
+    )
+
+    assert estimate.pages_done == 25
+    assert estimate.percent == 25.0
+    # Observed throughput (two seconds a page) wins over the one-second history.
+    assert estimate.eta_sec == 150.0
+
+
+def test_stage_without_counters_uses_elapsed_time_and_never_finishes_early() -> None:
+    rates = {name: 0.0 for name in DEFAULT_SEC_PER_PAGE} | {"ocr": 1.0}
+    common = dict(status="running", stage="ocr", page_count=10, sec_per_page=rates)
+
+    halfway = estimate_progress(**common, stage_started_at=0.0, now=5.0)
+    overdue = estimate_progress(**common, stage_started_at=0.0, now=60.0)
+
+    assert halfway.percent == 50.0
+    assert halfway.eta_sec == 5.0
+    assert overdue.percent < 100.0
+    assert overdue.eta_sec == 0.0
+
+
+def test_eta_needs_the_page_count() -> None:
+    estimate = estimate_progress(status="running", stage="assemble")
+
+    assert 0 < estimate.percent < 100
+    assert estimate.eta_sec is None
+
+
+def test_bus_state_tracks_stage_start_and_resets_counters() -> None:
+    bus = EventBus()
+    bus.publish("j1", {"type": "job", "status": "running", "stage": "ocr", "page_count": 4})
+    bus.publish("j1", {"type": "progress", "stage": "ocr", "done": 2, "total": 4, "ts": 10.0})
+    bus.publish("j1", {"type": "stage", "stage": "optimize", "status": "running", "ts": 20.0})
+
+    state = bus.state("j1")
+    assert state is not None
+    assert (state["stage"], state["done"], state["total"]) == ("optimize", None, None)
+    assert state["stage_started_at"] == 20.0
+    assert estimate_from_state(state, now=21.0).eta_sec is not None
+
+
+def test_stage_history_averages_recent_runs_per_settings(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+    for ocr_sec in (100.0, 300.0):
+        record_stage_timings(
+            db_path,
+            book_id="b1",
+            ocr_language="eng",
+            optimize_mode="basic",
+            page_count=100,
+            wall_time_sec={"ocr": ocr_sec, "validate": 1.0},
+        )
+    record_stage_timings(
+        db_path,
+        book_id="b2",
+        ocr_language="kor+eng",
+        optimize_mode="basic",
+        page_count=10,
+        wall_time_sec={"ocr": 500.0},
+    )
+
+    history = stage_seconds_per_page(
+        db_path, ocr_language="eng", optimize_mode="basic", stages=("validate", "ocr", "finalize")
+    )
+
+    assert history == {"validate": pytest.approx(0.01), "ocr": pytest.approx(2.0)}
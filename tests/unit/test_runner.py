@@ -0,0 +1,70 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from core.cancellation import CancellationToken
+from core.errors import PipelineCancelledError
+from core.pipeline import PipelineSettings
+from worker.runner import JobProcessError, JobTimeoutError, SubprocessJobRunner
+
+
+def test_runner_relays_events_and_returns_result(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2], directory_name="runner_book")
+    events: list[dict[str, object]] = []
+
+    result = SubprocessJobRunner(on_event=events.append)(
+        input_dir=input_dir,
+        workspace_dir=tmp_path / "books",
+        settings=PipelineSettings(),
+        book_id="runner",
+        resume=False,
+    )
+
+    assert result.output_pdf.exists()
+    assert {"type": "stage", "stage": "finalize", "status": "done"}.items() <= events[-1].items()
+    assert any(event["type"] == "progress" for event in events)
+
+
+def test_runner_reports_child_errors(tmp_path: Path) -> None:
+    empty_dir = tmp_path / "empty"
+    empty_dir.mkdir()
+
+    with pytest.raises(JobProcessError, match="No supported images"):
+        SubprocessJobRunner()(
+            input_dir=empty_dir,
+            workspace_dir=tmp_path / "books",
+            settings=PipelineSettings(),
+            book_id="empty",
+            resume=False,
+        )
+
+
+def test_runner_enforces_wall_clock_limit(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2], directory_name="runner_timeout")
+
+    with pytest.raises(JobTimeoutError):
+        SubprocessJobRunner(timeout_sec=0.01)(
+            input_dir=input_dir,
+            workspace_dir=tmp_path / "books",
+            settings=PipelineSettings(),
+            book_id="slow",
+            resume=False,
+        )
+
+
+def test_runner_stops_on_cancellation(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2], directory_name="runner_cancel")
+    token = CancellationToken()
+    token.cancel()
+
+    with pytest.raises(PipelineCancelledError):
+        SubprocessJobRunner()(
+            input_dir=input_dir,
+            workspace_dir=tmp_path / "books",
+            settings=PipelineSettings(),
+            book_id="cancelled",
+            resume=False,
+            cancel_token=token,
+        )
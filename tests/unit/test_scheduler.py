@@ -6,7 +6,10 @@ from pathlib import Path
 from typer.testing import CliRunner
 
 from cli.main import app
+from models import database
 from models.database import (
+    PRIORITY_STEP_SEC,
+    claim_next_pending_job,
     create_book,
     create_job,
     get_job,
@@ -55,3 +58,72 @@ def test_batch_creates_multiple_jobs(tmp_path: Path) -> None:
     assert len(jobs) == 2
     assert all(job.status == "pending" for job in jobs)
 
+
+def test_batch_rejects_run_options_without_run_now(tmp_path: Path) -> None:
+    batch_root = tmp_path / "batch"
+    (batch_root / "book_a").mkdir(parents=True)
+    output_root = tmp_path / "books"
+
+    result = runner.invoke(
+        app, ["batch", str(batch_root), "--output", str(output_root), "--ingest", "move"]
+    )
+
+    assert result.exit_code != 0
+    assert "--run-now" in result.output
+    assert not (output_root.resolve().parent / "db.sqlite").exists()
+
+
+
+def _queue(tmp_path: Path) -> tuple[Path, str]:
+    db_path = tmp_path / "db.sqlite"
+    init_db(db_path)
+    source_dir = tmp_path / "inbox" / "source"
+    source_dir.mkdir(parents=True)
+    book = create_book(db_path, source_path=source_dir, book_dir=tmp_path / "books")
+    return db_path, book.id
+
+
+def _claim_order(db_path: Path, policy: str = "fair") -> list[str]:
+    later = (datetime.now(timezone.utc) + timedelta(days=30)).isoformat()
+    order = []
+    while (job := claim_next_pending_job(db_path, now_iso=later, policy=policy)) is not None:
+        order.append(job.id)
+    return order
+
+
+def test_fair_share_interleaves_submitters(tmp_path: Path) -> None:
+    db_path, book_id = _queue(tmp_path)
+    bulk = [create_job(db_path, book_id=book_id, submitter="alice").id for _ in range(4)]
+    urgent = create_job(db_path, book_id=book_id, submitter="bob").id
+    boosted = create_job(db_path, book_id=book_id, submitter="alice", priority=2).id
+
+    order = _claim_order(db_path)
+
+    assert order[0] == boosted
+    assert order.index(urgent) <= 2
+    assert [job_id for job_id in order if job_id in bulk] == bulk
+
+
+def test_low_priority_ages_into_the_queue(tmp_path: Path, monkeypatch) -> None:
+    db_path, book_id = _queue(tmp_path)
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    monkeypatch.setattr(database, "utc_now_iso", lambda: start.isoformat())
+    low = create_job(db_path, book_id=book_id, submitter="a", priority=-1).id
+
+    # Work arriving after the priority penalty has elapsed queues behind the old job.
+    later = start + timedelta(seconds=PRIORITY_STEP_SEC + 1)
+    monkeypatch.setattr(database, "utc_now_iso", lambda: later.isoformat())
+    newer = create_job(db_path, book_id=book_id, submitter="b").id
+
+    assert _claim_order(db_path) == [low, newer]
+
+
+def test_shortest_job_first(tmp_path: Path) -> None:
+    db_path, book_id = _queue(tmp_path)
+    large = create_job(db_path, book_id=book_id, page_count=400).id
+    small = create_job(db_path, book_id=book_id, page_count=10).id
+
+    assert _claim_order(db_path, policy="sjf") == [small, large]
+    create_job(db_path, book_id=book_id, job_id="first")
+    create_job(db_path, book_id=book_id, job_id="second", priority=5)
+    assert _claim_order(db_path, policy="fifo") == ["first", "second"]
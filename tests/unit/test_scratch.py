@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import dataclasses
+import json
+from pathlib import Path
+
+import pytest
+
+from core.pipeline import PipelineSettings, run_pipeline
+from core.stages import default_stage_graph
+
+
+def test_scratch_run_checkpoints_and_cleans_up(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2, 3], directory_name="scratch_book")
+    scratch_root = tmp_path / "scratch"
+    graph = default_stage_graph()
+    ocr_node = graph.node("ocr")
+    seen_stage_dirs: list[Path] = []
+
+    def recording_ocr(context):
+        seen_stage_dirs.append(context.stage_dir)
+        return ocr_node.run(context)
+
+    graph.replace(dataclasses.replace(ocr_node, run=recording_ocr))
+    result = run_pipeline(
+        input_dir=input_dir,
+        workspace_dir=tmp_path / "books",
+        settings=PipelineSettings(),
+        book_id="scratch",
+        stages=graph,
+        scratch_root=scratch_root,
+    )
+
+    assert seen_stage_dirs == [scratch_root.resolve() / "scratch" / "stage"]
+    assert not (scratch_root / "scratch").exists()
+    assert result.output_pdf.exists()
+    for name in ("raw.pdf", "ocr.pdf", "optimized.pdf", "text.txt", "events.jsonl"):
+        assert (result.book_dir / "stage" / name).exists()
+
+
+def test_scratch_resume_hydrates_checkpoints(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2], directory_name="scratch_resume")
+    workspace_dir = tmp_path / "books"
+    scratch_root = tmp_path / "scratch"
+    graph = default_stage_graph()
+
+    def failing_optimize(context):
+        raise RuntimeError("optimize crashed")
+
+    graph.replace(dataclasses.replace(graph.node("optimize"), run=failing_optimize))
+    with pytest.raises(RuntimeError):
+        run_pipeline(
+            input_dir=input_dir,
+            workspace_dir=workspace_dir,
+            settings=PipelineSettings(),
+            book_id="resume",
+            stages=graph,
+            scratch_root=scratch_root,
+        )
+    assert not (scratch_root / "resume").exists()
+    assert (workspace_dir / "resume" / "stage" / "ocr.pdf").exists()
+
+    result = run_pipeline(
+        input_dir=input_dir,
+        workspace_dir=workspace_dir,
+        book_id="resume",
+        resume=True,
+        scratch_root=scratch_root,
+    )
+
+    manifest = json.loads(result.manifest_path.read_text(encoding="utf-8"))
+    assert manifest["stages"]["optimize"] == "done"
+    assert result.output_pdf.exists()
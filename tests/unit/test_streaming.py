@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+import shutil
+
+from pypdf import PdfReader
+import pytest
+
+from core import ocr as ocr_module, streaming
+from core.assembler import write_pdf
+from core.cancellation import CancellationToken
+from core.errors import CorruptedImageError, PipelineCancelledError
+from core.ocr import run_ocr
+from core.pipeline import PipelineSettings, run_pipeline
+from core.streaming import stream_pages
+from core.validator import list_image_files
+
+
+def _page_engine(input_pdf: str, output_pdf: str, **kwargs: object) -> None:
+    assert kwargs["jobs"] == 1
+    shutil.copy2(input_pdf, output_pdf)
+    Path(str(kwargs["sidecar"])).write_text(f"text of {Path(input_pdf).stem}\f", encoding="utf-8")
+
+
+def test_stream_pages_stitches_in_reading_order(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2, 3, 4, 5], directory_name="stream_book")
+    stage_dir = tmp_path / "stage"
+    progress: list[tuple[int, int]] = []
+
+    result = stream_pages(
+        list_image_files(input_dir),
+        stage_dir,
+        progress=lambda done, total: progress.append((done, total)),
+        engine=_page_engine,
+        ocr_workers=3,
+        queue_size=1,
+    )
+
+    assert result.backend == "ocrmypdf-streaming"
+    assert progress == [(index, 5) for index in range(1, 6)]
+    text = (stage_dir / "text.txt").read_text(encoding="utf-8")
+    assert text.split("\f") == [f"text of {index:05d}" for index in range(5)]
+    assert len(PdfReader(stage_dir / "ocr.pdf").pages) == 5
+    assert len(PdfReader(stage_dir / "raw.pdf").pages) == 5
+    assert not (stage_dir / "text.partial.txt").exists()
+
+
+def test_stream_pages_records_failed_pages(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2, 3], directory_name="stream_failures")
+
+    def flaky_engine(input_pdf: str, output_pdf: str, **kwargs: object) -> None:
+        if Path(input_pdf).stem == "00001":
+            raise RuntimeError("ocr failed")
+        _page_engine(input_pdf, output_pdf, **kwargs)
+
+    result = stream_pages(list_image_files(input_dir), tmp_path / "stage", engine=flaky_engine)
+
+    assert result.failed_pages == [2]
+
+
+def test_stream_pages_stops_on_corrupted_image(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2, 3], directory_name="stream_corrupt")
+    (input_dir / "0002.jpg").write_bytes(b"not an image")
+
+    with pytest.raises(CorruptedImageError):
+        stream_pages(list_image_files(input_dir), tmp_path / "stage", engine=_page_engine)
+
+
+def test_streaming_pipeline_produces_outputs(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2, 3], directory_name="stream_pipeline")
+
+    result = run_pipeline(
+        input_dir=input_dir,
+        workspace_dir=tmp_path / "workspace" / "books",
+        settings=PipelineSettings(execution_mode="streaming"),
+    )
+
+    manifest = json.loads(result.manifest_path.read_text(encoding="utf-8"))
+    assert "assemble" not in manifest["stages"]
+    assert manifest["stages"]["ocr"] == "done"
+    assert manifest["stages"]["finalize"] == "done"
+    assert len(PdfReader(result.output_pdf).pages) == 3
+
+
+def test_merge_pdfs_stays_within_the_open_file_limit(
+    make_image_sequence, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    resource = pytest.importorskip("resource")
+    pytest.importorskip("pikepdf")
+    image = list_image_files(make_image_sequence([1], directory_name="merge_limit"))[0]
+    page_pdfs = [write_pdf([image], tmp_path / f"{index:05d}.pdf") for index in range(60)]
+    monkeypatch.setattr(streaming, "_MERGE_BATCH", 8)
+
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    open_files = len(os.listdir("/proc/self/fd"))
+    # Fewer descriptors than pages: keeping every page PDF open would fail with EMFILE.
+    resource.setrlimit(resource.RLIMIT_NOFILE, (open_files + 30, hard))
+    try:
+        assert streaming._merge_pdfs(page_pdfs, tmp_path / "merged.pdf")
+    finally:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+    assert len(PdfReader(tmp_path / "merged.pdf").pages) == 60
+    assert not (tmp_path / "merged.pdf.part").exists()
+
+
+def test_stream_pages_checks_cancellation_between_pages(
+    make_image_sequence, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    input_dir = make_image_sequence([1, 2, 3, 4], directory_name="stream_cancel")
+    token = CancellationToken()
+    ocr_calls: list[object] = []
+
+    def tracking_run_ocr(**kwargs: object) -> object:
+        # The token must not reach run_ocr, which would spawn a child per page.
+        ocr_calls.append(kwargs.get("cancel_token"))
+        result = run_ocr(**kwargs)
+        token.cancel()
+        return result
+
+    monkeypatch.setattr(streaming, "run_ocr", tracking_run_ocr)
+
+    with pytest.raises(PipelineCancelledError):
+        stream_pages(
+            list_image_files(input_dir),
+            tmp_path / "stage",
+            engine=_page_engine,
+            ocr_workers=1,
+            queue_size=1,
+            cancel_token=token,
+        )
+
+    assert ocr_calls == [None]
+
+
+def test_resumed_stream_without_pikepdf_keeps_passthrough_pages(
+    make_image_sequence, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    input_dir = make_image_sequence([1, 2, 3], directory_name="stream_resume_passthrough")
+    monkeypatch.setattr(ocr_module, "_load_ocr_engine", lambda: None)
+    monkeypatch.setattr(streaming, "_merge_pdfs", lambda pdf_paths, output_pdf: False)
+    stage_dir = tmp_path / "stage"
+
+    first = stream_pages(list_image_files(input_dir), stage_dir)
+    # Every page is checkpointed; the second run only has to stitch them again.
+    second = stream_pages(list_image_files(input_dir), stage_dir)
+
+    assert first.backend == second.backend == "passthrough-streaming"
+    assert len(PdfReader(stage_dir / "ocr.pdf").pages) == 3
+
+
+def test_resumed_stream_keeps_failed_pages(make_image_sequence, tmp_path: Path) -> None:
+    input_dir = make_image_sequence([1, 2, 3], directory_name="stream_resume_failed")
+    stage_dir = tmp_path / "stage"
+
+    def flaky_engine(input_pdf: str, output_pdf: str, **kwargs: object) -> None:
+        if Path(input_pdf).stem == "00001":
+            raise RuntimeError("ocr failed")
+        _page_engine(input_pdf, output_pdf, **kwargs)
+
+    def unused_engine(input_pdf: str, output_pdf: str, **kwargs: object) -> None:
+        raise AssertionError("finished pages must not be recognized again")
+
+    stream_pages(list_image_files(input_dir), stage_dir, engine=flaky_engine)
+    resumed = stream_pages(list_image_files(input_dir), stage_dir, engine=unused_engine)
+
+    assert resumed.failed_pages == [2]
+    assert resumed.backend == "ocrmypdf-streaming"
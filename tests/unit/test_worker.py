@@ -1,8 +1,12 @@
 from __future__ import annotations
 
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
+from core.cancellation import CancellationToken
+from core.errors import PipelineCancelledError
 from models.database import (
+    claim_next_pending_job,
     create_book,
     create_job,
     get_book,
@@ -83,7 +87,8 @@ def test_worker_recovers_interrupted(tmp_path: Path) -> None:
     book = create_book(db_path, source_path=source_dir, book_dir=books_root)
     job = create_job(db_path, book_id=book.id)
 
-    mark_job_running(db_path, job.id)
+    # The worker that ran it died: its lease is already expired.
+    mark_job_running(db_path, job.id, owner="dead-worker", lease_sec=0)
     update_book_status(db_path, book.id, status="running")
 
     worker = WorkerLoop(db_path=db_path, workspace_books_dir=books_root, pipeline_runner=lambda **_: None)
@@ -92,8 +97,68 @@ def test_worker_recovers_interrupted(tmp_path: Path) -> None:
 
     job_state = get_job(db_path, job.id)
     book_state = get_book(db_path, book.id)
-    assert job_state is not None and job_state.status == "failed"
-    assert book_state is not None and book_state.status == "failed"
+    assert job_state is not None and job_state.status == "pending" and job_state.resume is True
+    assert book_state is not None and book_state.status == "pending"
+
+
+def test_worker_leaves_live_leases_alone(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    books_root = tmp_path / "books"
+    books_root.mkdir(parents=True)
+    init_db(db_path)
+
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    book = create_book(db_path, source_path=source_dir, book_dir=books_root)
+    job = create_job(db_path, book_id=book.id)
+    mark_job_running(db_path, job.id, owner="other-worker", lease_sec=60)
+
+    runs: list[dict[str, object]] = []
+    worker = WorkerLoop(
+        db_path=db_path,
+        workspace_books_dir=books_root,
+        pipeline_runner=lambda **kwargs: runs.append(kwargs),
+    )
+    assert worker.recover_interrupted() == 0
+    assert worker.process_once() is False
+
+    # Once the other worker stops heartbeating, its job is taken over and resumed.
+    later = (datetime.now(timezone.utc) + timedelta(minutes=2)).isoformat()
+    assert worker.process_once(now_iso=later) is True
+    assert runs[0]["resume"] is True
+    job_state = get_job(db_path, job.id)
+    assert job_state is not None and job_state.status == "done"
+
+
+def test_worker_stops_when_lease_is_taken_over(tmp_path: Path) -> None:
+    db_path = tmp_path / "db.sqlite"
+    books_root = tmp_path / "books"
+    books_root.mkdir(parents=True)
+    init_db(db_path)
+
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    book = create_book(db_path, source_path=source_dir, book_dir=books_root)
+    job = create_job(db_path, book_id=book.id)
+
+    def _stolen_mid_run(*, cancel_token: CancellationToken, **_: object) -> None:
+        later = (datetime.now(timezone.utc) + timedelta(minutes=5)).isoformat()
+        assert claim_next_pending_job(db_path, now_iso=later, owner="thief") is not None
+        assert cancel_token.wait(5.0)
+        raise PipelineCancelledError("lease lost")
+
+    worker = WorkerLoop(
+        db_path=db_path,
+        workspace_books_dir=books_root,
+        pipeline_runner=_stolen_mid_run,
+        lease_sec=0.3,
+        cancel_poll_interval_sec=0.05,
+    )
+    worker.process_once()
+
+    job_state = get_job(db_path, job.id)
+    assert job_state is not None
+    assert job_state.status == "running" and job_state.lease_owner == "thief"
 
 
 def test_worker_idle_when_no_jobs(tmp_path: Path) -> None:
@@ -41,7 +41,11 @@ def test_websocket_receives_progress(make_image_sequence, tmp_path: Path) -> Non
             message = websocket.receive_json()
             assert message["type"] == "progress"
             assert message["step_name"] == "ocr"
-            assert message["percent"] == 60
+            # Early stages are quick, so entering OCR is only a few percent in; without
+            # the page count there is no ETA.
+            assert 0 < message["percent"] < 10
+            assert message["pages_done"] is None
+            assert message["eta_sec"] is None
 
 
 def test_websocket_receives_completion(make_image_sequence, tmp_path: Path) -> None:
@@ -59,3 +63,87 @@ def test_websocket_receives_completion(make_image_sequence, tmp_path: Path) -> N
             assert second["type"] == "completion"
             assert second["status"] == "done"
 
+
+def test_websocket_pushes_events_from_local_worker(make_image_sequence, tmp_path: Path) -> None:
+    source_dir = make_image_sequence([1, 2, 3], directory_name="ws_push")
+    with _client(tmp_path) as client:
+        _, job_id = _create_book_and_job(client, source_dir)
+        bus = client.app.state.event_bus
+
+        with client.websocket_connect(f"/ws/jobs/{job_id}") as websocket:
+            assert websocket.receive_json()["status"] == "pending"
+            # Nothing is written to the database: the worker's events reach the socket.
+            bus.publish(job_id, {"type": "job", "status": "running", "stage": "validate"})
+            assert websocket.receive_json()["step_name"] == "validate"
+            bus.publish(job_id, {"type": "stage", "stage": "ocr", "status": "running"})
+            assert websocket.receive_json()["step_name"] == "ocr"
+            bus.publish(job_id, {"type": "job", "status": "done", "stage": "finalize"})
+            assert websocket.receive_json()["step_name"] == "finalize"
+            completion = websocket.receive_json()
+            assert completion == {"type": "completion", "job_id": job_id, "status": "done"}
+
+
+def test_websocket_polls_jobs_run_elsewhere(make_image_sequence, tmp_path: Path) -> None:
+    source_dir = make_image_sequence([1, 2, 3], directory_name="ws_poll")
+    db_path = tmp_path / "db.sqlite"
+    with _client(tmp_path) as client:
+        book_id, job_id = _create_book_and_job(client, source_dir)
+
+        with client.websocket_connect(f"/ws/jobs/{job_id}") as websocket:
+            assert websocket.receive_json()["status"] == "pending"
+            mark_job_done(db_path, job_id)
+            update_book_status(db_path, book_id, status="done", current_stage="finalize")
+
+            progress = websocket.receive_json()
+            assert progress["status"] == "done"
+            assert websocket.receive_json()["type"] == "completion"
+
+
+def test_jobs_stream_sends_snapshot_then_coalesced_deltas(
+    make_image_sequence, tmp_path: Path
+) -> None:
+    source_dir = make_image_sequence([1, 2, 3], directory_name="ws_stream")
+    with _client(tmp_path) as client:
+        _, first_id = _create_book_and_job(client, source_dir)
+        _, second_id = _create_book_and_job(client, source_dir)
+        bus = client.app.state.event_bus
+
+        with client.websocket_connect("/ws/jobs?max_rate=2") as websocket:
+            snapshot = websocket.receive_json()
+            assert snapshot["type"] == "snapshot"
+            assert set(snapshot["jobs"]) == {first_id, second_id}
+            assert snapshot["jobs"][first_id]["status"] == "pending"
+
+            bus.publish(first_id, {"type": "job", "status": "running", "stage": "ocr"})
+            for done in range(1, 21):
+                event = {"type": "progress", "stage": "ocr", "done": done, "total": 20}
+                bus.publish(first_id, event)
+
+            delta = websocket.receive_json()
+            assert delta["type"] == "delta"
+            assert delta["id"] > snapshot["id"]
+            # Twenty-one changes within one rate-limit window arrive as one message that
+            # only carries the fields that changed.
+            assert list(delta["jobs"]) == [first_id]
+            changes = delta["jobs"][first_id]
+            assert changes.pop("percent") > snapshot["jobs"][first_id]["percent"]
+            assert changes.pop("eta_sec") >= 0
+            assert changes == {"status": "running", "stage": "ocr", "done": 20, "total": 20}
+
+        bus.publish(second_id, {"type": "job", "status": "done", "stage": "finalize"})
+        with client.websocket_connect(f"/ws/jobs?last_event_id={delta['id']}") as websocket:
+            resumed = websocket.receive_json()
+            assert resumed["type"] == "delta"
+            assert set(resumed["jobs"]) == {second_id}
+            assert resumed["jobs"][second_id]["status"] == "done"
+
+
+def test_jobs_stream_filters_by_job_id(make_image_sequence, tmp_path: Path) -> None:
+    source_dir = make_image_sequence([1, 2, 3], directory_name="ws_stream_filter")
+    with _client(tmp_path) as client:
+        _, first_id = _create_book_and_job(client, source_dir)
+        _create_book_and_job(client, source_dir)
+
+        with client.websocket_connect(f"/ws/jobs?job_id={first_id}") as websocket:
+            snapshot = websocket.receive_json()
+            assert list(snapshot["jobs"]) == [first_id]